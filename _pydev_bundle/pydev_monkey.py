@@ -229,6 +229,10 @@ def _is_managed_arg(arg):
 
 def _on_forked_process(setup_tracing=True):
     pydevd_constants.after_fork()
+    from _pydevd_bundle import pydevd_filtering_cache, pydevd_startup_profile
+
+    pydevd_filtering_cache.after_fork()
+    pydevd_startup_profile.after_fork()
     pydev_log.initialize_debug_stream(reinitialize=True)
 
     if setup_tracing:
@@ -1240,12 +1244,51 @@ def patch_thread_module(thread_module):
             setattr(thread_module, attr, pydev_start_new_thread)
 
 
+_original_thread_delete = None
+
+
+def _pydev_thread_delete(thread):
+    """
+    Called in the thread which is finishing (when it's removed from the threads alive in threading.py)
+    so that the debugger is notified about it right away (even if the thread was not started through
+    the patched thread modules, i.e.: it was created before the debugger was attached).
+    """
+    _original_thread_delete(thread)
+    thread_id = getattr(thread, "__pydevd_id__", None)
+    if thread_id is None:
+        return  # The debugger never got the id of this thread (so, it didn't notify about it).
+
+    py_db = get_global_debugger()
+    if py_db is not None and not getattr(thread, "is_pydev_daemon_thread", False):
+        try:
+            py_db.notify_thread_not_alive(thread_id)
+        except:
+            # The interpreter may be shutting down.
+            pass
+
+
+def patch_thread_finalization():
+    global _original_thread_delete
+    thread_delete = getattr(threading.Thread, "_delete", None)
+    if thread_delete is not None and thread_delete is not _pydev_thread_delete:
+        _original_thread_delete = thread_delete
+        threading.Thread._delete = _pydev_thread_delete
+
+
+def undo_patch_thread_finalization():
+    # Note: _original_thread_delete is kept as a thread may still be finishing in _pydev_thread_delete.
+    if _original_thread_delete is not None and threading.Thread._delete is _pydev_thread_delete:
+        threading.Thread._delete = _original_thread_delete
+
+
 def patch_thread_modules():
     for t in threading_modules_to_patch:
         patch_thread_module(t)
+    patch_thread_finalization()
 
 
 def undo_patch_thread_modules():
+    undo_patch_thread_finalization()
     for t in threading_modules_to_patch:
         try:
             t.start_new_thread = t._original_start_new_thread
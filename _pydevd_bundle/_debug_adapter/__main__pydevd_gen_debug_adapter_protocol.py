@@ -218,9 +218,9 @@ def update_class_to_generate_type(classes_to_generate, class_to_generate):
 
 
 def update_class_to_generate_register_dec(classes_to_generate, class_to_generate):
-    # Default
-    class_to_generate["register_request"] = ""
-    class_to_generate["register_dec"] = "@register"
+    # Default (the message type/command are used to register the class lazily in pydevd_base_schema).
+    class_to_generate["register_msg_type"] = None
+    class_to_generate["register_command"] = None
 
     properties = class_to_generate.get("properties")
     enum_type = properties.get("type", {}).get("enum")
@@ -252,7 +252,25 @@ def update_class_to_generate_register_dec(classes_to_generate, class_to_generate
         if command:
             enum = command.get("enum")
             if enum and len(enum) == 1:
-                class_to_generate["register_request"] = "@register_%s(%r)\n" % (msg_type, enum[0])
+                class_to_generate["register_msg_type"] = msg_type
+                class_to_generate["register_command"] = enum[0]
+
+
+def update_class_to_generate_dependencies(class_to_generate):
+    # The classes which must be available when the class is used (they're created along
+    # with it when the class is created lazily).
+    dependencies = _OrderedSet()
+    for _prop_name, prop in class_to_generate["properties"].items():
+        if prop["type"].__class__ == Ref:
+            dependencies.add(str(prop["type"]))
+
+        elif prop["type"] == "array":
+            ref = prop["items"].get("$ref")
+            if ref is not None:
+                dependencies.add(ref.split("/")[-1])
+
+    dependencies.discard(class_to_generate["name"])
+    class_to_generate["dependencies"] = repr(tuple(dependencies))
 
 
 def extract_prop_name_and_prop(class_to_generate):
@@ -558,9 +576,9 @@ def gen_debugger_protocol():
         update_class_to_generate_enums(class_to_generate)
         update_class_to_generate_to_json(class_to_generate)
         update_class_to_generate_register_dec(classes_to_generate, class_to_generate)
+        update_class_to_generate_dependencies(class_to_generate)
 
     class_template = '''
-%(register_request)s%(register_dec)s
 class %(name)s(BaseSchema):
     """
 %(description)s
@@ -578,15 +596,51 @@ class %(name)s(BaseSchema):
 %(to_dict)s%(update_dict_ids_to_dap)s
 '''
 
+    # Each class is created by a function which is only called when the class is first
+    # requested (creating all the classes at import time is slow).
+    create_class_template = """
+def _create_%(name)s():
+    global %(name)s
+%(class_contents)s
+    return %(dependencies)s
+"""
+
     contents = []
     contents.append("# coding: utf-8")
     contents.append("# Automatically generated code.")
     contents.append("# Do not edit manually.")
     contents.append("# Generated by running: %s" % os.path.basename(__file__))
-    contents.append("from .pydevd_base_schema import BaseSchema, register, register_request, register_response, register_event")
+    contents.append("#")
+    contents.append("# Note: the classes are only created when first accessed (either through the module")
+    contents.append("# `__getattr__` or through the registries in `pydevd_base_schema`).")
+    contents.append("import threading")
+    contents.append("")
+    contents.append("from .pydevd_base_schema import BaseSchema, register_lazy_classes")
+    contents.append("")
+    for class_to_generate in classes_to_generate.values():
+        class_to_generate["class_contents"] = _indent_lines(class_template % class_to_generate)
+        contents.append(create_class_template % class_to_generate)
+
+    registered = {"request": [], "response": [], "event": []}
     contents.append("")
+    contents.append("_CLASS_NAME_TO_CREATOR = {")
     for class_to_generate in classes_to_generate.values():
-        contents.append(class_template % class_to_generate)
+        contents.append("    %(name)r: _create_%(name)s," % class_to_generate)
+        if class_to_generate["register_msg_type"] is not None:
+            registered[class_to_generate["register_msg_type"]].append((class_to_generate["register_command"], class_to_generate["name"]))
+    contents.append("}")
+
+    contents.append(lazy_load_template)
+    contents.append("register_lazy_classes(")
+    contents.append("    _load_class,")
+    for msg_type, kwarg_name in (("request", "requests"), ("response", "responses"), ("event", "events")):
+        contents.append("    %s={" % (kwarg_name,))
+        for command, name in registered[msg_type]:
+            contents.append("        %r: %r," % (command, name))
+        contents.append("    },")
+    contents.append("    class_names=tuple(_CLASS_NAME_TO_CREATOR),")
+    contents.append(")")
+    contents.append("")
 
     parent_dir = os.path.dirname(__file__)
     schema = os.path.join(parent_dir, "pydevd_schema.py")
@@ -594,6 +648,40 @@ class %(name)s(BaseSchema):
         stream.write("\n".join(contents))
 
 
+lazy_load_template = '''
+_load_lock = threading.RLock()
+
+
+def _load_class(class_name):
+    """
+    Creates the given class (along with the classes it depends on) if it still wasn't created.
+    """
+    with _load_lock:
+        module_globals = globals()
+        cls = module_globals.get(class_name)
+        if cls is None:
+            if class_name not in _CLASS_NAME_TO_CREATOR:
+                raise AttributeError("module %r has no attribute %r" % (__name__, class_name))
+
+            to_create = [class_name]
+            while to_create:
+                name = to_create.pop()
+                if name not in module_globals:
+                    to_create.extend(_CLASS_NAME_TO_CREATOR[name]())
+            cls = module_globals[class_name]
+    return cls
+
+
+def __getattr__(name):
+    return _load_class(name)
+
+
+def __dir__():
+    return sorted(set(globals()).union(_CLASS_NAME_TO_CREATOR))
+
+'''
+
+
 def _indent_lines(lines, indent="    "):
     out_lines = []
     for line in lines.splitlines(keepends=True):
@@ -1,4 +1,5 @@
 from _pydevd_bundle._debug_adapter.pydevd_schema_log import debug_exception
+from _pydevd_bundle import pydevd_json_codec
 import json
 import itertools
 from functools import partial
@@ -46,10 +47,71 @@ class BaseSchema(object):
 
 BaseSchema.initialize_ids_translation()
 
-_requests_to_types = {}
-_responses_to_types = {}
-_event_to_types = {}
-_all_messages = {}
+
+class _LazyRegistry(dict):
+    """
+    The classes in `pydevd_schema` are only created when first requested, so, this registry
+    also knows the names of the classes which may still need to be created for a given key.
+    """
+
+    def __init__(self):
+        dict.__init__(self)
+        self._key_to_class_name = {}
+        self._load_class = None
+
+    def __missing__(self, key):
+        class_name = self._key_to_class_name.get(key)
+        if class_name is None:
+            raise KeyError(key)
+        cls = self[key] = self._load_class(class_name)
+        return cls
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        return dict.__contains__(self, key) or key in self._key_to_class_name
+
+    def keys(self):
+        return set(dict.keys(self)).union(self._key_to_class_name)
+
+
+_requests_to_types = _LazyRegistry()
+_responses_to_types = _LazyRegistry()
+_event_to_types = _LazyRegistry()
+_all_messages = _LazyRegistry()
+
+
+def register_lazy_classes(load_class, requests, responses, events, class_names):
+    """
+    Registers classes which are only created when first requested.
+
+    :param load_class:
+        A callable(class_name) which creates (if needed) and returns the class.
+
+    :param dict(str,str) requests:
+        The command of a request to the name of the class.
+
+    :param dict(str,str) responses:
+        The command of a response to the name of the class.
+
+    :param dict(str,str) events:
+        The event to the name of the class.
+
+    :param tuple(str) class_names:
+        The names of all the messages which can be created.
+    """
+    for registry, key_to_class_name in (
+        (_requests_to_types, requests),
+        (_responses_to_types, responses),
+        (_event_to_types, events),
+        (_all_messages, dict((name, name) for name in class_names)),
+    ):
+        registry._key_to_class_name.update(key_to_class_name)
+        registry._load_class = load_class
 
 
 def register(cls):
@@ -110,10 +172,8 @@ def from_dict(dct, update_ids_from_dap=False):
 
 
 def from_json(json_msg, update_ids_from_dap=False, on_dict_loaded=lambda dct: None):
-    if isinstance(json_msg, bytes):
-        json_msg = json_msg.decode("utf-8")
-
-    as_dict = json.loads(json_msg)
+    # Note: the json codec accepts both bytes (utf-8) and str.
+    as_dict = pydevd_json_codec.loads(json_msg)
     on_dict_loaded(as_dict)
     try:
         return from_dict(as_dict, update_ids_from_dap=update_ids_from_dap)
@@ -141,3 +201,36 @@ def build_response(request, kwargs=None):
     response_class = _responses_to_types[request.command]
     kwargs.setdefault("seq", -1)  # To be overwritten before sending
     return response_class(command=request.command, request_seq=request.seq, **kwargs)
+
+
+def build_response_dict(request_seq, command, body):
+    """
+    Fast path to build a successful response as a dict (without creating the schema
+    objects, which is relevant on responses which may be big, such as the `stackTrace`
+    or `variables` responses).
+
+    Note: the ids in the body must already be translated (see: translate_id_to_dap).
+    """
+    return {
+        "type": "response",
+        "request_seq": request_seq,
+        "success": True,
+        "command": command,
+        "body": body,
+        "seq": -1,  # To be overwritten before sending
+    }
+
+
+def build_event_dict(event, body):
+    """
+    Fast path to build an event as a dict (without creating the schema objects).
+    """
+    return {
+        "type": "event",
+        "event": event,
+        "body": body,
+        "seq": -1,  # To be overwritten before sending
+    }
+
+
+translate_id_to_dap = BaseSchema._translate_id_to_dap
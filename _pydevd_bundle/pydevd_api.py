@@ -12,6 +12,7 @@ from _pydevd_bundle.pydevd_comm import (
     internal_reload_code,
     InternalGetVariable,
     InternalGetArray,
+    internal_get_array_json,
     InternalLoadFullValue,
     internal_get_description,
     internal_get_frame,
@@ -156,6 +157,9 @@ class PyDevdAPI(object):
     def set_gui_event_loop(self, py_db, gui_event_loop):
         py_db._gui_event_loop = gui_event_loop
 
+    def set_supports_variable_paging(self, py_db, supports_variable_paging):
+        py_db.supports_variable_paging = bool(supports_variable_paging)
+
     def send_error_message(self, py_db, msg):
         cmd = py_db.cmd_factory.make_warning_message("pydevd: %s\n" % (msg,))
         py_db.writer.add_command(cmd)
@@ -397,17 +401,23 @@ class PyDevdAPI(object):
     ADD_BREAKPOINT_LAZY_VALIDATION = 3
     ADD_BREAKPOINT_INVALID_LINE = 4
 
+    # The condition, hit condition or log message couldn't be compiled (the
+    # breakpoint is still added and the error is reported again when it's hit).
+    ADD_BREAKPOINT_INVALID_EXPRESSION = 5
+
     class _AddBreakpointResult(object):
         # :see: ADD_BREAKPOINT_NO_ERROR = 0
         # :see: ADD_BREAKPOINT_FILE_NOT_FOUND = 1
         # :see: ADD_BREAKPOINT_FILE_EXCLUDED_BY_FILTERS = 2
         # :see: ADD_BREAKPOINT_LAZY_VALIDATION = 3
         # :see: ADD_BREAKPOINT_INVALID_LINE = 4
+        # :see: ADD_BREAKPOINT_INVALID_EXPRESSION = 5
 
-        __slots__ = ["error_code", "breakpoint_id", "translated_filename", "translated_line", "original_line"]
+        __slots__ = ["error_code", "breakpoint_id", "translated_filename", "translated_line", "original_line", "compile_errors"]
 
         def __init__(self, breakpoint_id, translated_filename, translated_line, original_line):
             self.error_code = PyDevdAPI.ADD_BREAKPOINT_NO_ERROR
+            self.compile_errors = ()
             self.breakpoint_id = breakpoint_id
             self.translated_filename = translated_filename
             self.translated_line = translated_line
@@ -614,6 +624,13 @@ class PyDevdAPI(object):
         if not supported_type:
             raise NameError(breakpoint_type)
 
+        if getattr(added_breakpoint, "compile_errors", None):
+            # Note: the condition/hit condition/log message are compiled when the breakpoint
+            # is created, so, errors can be reported right away.
+            result.compile_errors = added_breakpoint.compile_errors
+            if not result.error_code:
+                result.error_code = self.ADD_BREAKPOINT_INVALID_EXPRESSION
+
         pydev_log.debug("Added breakpoint:%s - line:%s - func_name:%s\n", canonical_normalized_filename, line, func_name)
 
         if canonical_normalized_filename in file_to_id_to_breakpoint:
@@ -629,7 +646,10 @@ class PyDevdAPI(object):
                 py_db, canonical_normalized_filename, id_to_pybreakpoint, file_to_line_to_breakpoints
             )
 
-        py_db.on_breakpoints_changed()
+        if breakpoint_type == "python-line":
+            py_db.on_breakpoints_changed(changed_files=(canonical_normalized_filename,))
+        else:
+            py_db.on_breakpoints_changed()
         return result
 
     def reapply_breakpoints(self, py_db):
@@ -654,6 +674,8 @@ class PyDevdAPI(object):
         """
         assert received_filename.__class__ == str  # i.e.: bytes on py2 and str on py3
         changed = False
+        # If only line breakpoints are removed from given files, the changes are restricted to them.
+        changed_files = set()
         lst = [py_db.file_to_id_to_line_breakpoint, py_db.file_to_id_to_plugin_breakpoint, py_db.breakpoints]
         if hasattr(py_db, "django_breakpoints"):
             lst.append(py_db.django_breakpoints)
@@ -662,6 +684,7 @@ class PyDevdAPI(object):
             lst.append(py_db.jinja2_breakpoints)
 
         if received_filename == "*":
+            changed_files = None
             py_db.api_received_breakpoints.clear()
 
             for file_to_id_to_breakpoint in lst:
@@ -686,9 +709,17 @@ class PyDevdAPI(object):
                     if canonical_normalized_filename in file_to_id_to_breakpoint:
                         file_to_id_to_breakpoint.pop(canonical_normalized_filename, None)
                         changed = True
+                        if changed_files is not None:
+                            if (
+                                file_to_id_to_breakpoint is py_db.file_to_id_to_line_breakpoint
+                                or file_to_id_to_breakpoint is py_db.breakpoints
+                            ):
+                                changed_files.add(canonical_normalized_filename)
+                            else:
+                                changed_files = None
 
         if changed:
-            py_db.on_breakpoints_changed(removed=True)
+            py_db.on_breakpoints_changed(removed=True, changed_files=changed_files)
 
     def remove_breakpoint(self, py_db, received_filename, breakpoint_type, breakpoint_id):
         """
@@ -754,15 +785,22 @@ class PyDevdAPI(object):
                     list(id_to_pybreakpoint),
                 )
 
-        py_db.on_breakpoints_changed(removed=True)
+        if breakpoint_type == "python-line":
+            py_db.on_breakpoints_changed(removed=True, changed_files=(canonical_normalized_filename,))
+        else:
+            py_db.on_breakpoints_changed(removed=True)
 
     def set_function_breakpoints(self, py_db, function_breakpoints):
         function_breakpoint_name_to_breakpoint = {}
         for function_breakpoint in function_breakpoints:
             function_breakpoint_name_to_breakpoint[function_breakpoint.func_name] = function_breakpoint
 
+        # Only the code which matches the previous or new names needs to be re-evaluated.
+        changed_func_names = set(py_db.function_breakpoint_name_to_breakpoint)
+        changed_func_names.update(function_breakpoint_name_to_breakpoint)
+
         py_db.function_breakpoint_name_to_breakpoint = function_breakpoint_name_to_breakpoint
-        py_db.on_breakpoints_changed()
+        py_db.on_breakpoints_changed(changed_func_names=changed_func_names)
 
     def request_exec_or_evaluate(self, py_db, seq, thread_id, frame_id, expression, is_exec, trim_if_too_big, attr_to_set_result):
         py_db.post_method_as_internal_command(
@@ -936,6 +974,12 @@ class PyDevdAPI(object):
         """
         py_db.post_method_as_internal_command(thread_id, internal_get_variable_json, request)
 
+    def request_get_array_json(self, py_db, request, thread_id):
+        """
+        :param PydevdGetArrayRequest request:
+        """
+        py_db.post_method_as_internal_command(thread_id, internal_get_array_json, request)
+
     def request_change_variable_json(self, py_db, request, thread_id):
         """
         :param SetVariableRequest request:
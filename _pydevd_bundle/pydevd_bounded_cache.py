@@ -0,0 +1,91 @@
+"""
+Bounded caches used for the containers which are filled as files are seen during the debug
+session (i.e.: the path normalization in pydevd_file_utils).
+
+The entries of a `BoundedCache` are kept in a plain `dict` (`cache.entries`) which is read
+directly by the users (`entries[key]`, `entries.get(key)`), so, the read path is the C-level
+dict lookup, without any locking or bookkeeping (which is important as those are checked
+for every new frame). Only the write path (`cache.set(key, value)`, which is done on a miss,
+after computing the value) is synchronized and evicts entries when the limit is reached.
+
+As reads can't mark entries as used, the eviction is done in insertion order (as a clock
+where no entry has the reference bit set: an evicted entry which is still used is computed
+and set again, becoming the newest one). The oldest entries are evicted in a batch (a
+fraction of the limit) so that the cost is amortized and there's no latency cliff as when a
+whole container is cleared.
+"""
+
+from itertools import islice
+import weakref
+
+from _pydev_bundle._pydev_saved_modules import threading
+
+# Weak references to all the caches created (to provide the stats).
+_caches = []
+
+# Fraction of the max entries which is evicted when the limit is reached.
+_EVICT_FRACTION = 8
+
+
+class BoundedCache(object):
+    __slots__ = ["name", "max_entries", "entries", "sets", "evictions", "_lock", "__weakref__"]
+
+    def __init__(self, name, max_entries):
+        """
+        :param str name:
+            The name of the cache (used in the stats).
+
+        :param int max_entries:
+            The maximum number of entries in the cache (0 means unbounded).
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.entries = {}
+        self._lock = threading.Lock()
+
+        # Stats (note: hits are not counted as it'd require bookkeeping in the read path,
+        # but each miss should be followed by a set, so, `sets` is the number of misses).
+        self.sets = 0
+        self.evictions = 0
+        _caches.append(weakref.ref(self))
+
+    def set(self, key, value):
+        """
+        :return: the value set.
+        """
+        entries = self.entries
+        with self._lock:
+            self.sets += 1
+            max_entries = self.max_entries
+            if max_entries > 0 and len(entries) >= max_entries and key not in entries:
+                evict = len(entries) - max_entries + max(1, max_entries // _EVICT_FRACTION)
+                for old_key in list(islice(iter(entries), evict)):
+                    entries.pop(old_key, None)
+                self.evictions += evict
+            entries[key] = value
+        return value
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+    def __repr__(self):
+        return "<BoundedCache %s (%s/%s entries)>" % (self.name, len(self.entries), self.max_entries)
+
+    def get_stats(self):
+        return {
+            "name": self.name,
+            "max_entries": self.max_entries,
+            "entries": len(self.entries),
+            "sets": self.sets,
+            "evictions": self.evictions,
+        }
+
+
+def get_caches_stats():
+    """
+    :return list(dict): the stats of all the caches alive (sorted by name).
+    """
+    caches = [ref() for ref in _caches]
+    _caches[:] = [ref for ref, cache in zip(_caches, caches) if cache is not None]
+    return sorted((cache.get_stats() for cache in caches if cache is not None), key=lambda stats: stats["name"])
@@ -2,6 +2,58 @@ from _pydev_bundle import pydev_log
 from _pydevd_bundle import pydevd_import_class
 from _pydevd_bundle.pydevd_frame_utils import add_exception_to_frame
 from _pydev_bundle._pydev_saved_modules import threading
+from collections import ChainMap
+import traceback
+
+# Name of the variable which has the hit count when a hit condition is evaluated
+# (@HIT@ is replaced by it when the hit condition is compiled).
+HIT_COUNT_VAR_NAME = "__pydevd_hit_count__"
+
+
+def _compile_expression(expression, description, compile_errors):
+    """
+    Compiles an expression from a breakpoint (so that it's not parsed again whenever
+    the breakpoint is hit).
+
+    :return:
+        The code compiled or the expression itself if it couldn't be compiled (in which
+        case the error is added to `compile_errors` and evaluating the expression will
+        raise the same error when the breakpoint is hit).
+    """
+    if not expression:
+        return expression
+
+    try:
+        # Note: use the same filename and leading whitespace handling of `eval(str)`.
+        return compile(expression.lstrip(" \t"), "<string>", "eval")
+    except Exception as e:
+        compile_errors.append(
+            "Error compiling %s: %s\n%s" % (description, expression, "".join(traceback.format_exception_only(type(e), e)))
+        )
+        return expression
+
+
+def _compile_hit_condition(hit_condition, compile_errors):
+    """
+    :return:
+        The code compiled with @HIT@ replaced by HIT_COUNT_VAR_NAME or None if it
+        couldn't be compiled.
+    """
+    if not hit_condition:
+        return None
+
+    try:
+        return compile(hit_condition.replace("@HIT@", HIT_COUNT_VAR_NAME).lstrip(" \t"), "<string>", "eval")
+    except Exception as e:
+        compile_errors.append(
+            "Error compiling breakpoint hit condition: %s\n%s" % (hit_condition, "".join(traceback.format_exception_only(type(e), e)))
+        )
+        return None
+
+
+def _eval_hit_condition(hit_condition_code, hit_count, frame):
+    # Note: frame.f_locals must not be changed, so, the hit count is provided in a ChainMap.
+    return bool(eval(hit_condition_code, frame.f_globals, ChainMap({HIT_COUNT_VAR_NAME: hit_count}, frame.f_locals)))
 
 
 class ExceptionBreakpoint(object):
@@ -25,6 +77,9 @@ class ExceptionBreakpoint(object):
 
         self.condition = condition
         self.expression = expression
+        self.compile_errors = []
+        self.condition_code = _compile_expression(condition, "exception breakpoint condition", self.compile_errors)
+        self.expression_code = _compile_expression(expression, "exception breakpoint expression", self.compile_errors)
         self.notify_on_unhandled_exceptions = notify_on_unhandled_exceptions
         self.notify_on_handled_exceptions = notify_on_handled_exceptions
         self.notify_on_first_raise_only = notify_on_first_raise_only
@@ -57,6 +112,14 @@ class LineBreakpoint(object):
         self._hit_condition_lock = threading.Lock()
         self.is_logpoint = is_logpoint
 
+        # Compiled only once (when the breakpoint is added).
+        self.compile_errors = []
+        self.condition_code = _compile_expression(condition, "breakpoint condition", self.compile_errors)
+        self.expression_code = _compile_expression(
+            expression, "logpoint expression" if is_logpoint else "breakpoint expression", self.compile_errors
+        )
+        self._hit_condition_code = _compile_hit_condition(hit_condition, self.compile_errors)
+
     @property
     def has_condition(self):
         return bool(self.condition) or bool(self.hit_condition)
@@ -67,11 +130,11 @@ class LineBreakpoint(object):
         ret = False
         with self._hit_condition_lock:
             self._hit_count += 1
-            expr = self.hit_condition.replace("@HIT@", str(self._hit_count))
-            try:
-                ret = bool(eval(expr, frame.f_globals, frame.f_locals))
-            except Exception:
-                ret = False
+            if self._hit_condition_code is not None:
+                try:
+                    ret = _eval_hit_condition(self._hit_condition_code, self._hit_count, frame)
+                except Exception:
+                    ret = False
         return ret
 
 
@@ -86,6 +149,14 @@ class FunctionBreakpoint(object):
         self._hit_condition_lock = threading.Lock()
         self.is_logpoint = is_logpoint
 
+        # Compiled only once (when the breakpoint is added).
+        self.compile_errors = []
+        self.condition_code = _compile_expression(condition, "breakpoint condition", self.compile_errors)
+        self.expression_code = _compile_expression(
+            expression, "logpoint expression" if is_logpoint else "breakpoint expression", self.compile_errors
+        )
+        self._hit_condition_code = _compile_hit_condition(hit_condition, self.compile_errors)
+
     @property
     def has_condition(self):
         return bool(self.condition) or bool(self.hit_condition)
@@ -96,11 +167,11 @@ class FunctionBreakpoint(object):
         ret = False
         with self._hit_condition_lock:
             self._hit_count += 1
-            expr = self.hit_condition.replace("@HIT@", str(self._hit_count))
-            try:
-                ret = bool(eval(expr, frame.f_globals, frame.f_locals))
-            except Exception:
-                ret = False
+            if self._hit_condition_code is not None:
+                try:
+                    ret = _eval_hit_condition(self._hit_condition_code, self._hit_count, frame)
+                except Exception:
+                    ret = False
         return ret
 
 
@@ -63,11 +63,12 @@ each command has a format:
     * PYDB - pydevd, the python end
 """
 
+import base64
 import linecache
 import os
 
 from _pydev_bundle.pydev_imports import _queue
-from _pydev_bundle._pydev_saved_modules import time, ThreadingEvent
+from _pydev_bundle._pydev_saved_modules import time, threading, ThreadingEvent
 from _pydev_bundle._pydev_saved_modules import socket as socket_module
 from _pydevd_bundle.pydevd_constants import (
     DebugInfoHolder,
@@ -83,12 +84,16 @@ from _pydevd_bundle.pydevd_constants import (
     silence_warnings_decorator,
     filter_all_warnings,
     IS_PY311_OR_GREATER,
+    PYDEVD_WRITER_MAX_BATCH_BYTES,
+    PYDEVD_WRITER_MAX_BATCH_LATENCY,
+    PYDEVD_WRITER_STATS_INTERVAL,
+    PYDEVD_STREAM_VALUE_CHUNK_SIZE,
+    PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS,
 )
 from _pydev_bundle.pydev_override import overrides
 import weakref
 from _pydev_bundle._pydev_completer import extract_token_and_qualifier
 from _pydevd_bundle._debug_adapter.pydevd_schema import (
-    VariablesResponseBody,
     SetVariableResponseBody,
     StepInTarget,
     StepInTargetsResponseBody,
@@ -96,6 +101,7 @@ from _pydevd_bundle._debug_adapter.pydevd_schema import (
 from _pydevd_bundle._debug_adapter import pydevd_base_schema, pydevd_schema
 from _pydevd_bundle.pydevd_net_command import NetCommand
 from _pydevd_bundle.pydevd_xml import ExceptionOnEvaluate
+from _pydevd_bundle.pydevd_suspended_frames import get_variables_var_data
 from _pydevd_bundle.pydevd_constants import ForkSafeLock, NULL
 from _pydevd_bundle.pydevd_daemon_thread import PyDBDaemonThread
 from _pydevd_bundle.pydevd_thread_lifecycle import pydevd_find_thread_by_id, resume_threads
@@ -120,6 +126,7 @@ from _pydevd_bundle.pydevd_utils import (
     getattr_checked,
     Timer,
     is_current_thread_main_thread,
+    iter_chunks,
 )
 from _pydev_bundle import pydev_log, fsnotify
 from _pydev_bundle.pydev_log import exception as pydev_log_exception
@@ -374,11 +381,125 @@ class WriterThread(PyDBDaemonThread):
         else:
             self.timeout = 0.1
 
+        # Limits for a batch of commands sent in a single write.
+        self.max_batch_bytes = PYDEVD_WRITER_MAX_BATCH_BYTES
+        self.max_batch_latency = PYDEVD_WRITER_MAX_BATCH_LATENCY
+
+        # Statistics (see: get_stats()).
+        self._commands_sent = 0
+        self._batches_sent = 0
+        self._bytes_sent = 0
+        self._max_queue_depth = 0
+        self._stats_interval_start_time = None
+        self._stats_interval_bytes_sent = 0
+
     def add_command(self, cmd):
         """cmd is NetCommand"""
         if not self._kill_received:  # we don't take new data after everybody die
             self._cmd_queue.put(cmd, False)
 
+    def get_stats(self):
+        """
+        :return dict:
+            The number of commands/batches/bytes sent and the max depth of the queue
+            of commands (when a batch was collected).
+        """
+        return {
+            "commands_sent": self._commands_sent,
+            "batches_sent": self._batches_sent,
+            "bytes_sent": self._bytes_sent,
+            "max_queue_depth": self._max_queue_depth,
+        }
+
+    def _collect_batch(self, cmd):
+        """
+        Collects the commands which are already queued (after the given command) to be sent
+        in a single write.
+
+        A batch is finished when the CMD_EXIT or a command with an after send callback is
+        found (as the callback must be called right after the command is sent) or when the
+        max batch size/latency is reached.
+
+        :return tuple(list(NetCommand), list(bytes)):
+            The commands in the batch and the chunks to be written to send those.
+        """
+        batch = [cmd]
+        chunks = list(cmd.get_chunks_to_send())
+        if cmd.id == CMD_EXIT or cmd.has_after_send():
+            return batch, chunks
+
+        cmd_queue = self._cmd_queue
+        max_batch_bytes = self.max_batch_bytes
+        max_batch_latency = self.max_batch_latency
+        batch_bytes = sum(len(chunk) for chunk in chunks)
+        initial_time = time.perf_counter()
+        while batch_bytes < max_batch_bytes:
+            try:
+                cmd = cmd_queue.get_nowait()
+            except _queue.Empty:
+                break
+
+            batch.append(cmd)
+            for chunk in cmd.get_chunks_to_send():
+                chunks.append(chunk)
+                batch_bytes += len(chunk)
+
+            if cmd.id == CMD_EXIT or cmd.has_after_send():
+                break
+
+            if time.perf_counter() - initial_time > max_batch_latency:
+                break
+
+        return batch, chunks
+
+    def _send_batch(self, batch, chunks):
+        dap_messages_listeners = self.py_db.dap_messages_listeners
+        if dap_messages_listeners:
+            for cmd in batch:
+                if cmd.as_dict is not None:
+                    for listener in dap_messages_listeners:
+                        listener.before_send(cmd.as_dict)
+
+        notify_about_gevent_if_needed()
+        if chunks:
+            as_bytes = b"".join(chunks)
+            try:
+                self.sock.sendall(as_bytes)
+            except:
+                if IS_JYTHON:
+                    # Ignore errors in sock.sendall in Jython (seems to be common for Jython to
+                    # give spurious exceptions at interpreter shutdown here).
+                    pass
+                else:
+                    raise
+            self._bytes_sent += len(as_bytes)
+            self._stats_interval_bytes_sent += len(as_bytes)
+
+        # Note: only the last command of a batch may have an after send callback.
+        batch[-1].notify_after_send(self.sock)
+
+        self._commands_sent += len(batch)
+        self._batches_sent += 1
+
+    def _log_stats(self, queue_depth):
+        curr_time = time.time()
+        if self._stats_interval_start_time is None:
+            self._stats_interval_start_time = curr_time
+            return
+
+        elapsed = curr_time - self._stats_interval_start_time
+        if elapsed >= PYDEVD_WRITER_STATS_INTERVAL:
+            pydev_log.debug(
+                "WriterThread: queue depth: %s (max: %s), %.1f bytes/sec, %s commands in %s batches.",
+                queue_depth,
+                self._max_queue_depth,
+                self._stats_interval_bytes_sent / elapsed,
+                self._commands_sent,
+                self._batches_sent,
+            )
+            self._stats_interval_start_time = curr_time
+            self._stats_interval_bytes_sent = 0
+
     @overrides(PyDBDaemonThread._on_run)
     def _on_run(self):
         """just loop and write responses"""
@@ -414,14 +535,17 @@ class WriterThread(PyDBDaemonThread):
                     # but the thread was still not liberated
                     return
 
-                if cmd.as_dict is not None:
-                    for listener in self.py_db.dap_messages_listeners:
-                        listener.before_send(cmd.as_dict)
+                queue_depth = self._cmd_queue.qsize() + 1
+                if queue_depth > self._max_queue_depth:
+                    self._max_queue_depth = queue_depth
+
+                batch, chunks = self._collect_batch(cmd)
+                self._send_batch(batch, chunks)
 
-                notify_about_gevent_if_needed()
-                cmd.send(self.sock)
+                if DebugInfoHolder.DEBUG_TRACE_LEVEL >= 2:
+                    self._log_stats(queue_depth)
 
-                if cmd.id == CMD_EXIT:
+                if batch[-1].id == CMD_EXIT:
                     pydev_log.debug("WriterThread: CMD_EXIT received")
                     break
                 if time is None:
@@ -789,6 +913,7 @@ def internal_get_variable_json(py_db, request):
     if hasattr(fmt, "to_dict"):
         fmt = fmt.to_dict()
 
+    translate_id_to_dap = pydevd_base_schema.translate_id_to_dap
     variables = []
     try:
         try:
@@ -796,8 +921,17 @@ def internal_get_variable_json(py_db, request):
         except KeyError:
             pass
         else:
-            for child_var in variable.get_children_variables(fmt=fmt, scope=scope):
-                variables.append(child_var.get_var_data(fmt=fmt))
+            children_variables = variable.get_children_variables_page(
+                fmt=fmt, scope=scope, filter_type=arguments.filter, start=arguments.start or 0, count=arguments.count or 0
+            )
+            presentation_cache = py_db.suspended_frames_manager.variables_presentation_cache
+            if variable.lazy:
+                # The client asked for the value of a lazy variable (compute it regardless of the time budget).
+                variables = get_variables_var_data(children_variables, fmt=fmt, time_budget=0, presentation_cache=presentation_cache)
+            else:
+                variables = get_variables_var_data(children_variables, fmt=fmt, presentation_cache=presentation_cache)
+            for var_data in variables:
+                var_data["variablesReference"] = translate_id_to_dap(var_data["variablesReference"])
     except:
         try:
             exc, exc_type, tb = sys.exc_info()
@@ -808,8 +942,8 @@ def internal_get_variable_json(py_db, request):
             pydev_log.exception(err)
             variables = []
 
-    body = VariablesResponseBody(variables)
-    variables_response = pydevd_base_schema.build_response(request, kwargs={"body": body})
+    # Note: the response is built directly as a dict (see: build_response_dict).
+    variables_response = pydevd_base_schema.build_response_dict(request.seq, request.command, {"variables": variables})
     py_db.writer.add_command(NetCommand(CMD_RETURN, 0, variables_response, is_json=True))
 
 
@@ -883,6 +1017,68 @@ class InternalGetArray(InternalThreadCommand):
             dbg.writer.add_command(cmd)
 
 
+def internal_get_array_json(py_db, request):
+    """
+    Provides the contents of the numpy array or pandas DataFrame in the given variable in the
+    columnar (binary) mode: the raw bytes of each column (in a chunk of rows) are sent encoded
+    as base64 (or, if some column can't be sent as raw bytes, the contents are sent as xml, as
+    in the CMD_GET_ARRAY).
+
+    :param PydevdGetArrayRequest request:
+    """
+    # : :type arguments: PydevdGetArrayArguments
+    arguments = request.arguments
+    variables_reference = arguments.variablesReference
+
+    try:
+        variable = py_db.suspended_frames_manager.get_variable(variables_reference)
+    except KeyError:
+        variable = None
+
+    if variable is None:
+        response = pydevd_base_schema.build_response(
+            request, kwargs={"body": {}, "success": False, "message": "Unable to find variable: %s." % (variables_reference,)}
+        )
+        py_db.writer.add_command(NetCommand(CMD_RETURN, 0, response, is_json=True))
+        return
+
+    roffset, rows = arguments.rowOffset or 0, arguments.rowCount
+    coffset, cols = arguments.columnOffset or 0, arguments.columnCount
+    if rows is None:
+        rows = -1
+    if cols is None:
+        cols = -1
+
+    try:
+        columnar = pydevd_vars.table_like_struct_to_columnar(variable.value, roffset, coffset, rows, cols)
+        if columnar is None:
+            if (rows, cols) != (-1, -1):
+                # The xml only computes the number of rows/columns when neither is given (so,
+                # the real count must be passed for the one which wasn't given).
+                shape = variable.value.shape
+                if rows == -1:
+                    rows = max(0, shape[0] - roffset)
+                if cols == -1:
+                    cols = max(0, (shape[1] if len(shape) > 1 else 1) - coffset)
+            name = variable.evaluate_name or variable.name
+            body = {"xml": pydevd_vars.table_like_struct_to_xml(variable.value, name, roffset, coffset, rows, cols, "%")}
+        else:
+            body = columnar
+            for column in body["columns"]:
+                column["data"] = base64.b64encode(column["data"]).decode("ascii")
+            index = body.get("index")
+            if index is not None:
+                index["data"] = base64.b64encode(index["data"]).decode("ascii")
+    except Exception as e:
+        response = pydevd_base_schema.build_response(request, kwargs={"body": {}, "success": False, "message": str(e)})
+        py_db.writer.add_command(NetCommand(CMD_RETURN, 0, response, is_json=True))
+        return
+
+    # Note: the response is built directly as a dict (see: build_response_dict).
+    response = pydevd_base_schema.build_response_dict(request.seq, request.command, body)
+    py_db.writer.add_command(NetCommand(CMD_RETURN, 0, response, is_json=True))
+
+
 def internal_change_variable(dbg, seq, thread_id, frame_id, scope, attr, value):
     """Changes the value of a variable"""
     try:
@@ -1275,6 +1471,11 @@ def internal_evaluate_expression_json(py_db, request, thread_id):
 
         else:
             variable = frame_tracker.obtain_as_variable(expression, eval_result, frame=frame)
+            if fmt and fmt.get("stream"):
+                var_data = variable.get_var_data(fmt=fmt, context=context, stream_value=True, **safe_repr_custom_attrs)
+                _stream_evaluate_response(py_db, request, var_data)
+                return
+
             var_data = variable.get_var_data(fmt=fmt, context=context, **safe_repr_custom_attrs)
 
             body = pydevd_schema.EvaluateResponseBody(
@@ -1289,6 +1490,66 @@ def internal_evaluate_expression_json(py_db, request, thread_id):
         py_db.writer.add_command(NetCommand(CMD_RETURN, 0, variables_response, is_json=True))
 
 
+def _stream_evaluate_response(py_db, request, var_data):
+    """
+    Sends the response to an evaluation whose value may be big.
+
+    If the value has more than PYDEVD_STREAM_VALUE_CHUNK_SIZE chars, it's sent in sequence-numbered
+    `pydevdValueChunk` events before the response (whose `result` is then empty and which has the
+    number of chunks sent in `pydevdValueChunks`), so, the client must join the chunks.
+
+    Each chunk is only computed after the previous ones are sent (at most
+    PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS may be waiting in the writer), so, the memory used is
+    bounded and the first chunk is sent without waiting for the whole value.
+
+    :param dict var_data:
+        The var data where the `value` is an iterable(str) with the parts of the value or a str.
+    """
+    value = var_data["value"]
+    chunks = iter_chunks((value,) if isinstance(value, str) else value, PYDEVD_STREAM_VALUE_CHUNK_SIZE)
+    first_chunk = next(chunks, "")
+    second_chunk = next(chunks, None)
+
+    body = {
+        "result": first_chunk,
+        "variablesReference": pydevd_base_schema.translate_id_to_dap(var_data.get("variablesReference", 0)),
+        "type": var_data.get("type"),
+    }
+    for key in ("presentationHint", "namedVariables", "indexedVariables"):
+        if key in var_data:
+            body[key] = var_data[key]
+
+    if second_chunk is not None:
+        writer = py_db.writer
+        pending = threading.Semaphore(PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS)
+
+        def on_chunk_sent(*args, **kwargs):
+            pending.release()
+
+        chunk_seq = 0
+        for chunk in itertools.chain((first_chunk, second_chunk), chunks):
+            while not pending.acquire(timeout=0.5):
+                if py_db.writer is not writer or not writer.is_alive():
+                    pydev_log.info("Streaming of the value of the evaluate request %s interrupted.", request.seq)
+                    return
+
+            # Note: the event is built directly as a dict (see: build_event_dict).
+            event = pydevd_base_schema.build_event_dict(
+                "pydevdValueChunk", {"requestSeq": request.seq, "chunkSeq": chunk_seq, "data": chunk}
+            )
+            cmd = NetCommand(CMD_EVALUATE_EXPRESSION, 0, event, is_json=True)
+            cmd.call_after_send(on_chunk_sent)
+            writer.add_command(cmd)
+            chunk_seq += 1
+
+        body["result"] = ""
+        body["pydevdValueChunks"] = chunk_seq
+
+    # Note: the response is built directly as a dict (see: build_response_dict).
+    response = pydevd_base_schema.build_response_dict(request.seq, request.command, body)
+    py_db.writer.add_command(NetCommand(CMD_RETURN, 0, response, is_json=True))
+
+
 def _evaluate_response_return_exception(py_db, request, exc_type, exc, initial_tb):
     try:
         tb = initial_tb
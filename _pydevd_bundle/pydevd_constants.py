@@ -316,6 +316,50 @@ PYDEVD_CONTAINER_NUMPY_MAX_ITEMS = as_int_in_env("PYDEVD_CONTAINER_NUMPY_MAX_ITE
 
 PYDEVD_IPYTHON_COMPATIBLE_DEBUGGING = is_true_in_env("PYDEVD_IPYTHON_COMPATIBLE_DEBUGGING")
 
+# Maximum number of code objects for which the sys.monitoring tracer keeps the related
+# FuncCodeInfo cached (least recently used entries are evicted after that).
+PYDEVD_FUNC_CODE_INFO_CACHE_SIZE = as_int_in_env("PYDEVD_FUNC_CODE_INFO_CACHE_SIZE", 50000)
+
+# The writer thread sends the commands which are already queued in a single write.
+# These are the limits for the size (in bytes) of such a batch and for the time (in
+# seconds) that the first command in a batch may wait while the queue is drained.
+PYDEVD_WRITER_MAX_BATCH_BYTES = as_int_in_env("PYDEVD_WRITER_MAX_BATCH_BYTES", 256 * 1024)
+PYDEVD_WRITER_MAX_BATCH_LATENCY = as_float_in_env("PYDEVD_WRITER_MAX_BATCH_LATENCY", 0.05)
+
+# Interval (in seconds) in which the writer thread logs its statistics (queue depth,
+# bytes/sec) -- only logged with the debug log level.
+PYDEVD_WRITER_STATS_INTERVAL = as_float_in_env("PYDEVD_WRITER_STATS_INTERVAL", 10.0)
+
+# When the output is redirected to the client, consecutive writes to stdout/stderr may be
+# merged and sent as a single message. The output is buffered for at most the given time
+# window (in seconds -- 0 disables the buffering) or until the buffered output reaches the
+# given number of bytes or lines.
+PYDEVD_OUTPUT_BUFFER_WINDOW = as_float_in_env("PYDEVD_OUTPUT_BUFFER_WINDOW", 0.0)
+PYDEVD_OUTPUT_BUFFER_MAX_BYTES = as_int_in_env("PYDEVD_OUTPUT_BUFFER_MAX_BYTES", 64 * 1024)
+PYDEVD_OUTPUT_BUFFER_MAX_LINES = as_int_in_env("PYDEVD_OUTPUT_BUFFER_MAX_LINES", 100)
+
+# Maximum number of entries in each of the in-memory caches of the path normalization (in
+# pydevd_file_utils). The oldest entries are evicted when the limit is reached (0 means unbounded).
+PYDEVD_PATHS_CACHE_MAX_ENTRIES = as_int_in_env("PYDEVD_PATHS_CACHE_MAX_ENTRIES", 50000)
+
+# Maximum number of entries in the (opt-in) cache of the presentation of the immutable values of
+# the variables, which is kept across suspensions so that the values which didn't change when
+# stepping aren't recomputed (0 means the cache is disabled).
+PYDEVD_VARIABLES_PRESENTATION_CACHE_MAX_ENTRIES = as_int_in_env("PYDEVD_VARIABLES_PRESENTATION_CACHE_MAX_ENTRIES", 0)
+
+# Directory of an optional persistent cache of the path normalization and of the project/library
+# classification of files (so that new processes -- i.e.: subprocesses or workers -- reuse what was
+# already computed instead of recomputing it for every file). Disabled if empty.
+PYDEVD_FILTERING_CACHE_DIR = os.getenv("PYDEVD_FILTERING_CACHE_DIR", "")
+
+# Maximum number of entries in each persistent cache file.
+PYDEVD_FILTERING_CACHE_MAX_ENTRIES = as_int_in_env("PYDEVD_FILTERING_CACHE_MAX_ENTRIES", 100000)
+
+# The json library used to encode/decode the debug adapter protocol messages. Valid values:
+# "auto" (use orjson or ujson if available, otherwise the stdlib json), "orjson", "ujson"
+# or "json".
+PYDEVD_JSON_CODEC = os.getenv("PYDEVD_JSON_CODEC", "auto").lower()
+
 # If specified in PYDEVD_IPYTHON_CONTEXT it must be a string with the basename
 # and then the name of 2 methods in which the evaluate is done.
 PYDEVD_IPYTHON_CONTEXT = ("interactiveshell.py", "run_code", "run_ast_nodes")
@@ -342,9 +386,38 @@ PANDAS_MAX_ROWS = as_int_in_env("PYDEVD_PANDAS_MAX_ROWS", 60)
 PANDAS_MAX_COLS = as_int_in_env("PYDEVD_PANDAS_MAX_COLS", 10)
 PANDAS_MAX_COLWIDTH = as_int_in_env("PYDEVD_PANDAS_MAX_COLWIDTH", 50)
 
+# Maximum number of bytes of the raw column buffers sent in each chunk when a numpy array or a
+# pandas DataFrame is requested in the columnar (binary) mode (the rows requested are clipped
+# so that the chunk fits, so, the client must ask for the remaining rows in a new request).
+PYDEVD_ARRAY_CHUNK_MAX_BYTES = as_int_in_env("PYDEVD_ARRAY_CHUNK_MAX_BYTES", 4 * 1024 * 1024)
+
+# When an evaluation is requested with the value streamed (i.e.: "stream": true in the "format" of
+# the "evaluate" request), a value with more than this number of chars is sent in chunks with this
+# number of chars (as "pydevdValueChunk" events before the response).
+PYDEVD_STREAM_VALUE_CHUNK_SIZE = as_int_in_env("PYDEVD_STREAM_VALUE_CHUNK_SIZE", 64 * 1024)
+
+# Maximum number of chunks of a streamed value waiting to be sent (when reached, computing the
+# next chunk waits for the writer, so that the memory used is bounded).
+PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS = as_int_in_env("PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS", 4)
+
+# Thread start/exit are notified as they happen (from the patched thread startup and from the
+# threading finalization hook), so, enumerating all the threads to reconcile the threads alive
+# with the ones notified is just a safety net which is done at most at this interval (in seconds).
+PYDEVD_THREADS_RECONCILE_INTERVAL = as_float_in_env("PYDEVD_THREADS_RECONCILE_INTERVAL", 1.0)
+
 # If getting an attribute or computing some value is too slow, let the user know if the given timeout elapses.
 PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT = as_float_in_env("PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT", 0.50)
 
+# Time (in seconds) to compute the values of the variables in a `variables` request. After it
+# elapses, the remaining values are provided as lazy variables (to be resolved on demand by the
+# client). 0 means no time budget.
+PYDEVD_VARIABLES_TIME_BUDGET = as_float_in_env("PYDEVD_VARIABLES_TIME_BUDGET", 2.0)
+
+# After the repr of values of some (non-builtin) type is slow (i.e.: takes more than the
+# PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT) this number of times, the values of that type are always
+# provided as lazy variables in the `variables` request. 0 means never.
+PYDEVD_DEFER_SLOW_REPR_COUNT = as_int_in_env("PYDEVD_DEFER_SLOW_REPR_COUNT", 2)
+
 # This timeout is used to track the time to send a message saying that the evaluation
 # is taking too long and possible mitigations.
 PYDEVD_WARN_EVALUATION_TIMEOUT = as_float_in_env("PYDEVD_WARN_EVALUATION_TIMEOUT", 3.0)
@@ -1,4 +1,8 @@
 import sys
+from _pydevd_bundle import pydevd_startup_profile
+
+# Note: if the accelerator can't be loaded the phase is reported without a duration.
+_load_phase = pydevd_startup_profile.phase("load accelerator: pydevd_cython")
 
 try:
     try:
@@ -35,6 +39,7 @@ except ImportError:
 # initial name so that the expected types from cython in frame eval
 # are valid.
 sys.modules["_pydevd_bundle.pydevd_cython"] = mod
+_load_phase.end()
 
 trace_dispatch = mod.trace_dispatch
 
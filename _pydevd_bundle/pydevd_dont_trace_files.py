@@ -98,6 +98,7 @@ DONT_TRACE = {
     'pydevd_additional_thread_info_regular.py': PYDEV_FILE,
     'pydevd_api.py': PYDEV_FILE,
     'pydevd_base_schema.py': PYDEV_FILE,
+    'pydevd_bounded_cache.py': PYDEV_FILE,
     'pydevd_breakpoints.py': PYDEV_FILE,
     'pydevd_bytecode_utils.py': PYDEV_FILE,
     'pydevd_bytecode_utils_py311.py': PYDEV_FILE,
@@ -120,6 +121,7 @@ DONT_TRACE = {
     'pydevd_extension_utils.py': PYDEV_FILE,
     'pydevd_file_utils.py': PYDEV_FILE,
     'pydevd_filtering.py': PYDEV_FILE,
+    'pydevd_filtering_cache.py': PYDEV_FILE,
     'pydevd_frame.py': PYDEV_FILE,
     'pydevd_frame_eval_cython_wrapper.py': PYDEV_FILE,
     'pydevd_frame_eval_main.py': PYDEV_FILE,
@@ -129,6 +131,7 @@ DONT_TRACE = {
     'pydevd_helpers.py': PYDEV_FILE,
     'pydevd_import_class.py': PYDEV_FILE,
     'pydevd_io.py': PYDEV_FILE,
+    'pydevd_json_codec.py': PYDEV_FILE,
     'pydevd_json_debug_options.py': PYDEV_FILE,
     'pydevd_line_validation.py': PYDEV_FILE,
     'pydevd_modify_bytecode.py': PYDEV_FILE,
@@ -152,6 +155,7 @@ DONT_TRACE = {
     'pydevd_signature.py': PYDEV_FILE,
     'pydevd_source_mapping.py': PYDEV_FILE,
     'pydevd_stackless.py': PYDEV_FILE,
+    'pydevd_startup_profile.py': PYDEV_FILE,
     'pydevd_suspended_frames.py': PYDEV_FILE,
     'pydevd_sys_monitoring.py': PYDEV_FILE,
     'pydevd_thread_lifecycle.py': PYDEV_FILE,
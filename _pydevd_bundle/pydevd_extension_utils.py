@@ -13,6 +13,23 @@ class ExtensionManager(object):
     def __init__(self):
         self.loaded_extensions = None
         self.type_to_instance = {}
+        self._on_loaded_callbacks = []
+
+    def add_on_loaded_callback(self, callback):
+        """
+        :param callback:
+            Called (without arguments) whenever the extensions are loaded (so that anything
+            computed from the previous extensions can be invalidated).
+        """
+        self._on_loaded_callbacks.append(callback)
+
+    def reload(self):
+        """
+        Loads the extensions again (i.e.: to pick up extensions which became available later on).
+        """
+        self.loaded_extensions = None
+        self.type_to_instance = {}
+        self._ensure_loaded()
 
     def _load_modules(self):
         self.loaded_extensions = []
@@ -27,6 +44,9 @@ class ExtensionManager(object):
                     except ImportError:
                         pydev_log.critical("Unable to load extension: %s", name)
 
+        for callback in self._on_loaded_callbacks:
+            callback()
+
     def _ensure_loaded(self):
         if self.loaded_extensions is None:
             self._load_modules()
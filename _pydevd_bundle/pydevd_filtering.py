@@ -1,6 +1,7 @@
 import fnmatch
 import glob
 import os.path
+import re
 import sys
 
 from _pydev_bundle import pydev_log
@@ -11,6 +12,7 @@ from _pydev_bundle._pydev_saved_modules import threading
 from pydevd_file_utils import normcase
 from _pydevd_bundle.pydevd_constants import USER_CODE_BASENAMES_STARTING_WITH, LIBRARY_CODE_BASENAMES_STARTING_WITH, IS_PYPY, IS_WINDOWS
 from _pydevd_bundle import pydevd_constants
+from _pydevd_bundle import pydevd_filtering_cache
 from _pydevd_bundle.pydevd_constants import is_true_in_env
 
 ExcludeFilter = namedtuple("ExcludeFilter", "name, exclude, is_path")
@@ -84,6 +86,297 @@ def glob_matches_path(path, pattern, sep=os.sep, altsep=os.altsep):
     return _check_matches(patterns, paths)
 
 
+def _translate_glob_part(pattern, sep):
+    """
+    Translates a glob for a single part of a path (i.e.: without any `sep`) to a regular
+    expression which doesn't match `sep` (based on `fnmatch.translate`).
+
+    Note: the output of `fnmatch.translate` can't just be post-processed: the `.` it uses for
+    `*` and `?` and its negated sets (`[!x]`) match `sep` and its output format isn't public
+    (it changes among Python versions -- i.e.: `*` is translated to atomic groups in Python 3.11
+    and to lookahead groups with backreferences before that), so, its handling of `*`, `?` and
+    sets is replicated here (the results are checked against `fnmatch` in the tests).
+    """
+    any_char = "[^%s]" % (re.escape(sep),)
+    not_sep = "(?!%s)" % (re.escape(sep),)
+    res = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        i = i + 1
+        if c == "*":
+            # Consecutive `*` are the same as a single `*`.
+            if not res or res[-1] != any_char + "*":
+                res.append(any_char + "*")
+        elif c == "?":
+            res.append(any_char)
+        elif c == "[":
+            j = i
+            if j < n and pattern[j] == "!":
+                j = j + 1
+            if j < n and pattern[j] == "]":
+                j = j + 1
+            while j < n and pattern[j] != "]":
+                j = j + 1
+            if j >= n:
+                res.append("\\[")
+            else:
+                stuff = pattern[i:j]
+                if "-" not in stuff:
+                    stuff = stuff.replace("\\", r"\\")
+                else:
+                    chunks = []
+                    k = i + 2 if pattern[i] == "!" else i + 1
+                    while True:
+                        k = pattern.find("-", k, j)
+                        if k < 0:
+                            break
+                        chunks.append(pattern[i:k])
+                        i = k + 1
+                        k = k + 3
+                    chunk = pattern[i:j]
+                    if chunk:
+                        chunks.append(chunk)
+                    else:
+                        chunks[-1] += "-"
+                    # Remove empty ranges -- invalid in RE.
+                    for k in range(len(chunks) - 1, 0, -1):
+                        if chunks[k - 1][-1] > chunks[k][0]:
+                            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+                            del chunks[k]
+                    # Escape backslashes and hyphens for set difference (--).
+                    # Hyphens that create ranges shouldn't be escaped.
+                    stuff = "-".join(s.replace("\\", r"\\").replace("-", r"\-") for s in chunks)
+                # Escape set operations (&&, ~~ and ||).
+                stuff = re.sub(r"([&~|])", r"\\\1", stuff)
+                i = j + 1
+                if not stuff:
+                    # Empty range: never match.
+                    res.append("(?!)")
+                elif stuff == "!":
+                    # Negated empty range: match any character.
+                    res.append(any_char)
+                else:
+                    if stuff[0] == "!":
+                        stuff = "^" + stuff[1:]
+                    elif stuff[0] in ("^", "["):
+                        stuff = "\\" + stuff
+                    # A range could include the separator, so, make sure it doesn't match it.
+                    res.append("%s[%s]" % (not_sep, stuff))
+        else:
+            res.append(re.escape(c))
+    return "".join(res)
+
+
+def _glob_parts_to_regex(patterns, sep):
+    """
+    Provides a regular expression with the same semantics of `_check_matches(patterns, paths)`
+    to be fully matched against `sep + sep.join(paths)` (with the paths already normalized).
+    """
+    escaped_sep = re.escape(sep)
+    any_part = "%s[^%s]*" % (escaped_sep, escaped_sep)
+    res = []
+    for i, pattern in enumerate(patterns):
+        if pattern == "**":
+            if i == len(patterns) - 1:
+                # A trailing `**` must match at least one part.
+                res.append("(?:%s)+" % (any_part,))
+            else:
+                res.append("(?:%s)*" % (any_part,))
+
+        elif not glob.has_magic(pattern):
+            res.append(re.escape(sep + normcase(pattern)))
+
+        else:
+            # Note: fnmatch.fnmatch also applies `os.path.normcase` to the pattern.
+            res.append(escaped_sep + _translate_glob_part(os.path.normcase(normcase(pattern)), sep))
+    return "".join(res)
+
+
+class _ExcludeFiltersMatcher(object):
+    """
+    Provides the same result of checking each ExcludeFilter in order (the first filter which
+    matches wins), but without having to check each filter for each file:
+
+    - each path filter is compiled to a regular expression and is indexed by one of the
+      literal parts of its pattern (i.e.: `**/vendored/**` is indexed by `vendored`), so,
+      only the filters whose literal part is in the path (along with the ones which don't
+      have any literal part) are checked.
+    - module filters are put in a trie (by the parts of the module name) which provides the
+      first module filter which matches.
+    """
+
+    def __init__(self, exclude_filters, sep=os.sep, altsep=os.altsep):
+        self._exclude_filters = list(exclude_filters)
+        self._sep = sep
+        self._altsep = altsep
+
+        # filter index -> tuple(pattern drive, regex, regex without drive)
+        self._path_filters = {}
+
+        # Path filters indexes by one of the parts of the path (normalized) which must be
+        # in the path for the filter to match.
+        self._path_part_to_filters = {}
+
+        # Path filters indexes which must always be checked.
+        self._path_filters_without_literal = []
+
+        # part -> [filter index or None, children]
+        self._modules_trie = {}
+
+        for i, exclude_filter in enumerate(self._exclude_filters):
+            if exclude_filter.is_path:
+                self._add_path_filter(i, exclude_filter.name)
+            else:
+                self._add_module_filter(i, exclude_filter.name)
+
+    def _add_path_filter(self, i, pattern):
+        sep = self._sep
+        if self._altsep:
+            pattern = pattern.replace(self._altsep, sep)
+
+        # Note: when the path has a drive, the drive of the pattern is checked separately
+        # (and the pattern is matched without it).
+        pattern_drive = ""
+        parts = self._split_parts(pattern)
+        parts_without_drive = parts
+        if len(pattern) > 1 and pattern[1] == ":":
+            pattern_drive = pattern[0].lower()
+            parts_without_drive = self._split_parts(pattern[2:])
+
+        regex = re.compile(_glob_parts_to_regex(parts, sep))
+        regex_without_drive = regex
+        if pattern_drive:
+            regex_without_drive = re.compile(_glob_parts_to_regex(parts_without_drive, sep))
+        self._path_filters[i] = (pattern_drive, regex, regex_without_drive)
+
+        literal_parts = set(normcase(part) for part in parts if not glob.has_magic(part))
+        literal_parts.intersection_update(normcase(part) for part in parts_without_drive if not glob.has_magic(part))
+        if literal_parts:
+            # Use the last one (usually the most specific).
+            for part in reversed(parts_without_drive):
+                part = normcase(part)
+                if part in literal_parts:
+                    self._path_part_to_filters.setdefault(part, []).append(i)
+                    break
+        else:
+            self._path_filters_without_literal.append(i)
+
+    def _add_module_filter(self, i, name):
+        node = None
+        children = self._modules_trie
+        for part in name.split("."):
+            node = children.get(part)
+            if node is None:
+                node = children[part] = [None, {}]
+            children = node[1]
+        if node[0] is None:
+            node[0] = i
+
+    def _split_parts(self, path):
+        parts = path.split(self._sep)
+        if parts[0] == "":
+            parts = parts[1:]
+        return parts
+
+    def _get_path_filter_index(self, path, max_index):
+        """
+        :return: the index of the first path filter matching the path (only filters
+            with an index lower than `max_index` are checked).
+        """
+        sep = self._sep
+        if self._altsep:
+            path = path.replace(self._altsep, sep)
+
+        drive = ""
+        if len(path) > 1 and path[1] == ":":
+            drive, path = path[0].lower(), path[2:]
+
+        parts = [normcase(part) for part in self._split_parts(path)]
+
+        candidates = self._path_filters_without_literal
+        path_part_to_filters = self._path_part_to_filters
+        if path_part_to_filters:
+            candidates = candidates[:]
+            for part in set(parts).intersection(path_part_to_filters):
+                candidates.extend(path_part_to_filters[part])
+            candidates.sort()
+
+        if not candidates:
+            return None
+
+        subject = "".join([sep + part for part in parts])
+        for i in candidates:
+            if i >= max_index:
+                break
+            pattern_drive, regex, regex_without_drive = self._path_filters[i]
+            if drive and pattern_drive:
+                if pattern_drive != drive:
+                    continue
+                regex = regex_without_drive
+            if regex.fullmatch(subject) is not None:
+                return i
+        return None
+
+    def _get_module_filter_index(self, module_name):
+        found = None
+        children = self._modules_trie
+        for part in module_name.split("."):
+            node = children.get(part)
+            if node is None:
+                break
+            if node[0] is not None and (found is None or node[0] < found):
+                found = node[0]
+            children = node[1]
+        return found
+
+    def get_exclude(self, absolute_filename, module_name):
+        """
+        :return: True if it should be excluded, False if it should be included and None
+            if no filter matched the given file.
+        """
+        found = None
+        if self._modules_trie and module_name is not None:
+            found = self._get_module_filter_index(module_name)
+
+        if self._path_filters:
+            found_path = self._get_path_filter_index(absolute_filename, len(self._exclude_filters) if found is None else found)
+            if found_path is not None:
+                found = found_path
+
+        if found is None:
+            return None
+        return self._exclude_filters[found].exclude
+
+
+# Flags in the nodes of the roots trie.
+_PROJECT_ROOT = 1
+_LIBRARY_ROOT = 2
+
+
+def _build_roots_trie(project_roots, library_roots, sep):
+    """
+    :param list(str) project_roots:
+    :param list(str) library_roots:
+        The roots (absolute, normalized and ending with `sep`).
+
+    :return: a trie with the parts of the roots where each node is a list with the
+        flags (_PROJECT_ROOT/_LIBRARY_ROOT) of the roots ending at that node and a dict
+        with the children nodes (part -> node).
+    """
+    trie = [0, {}]
+    for roots, flag in ((project_roots, _PROJECT_ROOT), (library_roots, _LIBRARY_ROOT)):
+        for root in roots:
+            node = trie
+            for part in root[:-1].split(sep):
+                children = node[1]
+                node = children.get(part)
+                if node is None:
+                    node = children[part] = [0, {}]
+            node[0] |= flag
+    return trie
+
+
 class FilesFiltering(object):
     """
     Note: calls at FilesFiltering are uncached.
@@ -93,13 +386,20 @@ class FilesFiltering(object):
 
     def __init__(self):
         self._exclude_filters = []
+        self._exclude_filters_matcher = _ExcludeFiltersMatcher([])
         self._project_roots = []
         self._library_roots = []
+        self._roots_trie = _build_roots_trie([], [], self._roots_sep)
 
         # Filter out libraries?
         self._use_libraries_filter = False
         self.require_module = False  # True if some exclude filter filters by the module.
 
+        # The persistent cache (only used if PYDEVD_FILTERING_CACHE_DIR is set) is only
+        # computed when needed as it depends on all the settings.
+        self._disk_cache = None
+        self._disk_cache_outdated = True
+
         self.set_use_libraries_filter(is_true_in_env("PYDEVD_FILTER_LIBRARIES"))
 
         project_roots = os.getenv("IDE_PROJECT_ROOTS", None)
@@ -126,7 +426,7 @@ class FilesFiltering(object):
                 exclude_filters = []
                 for key, val in json.loads(pydevd_filters).items():
                     exclude_filters.append(ExcludeFilter(key, val, True))
-                self._exclude_filters = exclude_filters
+                self.set_exclude_filters(exclude_filters)
             else:
                 # A ';' separated list of strings with globs for the
                 # list of excludes.
@@ -135,7 +435,7 @@ class FilesFiltering(object):
                 for new_filter in filters:
                     if new_filter.strip():
                         new_filters.append(ExcludeFilter(new_filter.strip(), True, True))
-                self._exclude_filters = new_filters
+                self.set_exclude_filters(new_filters)
 
     @classmethod
     def _get_default_library_roots(cls):
@@ -196,6 +496,8 @@ class FilesFiltering(object):
 
         return sorted(set(roots))
 
+    _roots_sep = "\\" if IS_WINDOWS else "/"
+
     def _fix_roots(self, roots):
         roots = _convert_to_str_and_clear_empty(roots)
         new_roots = []
@@ -213,8 +515,23 @@ class FilesFiltering(object):
         """
         return normcase(pydevd_file_utils.absolute_path(filename))
 
+    def _get_disk_cache(self):
+        if self._disk_cache_outdated:
+            self._disk_cache_outdated = False
+            settings = (
+                self._project_roots,
+                self._library_roots,
+                [tuple(exclude_filter) for exclude_filter in self._exclude_filters],
+                USER_CODE_BASENAMES_STARTING_WITH,
+                LIBRARY_CODE_BASENAMES_STARTING_WITH,
+            )
+            self._disk_cache = pydevd_filtering_cache.get_cache("filtering", settings)
+        return self._disk_cache
+
     def set_project_roots(self, project_roots):
         self._project_roots = self._fix_roots(project_roots)
+        self._roots_trie = _build_roots_trie(self._project_roots, self._library_roots, self._roots_sep)
+        self._disk_cache_outdated = True
         pydev_log.debug("IDE_PROJECT_ROOTS %s\n" % project_roots)
 
     def _get_project_roots(self):
@@ -222,6 +539,8 @@ class FilesFiltering(object):
 
     def set_library_roots(self, roots):
         self._library_roots = self._fix_roots(roots)
+        self._roots_trie = _build_roots_trie(self._project_roots, self._library_roots, self._roots_sep)
+        self._disk_cache_outdated = True
         pydev_log.debug("LIBRARY_ROOTS %s\n" % roots)
 
     def _get_library_roots(self):
@@ -229,10 +548,21 @@ class FilesFiltering(object):
 
     def in_project_roots(self, received_filename):
         """
-        Note: don't call directly. Use PyDb.in_project_scope (there's no caching here and it doesn't
-        handle all possibilities for knowing whether a project is actually in the scope, it
+        Note: don't call directly. Use PyDb.in_project_scope (there's no in-memory caching here and it
+        doesn't handle all possibilities for knowing whether a project is actually in the scope, it
         just handles the heuristics based on the absolute_normalized_filename without the actual frame).
         """
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return self._in_project_roots(received_filename)
+
+        in_project = disk_cache.get_in_project(received_filename)
+        if in_project is None:
+            in_project = self._in_project_roots(received_filename)
+            disk_cache.set_in_project(received_filename, in_project)
+        return in_project
+
+    def _in_project_roots(self, received_filename):
         DEBUG = False
 
         if received_filename.startswith(USER_CODE_BASENAMES_STARTING_WITH):
@@ -251,51 +581,43 @@ class FilesFiltering(object):
                 )
             return False
 
-        project_roots = self._get_project_roots()  # roots are absolute/normalized.
-
         absolute_normalized_filename = self._absolute_normalized_path(received_filename)
-        absolute_normalized_filename_as_dir = absolute_normalized_filename + ("\\" if IS_WINDOWS else "/")
-
-        found_in_project = []
-        for root in project_roots:
-            if root and (absolute_normalized_filename.startswith(root) or root == absolute_normalized_filename_as_dir):
-                if DEBUG:
-                    pydev_log.debug("In project: %s (%s)", absolute_normalized_filename, root)
-                found_in_project.append(root)
-
-        found_in_library = []
-        library_roots = self._get_library_roots()
-        for root in library_roots:
-            if root and (absolute_normalized_filename.startswith(root) or root == absolute_normalized_filename_as_dir):
-                found_in_library.append(root)
-                if DEBUG:
-                    pydev_log.debug("In library: %s (%s)", absolute_normalized_filename, root)
-            else:
-                if DEBUG:
-                    pydev_log.debug("Not in library: %s (%s)", absolute_normalized_filename, root)
 
-        if not project_roots:
+        # Roots are absolute/normalized and end with the separator, so, a root matches if its
+        # parts are a prefix of the parts of the filename (i.e.: `filename + sep` starts with
+        # the root). As all the roots matched are in the same walk, the deepest one is also
+        # the longest one.
+        project_depth = -1
+        library_depth = -1
+        node = self._roots_trie
+        for depth, part in enumerate(absolute_normalized_filename.split(self._roots_sep)):
+            node = node[1].get(part)
+            if node is None:
+                break
+            flags = node[0]
+            if flags & _PROJECT_ROOT:
+                project_depth = depth
+            if flags & _LIBRARY_ROOT:
+                library_depth = depth
+
+        if not self._project_roots:
             # If we have no project roots configured, consider it being in the project
             # roots if it's not found in site-packages (because we have defaults for those
             # and not the other way around).
-            in_project = not found_in_library
-            if DEBUG:
-                pydev_log.debug("Final in project (no project roots): %s (%s)", absolute_normalized_filename, in_project)
-
+            in_project = library_depth == -1
         else:
-            in_project = False
-            if found_in_project:
-                if not found_in_library:
-                    if DEBUG:
-                        pydev_log.debug("Final in project (in_project and not found_in_library): %s (True)", absolute_normalized_filename)
-                    in_project = True
-                else:
-                    # Found in both, let's see which one has the bigger path matched.
-                    if max(len(x) for x in found_in_project) > max(len(x) for x in found_in_library):
-                        in_project = True
-                    if DEBUG:
-                        pydev_log.debug("Final in project (found in both): %s (%s)", absolute_normalized_filename, in_project)
-
+            # If found in both, the one with the deepest root matched wins (and it's not
+            # in the project if the same root is in both).
+            in_project = project_depth > library_depth
+
+        if DEBUG:
+            pydev_log.debug(
+                "Final in project: %s (%s) -- project root depth: %s, library root depth: %s",
+                absolute_normalized_filename,
+                in_project,
+                project_depth,
+                library_depth,
+            )
         return in_project
 
     def use_libraries_filter(self):
@@ -317,21 +639,30 @@ class FilesFiltering(object):
         :return: True if it should be excluded, False if it should be included and None
             if no rule matched the given file.
         """
-        for exclude_filter in self._exclude_filters:  # : :type exclude_filter: ExcludeFilter
-            if exclude_filter.is_path:
-                if glob_matches_path(absolute_filename, exclude_filter.name):
-                    return exclude_filter.exclude
-            else:
-                # Module filter.
-                if exclude_filter.name == module_name or module_name.startswith(exclude_filter.name + "."):
-                    return exclude_filter.exclude
-        return None
+        if self.require_module:
+            # The result depends on the module name, so, it can't be saved in the disk cache.
+            return self._exclude_by_filter(absolute_filename, module_name)
+
+        disk_cache = self._get_disk_cache()
+        if disk_cache is None:
+            return self._exclude_by_filter(absolute_filename, module_name)
+
+        found, exclude = disk_cache.get_exclude(absolute_filename)
+        if not found:
+            exclude = self._exclude_by_filter(absolute_filename, module_name)
+            disk_cache.set_exclude(absolute_filename, exclude)
+        return exclude
+
+    def _exclude_by_filter(self, absolute_filename, module_name):
+        return self._exclude_filters_matcher.get_exclude(absolute_filename, module_name)
 
     def set_exclude_filters(self, exclude_filters):
         """
         :param list(ExcludeFilter) exclude_filters:
         """
         self._exclude_filters = exclude_filters
+        self._exclude_filters_matcher = _ExcludeFiltersMatcher(exclude_filters)
+        self._disk_cache_outdated = True
         self.require_module = False
         for exclude_filter in exclude_filters:
             if not exclude_filter.is_path:
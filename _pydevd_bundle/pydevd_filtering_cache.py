@@ -0,0 +1,358 @@
+"""
+Optional persistent (on-disk) cache of the classification of files done by the debugger.
+
+The absolute/real path of each file and whether it's in the project roots (or excluded by
+the filters) is computed for every new file in every new process. When the
+PYDEVD_FILTERING_CACHE_DIR environment variable is set, the results are saved in that
+directory so that new processes (i.e.: subprocesses or workers) can reuse them.
+
+Each cache file is specific to a fingerprint of the settings which affect its results (i.e.:
+the project roots, library roots and exclude filters), so, changing those settings uses a
+different file. Each entry also has the mtime/size of the file it refers to and is only
+used if those still match.
+
+The cache file is memory-mapped read-only and has the layout below (in the native byte
+order of the machine):
+
+    header:  magic (8 bytes), number of entries (uint32)
+    hashes:  crc32 of the utf-8 key of each entry (uint32 * number of entries, sorted)
+    records: _RECORD * number of entries (in the same order as the hashes)
+    strings: the utf-8 keys and values referenced by the records
+
+New entries are kept in memory and are merged into the file (written to a temporary file
+which is then renamed) when enough entries are pending and at exit.
+"""
+
+from array import array
+import atexit
+import bisect
+import mmap
+import os
+import struct
+import zlib
+
+from _pydev_bundle import pydev_log
+from _pydevd_bundle.pydevd_constants import ForkSafeLock, PYDEVD_FILTERING_CACHE_DIR, PYDEVD_FILTERING_CACHE_MAX_ENTRIES
+
+_MAGIC = b"PYDFC001"
+_HEADER = struct.Struct("=8sI")
+
+# key offset, key len, paths offset, paths len, mtime_ns, size, in_project, exclude
+_RECORD = struct.Struct("=IIIIqqBB")
+
+# Number of new entries which triggers a write of the cache file.
+_FLUSH_PENDING_ENTRIES = 5000
+
+# Indexes of the entries (which are lists with the same contents of a record, but with the
+# paths as a tuple instead of the offset/len in the strings).
+_MTIME_NS = 0
+_SIZE = 1
+_PATHS = 2
+_IN_PROJECT = 3
+_EXCLUDE = 4
+
+# Values for in_project/exclude.
+_UNKNOWN = 0
+_VALUE_TO_CODE = {None: 1, False: 2, True: 3}
+_CODE_TO_VALUE = {1: None, 2: False, 3: True}
+
+_USE_HASHES_ARRAY = array("I").itemsize == 4
+
+
+def _encode(s):
+    return s.encode("utf-8", "surrogatepass")
+
+
+def _decode(b):
+    return b.decode("utf-8", "surrogatepass")
+
+
+def _stat_key(filename):
+    try:
+        st = os.stat(filename)
+    except (OSError, ValueError):
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class FilteringDiskCache(object):
+    """
+    Note: the keys are filenames which are stat()'ed to check whether the entry is still valid
+    (so, entries are only saved for existing files).
+    """
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        # Note: the cache is used by forked workers too.
+        self._lock = ForkSafeLock()
+        self._pending = {}
+
+        # (mmap, hashes, count, records_offset, strings_offset) or None
+        self._data = None
+        self._load()
+
+    def _load(self):
+        data = None
+        try:
+            with open(self.cache_file, "rb") as stream:
+                mm = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            pass  # The file doesn't exist or is empty.
+        else:
+            try:
+                magic, count = _HEADER.unpack_from(mm, 0)
+                if magic == _MAGIC and _USE_HASHES_ARRAY:
+                    records_offset = _HEADER.size + 4 * count
+                    strings_offset = records_offset + _RECORD.size * count
+                    if len(mm) >= strings_offset:
+                        hashes = memoryview(mm)[_HEADER.size : records_offset].cast("I")
+                        data = (mm, hashes, count, records_offset, strings_offset)
+            except Exception:
+                pydev_log.exception("Error loading filtering cache: %s", self.cache_file)
+
+        self._data = data
+
+    def _get_entry_from_file(self, key, data):
+        if data is None:
+            return None
+        mm, hashes, count, records_offset, strings_offset = data
+        key_bytes = _encode(key)
+        key_hash = zlib.crc32(key_bytes)
+        i = bisect.bisect_left(hashes, key_hash)
+        while i < count and hashes[i] == key_hash:
+            key_offset, key_len, paths_offset, paths_len, mtime_ns, size, in_project, exclude = _RECORD.unpack_from(
+                mm, records_offset + i * _RECORD.size
+            )
+            key_offset += strings_offset
+            if mm[key_offset : key_offset + key_len] == key_bytes:
+                paths = None
+                if paths_len:
+                    paths_offset += strings_offset
+                    paths = tuple(_decode(mm[paths_offset : paths_offset + paths_len]).split("\0"))
+                return [mtime_ns, size, paths, in_project, exclude]
+            i += 1
+        return None
+
+    def _iter_file_entries(self, data):
+        if data is None:
+            return
+        mm, _hashes, count, records_offset, strings_offset = data
+        for i in range(count):
+            key_offset, key_len, paths_offset, paths_len, mtime_ns, size, in_project, exclude = _RECORD.unpack_from(
+                mm, records_offset + i * _RECORD.size
+            )
+            key_offset += strings_offset
+            key = _decode(mm[key_offset : key_offset + key_len])
+            paths = None
+            if paths_len:
+                paths_offset += strings_offset
+                paths = tuple(_decode(mm[paths_offset : paths_offset + paths_len]).split("\0"))
+            yield key, [mtime_ns, size, paths, in_project, exclude]
+
+    def _get_valid_entry(self, key):
+        # Pending entries were just validated in this process.
+        entry = self._pending.get(key)
+        if entry is not None:
+            return entry
+
+        try:
+            entry = self._get_entry_from_file(key, self._data)
+        except ValueError:
+            return None  # The mmap was just closed because the file is being rewritten.
+        if entry is None:
+            return None
+
+        stat_key = _stat_key(key)
+        if stat_key is None or stat_key[0] != entry[_MTIME_NS] or stat_key[1] != entry[_SIZE]:
+            return None
+        return entry
+
+    def _set_entry_value(self, key, index, value):
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                stat_key = _stat_key(key)
+                if stat_key is None:
+                    return
+
+                # Keep the other values saved for this file (if still valid).
+                entry = self._get_entry_from_file(key, self._data)
+                if entry is None or stat_key[0] != entry[_MTIME_NS] or stat_key[1] != entry[_SIZE]:
+                    entry = [stat_key[0], stat_key[1], None, _UNKNOWN, _UNKNOWN]
+                self._pending[key] = entry
+            entry[index] = value
+            flush = len(self._pending) >= _FLUSH_PENDING_ENTRIES
+
+        if flush:
+            self.flush()
+
+    def get_paths(self, key):
+        """
+        :return tuple(str)|None: the paths saved with `set_paths` or None if not available.
+        """
+        entry = self._get_valid_entry(key)
+        if entry is None:
+            return None
+        return entry[_PATHS]
+
+    def set_paths(self, key, paths):
+        self._set_entry_value(key, _PATHS, tuple(paths))
+
+    def get_in_project(self, key):
+        """
+        :return bool|None: whether the file is in the project or None if not available.
+        """
+        entry = self._get_valid_entry(key)
+        if entry is None:
+            return None
+        return _CODE_TO_VALUE.get(entry[_IN_PROJECT])
+
+    def set_in_project(self, key, in_project):
+        self._set_entry_value(key, _IN_PROJECT, _VALUE_TO_CODE[bool(in_project)])
+
+    def get_exclude(self, key):
+        """
+        :return tuple(bool, bool|None): whether the value is available and the value (which
+            may be None if no filter matched the file).
+        """
+        entry = self._get_valid_entry(key)
+        if entry is None or entry[_EXCLUDE] == _UNKNOWN:
+            return False, None
+        return True, _CODE_TO_VALUE[entry[_EXCLUDE]]
+
+    def set_exclude(self, key, exclude):
+        self._set_entry_value(key, _EXCLUDE, _VALUE_TO_CODE[exclude])
+
+    def flush(self):
+        """
+        Merges the pending entries into the cache file.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            pending = self._pending
+            self._pending = {}
+
+            try:
+                self._write(pending)
+            except Exception:
+                pydev_log.exception("Error writing filtering cache: %s", self.cache_file)
+            else:
+                self._load()
+
+    def _write(self, pending):
+        entries = {}
+        # Start with the entries which are already in the file (up to the max entries
+        # allowed as the pending ones must also fit).
+        max_from_file = max(0, PYDEVD_FILTERING_CACHE_MAX_ENTRIES - len(pending))
+        for key, entry in self._iter_file_entries(self._data):
+            if len(entries) >= max_from_file:
+                break
+            entries[key] = entry
+        entries.update(pending)
+
+        items = []
+        for key, entry in entries.items():
+            key_bytes = _encode(key)
+            items.append((zlib.crc32(key_bytes), key_bytes, entry))
+        items.sort(key=lambda item: item[0])
+
+        hashes = array("I", [item[0] for item in items])
+        records = []
+        strings = []
+        strings_len = 0
+        for _key_hash, key_bytes, entry in items:
+            key_offset = strings_len
+            strings.append(key_bytes)
+            strings_len += len(key_bytes)
+
+            paths_offset = paths_len = 0
+            if entry[_PATHS] is not None:
+                paths_bytes = _encode("\0".join(entry[_PATHS]))
+                paths_offset = strings_len
+                paths_len = len(paths_bytes)
+                strings.append(paths_bytes)
+                strings_len += paths_len
+
+            records.append(
+                _RECORD.pack(
+                    key_offset,
+                    len(key_bytes),
+                    paths_offset,
+                    paths_len,
+                    entry[_MTIME_NS],
+                    entry[_SIZE],
+                    entry[_IN_PROJECT],
+                    entry[_EXCLUDE],
+                )
+            )
+
+        temp_file = "%s.%s.tmp" % (self.cache_file, os.getpid())
+        with open(temp_file, "wb") as stream:
+            stream.write(_HEADER.pack(_MAGIC, len(items)))
+            stream.write(hashes.tobytes())
+            stream.write(b"".join(records))
+            stream.write(b"".join(strings))
+
+        # The current file must not be mapped anymore when it's replaced.
+        data = self._data
+        self._data = None
+        if data is not None:
+            data[1].release()
+            data[0].close()
+
+        try:
+            os.replace(temp_file, self.cache_file)
+        except OSError:
+            # i.e.: on Windows it's not possible to replace a file which is mapped in
+            # another process (just skip writing it this time).
+            pydev_log.debug("Unable to replace filtering cache: %s", self.cache_file)
+            os.remove(temp_file)
+
+
+_fingerprint_to_cache = {}
+_caches_lock = ForkSafeLock()
+
+
+def get_cache(kind, settings):
+    """
+    :param str kind:
+        The kind of contents of the cache (used in the cache file name).
+
+    :param settings:
+        Something whose repr() identifies the settings which affect the cached results.
+
+    :return FilteringDiskCache|None:
+        The cache to be used for the given settings or None if the persistent cache is disabled.
+    """
+    if not PYDEVD_FILTERING_CACHE_DIR:
+        return None
+
+    settings_as_bytes = _encode(repr((_MAGIC, kind, settings)))
+    fingerprint = "%08x%08x" % (zlib.crc32(settings_as_bytes), zlib.adler32(settings_as_bytes))
+    with _caches_lock:
+        cache = _fingerprint_to_cache.get(fingerprint)
+        if cache is None:
+            if not _fingerprint_to_cache:
+                atexit.register(flush_all)
+            try:
+                os.makedirs(PYDEVD_FILTERING_CACHE_DIR, exist_ok=True)
+            except OSError:
+                pydev_log.exception("Unable to create filtering cache dir: %s", PYDEVD_FILTERING_CACHE_DIR)
+            cache_file = os.path.join(PYDEVD_FILTERING_CACHE_DIR, "pydevd_%s_%s.cache" % (kind, fingerprint))
+            cache = _fingerprint_to_cache[fingerprint] = FilteringDiskCache(cache_file)
+    return cache
+
+
+def flush_all():
+    for cache in list(_fingerprint_to_cache.values()):
+        cache.flush()
+
+
+def after_fork():
+    """
+    Must be called in the new process after a fork (the entries which were pending in the
+    parent process are written by the parent).
+    """
+    for cache in list(_fingerprint_to_cache.values()):
+        cache._pending = {}
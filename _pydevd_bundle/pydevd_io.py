@@ -1,4 +1,13 @@
-from _pydevd_bundle.pydevd_constants import ForkSafeLock, get_global_debugger
+from _pydevd_bundle.pydevd_constants import (
+    ForkSafeLock,
+    get_global_debugger,
+    PYDEVD_OUTPUT_BUFFER_WINDOW,
+    PYDEVD_OUTPUT_BUFFER_MAX_BYTES,
+    PYDEVD_OUTPUT_BUFFER_MAX_LINES,
+)
+from _pydev_bundle._pydev_saved_modules import ThreadingEvent, time
+from _pydev_bundle.pydev_override import overrides
+from _pydevd_bundle.pydevd_daemon_thread import PyDBDaemonThread
 import os
 import sys
 from contextlib import contextmanager
@@ -59,8 +68,119 @@ class IORedirector:
         raise AttributeError(name)
 
 
+class OutputBuffer(object):
+    """
+    Merges the output of consecutive writes to stdout/stderr so that fewer io messages
+    are sent to the client.
+
+    The output is kept in segments (a new segment is started whenever the stream
+    changes, so, the ordering between stdout and stderr is kept) and each segment is
+    sent as a single io message when the buffer is flushed, which happens when:
+
+    - the time window since the first buffered write elapses (checked in a pydevd
+      daemon thread);
+    - the buffered output reaches the max number of bytes or lines;
+    - the debugger is about to notify a suspension or to exit (see: flush_output_buffer()).
+    """
+
+    def __init__(self, window, max_bytes, max_lines):
+        # Note: rlock because writing a command may end up writing to stderr (in debug mode).
+        self._lock = ForkSafeLock(rlock=True)
+        self._window = window
+        self._max_bytes = max_bytes
+        self._max_lines = max_lines
+
+        # list(tuple(out_ctx, list(str)))
+        self._segments = []
+        self._py_db = None
+        self._buffered_bytes = 0
+        self._buffered_lines = 0
+
+        self._flusher_thread = None
+        self._flush_requested_event = ThreadingEvent()
+
+    def write(self, py_db, out_ctx, s):
+        with self._lock:
+            if self._py_db is not py_db:
+                self.flush()
+                self._py_db = py_db
+
+            segments = self._segments
+            if segments and segments[-1][0] == out_ctx:
+                segments[-1][1].append(s)
+            else:
+                segments.append((out_ctx, [s]))
+
+            self._buffered_bytes += len(s)
+            self._buffered_lines += s.count("\n")
+
+            if self._buffered_bytes >= self._max_bytes or self._buffered_lines >= self._max_lines:
+                self.flush()
+                return
+
+        self._request_flush(py_db)
+
+    def _request_flush(self, py_db):
+        flusher_thread = self._flusher_thread
+        if flusher_thread is None or flusher_thread.py_db is not py_db or not flusher_thread.is_alive():
+            with self._lock:
+                flusher_thread = self._flusher_thread
+                if flusher_thread is None or flusher_thread.py_db is not py_db or not flusher_thread.is_alive():
+                    self._flusher_thread = flusher_thread = _OutputBufferFlusherThread(py_db, self)
+                    flusher_thread.start()
+
+        self._flush_requested_event.set()
+
+    def flush(self):
+        """
+        Sends what's currently buffered (one io message for each segment).
+        """
+        with self._lock:
+            segments = self._segments
+            if not segments:
+                return
+            py_db = self._py_db
+
+            self._segments = []
+            self._buffered_bytes = 0
+            self._buffered_lines = 0
+
+            if py_db is None:
+                return
+
+            writer = py_db.writer
+            if writer is not None:
+                for out_ctx, contents in segments:
+                    writer.add_command(py_db.cmd_factory.make_io_message("".join(contents), out_ctx))
+
+
+class _OutputBufferFlusherThread(PyDBDaemonThread):
+    def __init__(self, py_db, output_buffer):
+        PyDBDaemonThread.__init__(self, py_db)
+        self.name = "pydevd.OutputBufferFlusher"
+        self._output_buffer = output_buffer
+
+    @overrides(PyDBDaemonThread._on_run)
+    def _on_run(self):
+        output_buffer = self._output_buffer
+        event = output_buffer._flush_requested_event
+        while not self._kill_received:
+            if event.wait(0.5):
+                event.clear()
+                # Give some time for more output to be merged.
+                initial_time = time.time()
+                while not self._kill_received and time.time() - initial_time < output_buffer._window:
+                    time.sleep(min(0.05, output_buffer._window))
+                output_buffer.flush()
+
+    @overrides(PyDBDaemonThread.do_kill_pydev_thread)
+    def do_kill_pydev_thread(self):
+        PyDBDaemonThread.do_kill_pydev_thread(self)
+        self._output_buffer._flush_requested_event.set()
+
+
 class RedirectToPyDBIoMessages(object):
-    def __init__(self, out_ctx, wrap_stream, wrap_buffer, on_write=None):
+    def __init__(self, out_ctx, wrap_stream, wrap_buffer, on_write=None, output_buffer=None):
         """
         :param out_ctx:
             1=stdout and 2=stderr
@@ -76,6 +196,10 @@ class RedirectToPyDBIoMessages(object):
             May be a custom callable to be called when to write something.
             If not passed the default implementation will create an io message
             and send it through the debugger.
+
+        :param OutputBuffer output_buffer:
+            If passed, the output is merged in this buffer before being sent
+            through the debugger.
         """
         encoding = getattr(wrap_stream, "encoding", None)
         if not encoding:
@@ -83,8 +207,9 @@ class RedirectToPyDBIoMessages(object):
         self.encoding = encoding
         self._out_ctx = out_ctx
         if wrap_buffer:
-            self.buffer = RedirectToPyDBIoMessages(out_ctx, wrap_stream, wrap_buffer=False, on_write=on_write)
+            self.buffer = RedirectToPyDBIoMessages(out_ctx, wrap_stream, wrap_buffer=False, on_write=on_write, output_buffer=output_buffer)
         self._on_write = on_write
+        self._output_buffer = output_buffer
 
     def get_pydb(self):
         # Note: separate method for mocking on tests.
@@ -105,6 +230,10 @@ class RedirectToPyDBIoMessages(object):
 
             py_db = self.get_pydb()
             if py_db is not None:
+                if self._output_buffer is not None:
+                    self._output_buffer.write(py_db, self._out_ctx, s)
+                    return
+
                 # Note that the actual message contents will be a xml with utf-8, although
                 # the entry is str on py3 and bytes on py2.
                 cmd = py_db.cmd_factory.make_io_message(s, self._out_ctx)
@@ -158,6 +287,9 @@ class _RedirectionsHolder:
     _pydevd_stdout_redirect_ = None
     _pydevd_stderr_redirect_ = None
 
+    # Shared by stdout and stderr (so that the ordering is kept).
+    _output_buffer = None
+
 
 def start_redirect(keep_original_redirection=False, std="stdout", redirect_to=None):
     """
@@ -212,7 +344,15 @@ def redirect_stream_to_pydb_io_messages(std):
             wrap_buffer = True
             original = getattr(sys, std)
 
-            redirect_to = RedirectToPyDBIoMessages(1 if std == "stdout" else 2, original, wrap_buffer)
+            output_buffer = None
+            if PYDEVD_OUTPUT_BUFFER_WINDOW > 0:
+                output_buffer = _RedirectionsHolder._output_buffer
+                if output_buffer is None:
+                    output_buffer = _RedirectionsHolder._output_buffer = OutputBuffer(
+                        PYDEVD_OUTPUT_BUFFER_WINDOW, PYDEVD_OUTPUT_BUFFER_MAX_BYTES, PYDEVD_OUTPUT_BUFFER_MAX_LINES
+                    )
+
+            redirect_to = RedirectToPyDBIoMessages(1 if std == "stdout" else 2, original, wrap_buffer, output_buffer=output_buffer)
             start_redirect(keep_original_redirection=True, std=std, redirect_to=redirect_to)
 
             stack = getattr(_RedirectionsHolder, "_stack_%s" % std)
@@ -241,6 +381,16 @@ def stop_redirect_stream_to_pydb_io_messages(std):
                 setattr(sys, std, redirect_info.original)
 
 
+def flush_output_buffer():
+    """
+    Sends the output which is currently buffered to the client (if the output buffering
+    is enabled).
+    """
+    output_buffer = _RedirectionsHolder._output_buffer
+    if output_buffer is not None:
+        output_buffer.flush()
+
+
 @contextmanager
 def redirect_stream_to_pydb_io_messages_context():
     with _RedirectionsHolder._lock:
@@ -0,0 +1,101 @@
+"""
+Encoding/decoding of the json messages of the debug adapter protocol.
+
+orjson or ujson are used if available (they're much faster than the stdlib json on
+big messages such as the `variables` or `stackTrace` responses) and the stdlib json
+is used as the fallback (also for any message the faster library can't handle, such
+as a message with an int which doesn't fit in 64 bits).
+
+The library may be chosen with the PYDEVD_JSON_CODEC environment variable.
+"""
+
+import json
+
+from _pydev_bundle import pydev_log
+from _pydevd_bundle.pydevd_constants import PYDEVD_JSON_CODEC
+
+
+def _stdlib_dumps(obj):
+    return json.dumps(obj, default=str).encode("utf-8")
+
+
+def _stdlib_loads(contents):
+    return json.loads(contents)
+
+
+def _create_orjson_codec():
+    import orjson
+
+    # Values which orjson would encode natively but the stdlib json encodes with `default=str`
+    # are passed through to `str` so that the messages are the same with any codec.
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj):
+        try:
+            return orjson.dumps(obj, default=str, option=option)
+        except Exception:
+            return _stdlib_dumps(obj)
+
+    def loads(contents):
+        try:
+            return orjson.loads(contents)
+        except Exception:
+            return _stdlib_loads(contents)  # Raise the same error the stdlib would.
+
+    return dumps, loads
+
+
+def _create_ujson_codec():
+    import ujson
+
+    def dumps(obj):
+        try:
+            return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False, default=str).encode("utf-8")
+        except Exception:
+            return _stdlib_dumps(obj)
+
+    def loads(contents):
+        try:
+            return ujson.loads(contents)
+        except Exception:
+            return _stdlib_loads(contents)  # Raise the same error the stdlib would.
+
+    return dumps, loads
+
+
+_CODEC_CREATORS = {
+    "orjson": _create_orjson_codec,
+    "ujson": _create_ujson_codec,
+}
+
+
+def _create_codec(codec_name):
+    """
+    :return tuple(str, callable, callable):
+        The name of the codec used and the dumps/loads functions.
+    """
+    if codec_name == "auto":
+        candidates = ("orjson", "ujson")
+    elif codec_name in _CODEC_CREATORS:
+        candidates = (codec_name,)
+    else:
+        if codec_name != "json":
+            pydev_log.critical("Unexpected value for PYDEVD_JSON_CODEC: %s (using the stdlib json).", codec_name)
+        candidates = ()
+
+    for candidate in candidates:
+        try:
+            dumps, loads = _CODEC_CREATORS[candidate]()
+        except ImportError:
+            if codec_name != "auto":
+                pydev_log.critical("Unable to import %s (PYDEVD_JSON_CODEC) -- using the stdlib json.", candidate)
+        except Exception:
+            pydev_log.exception("Error creating the %s json codec.", candidate)
+        else:
+            return candidate, dumps, loads
+
+    return "json", _stdlib_dumps, _stdlib_loads
+
+
+# dumps(obj) -> bytes (utf-8) and loads(str or bytes) -> obj
+codec_name, dumps, loads = _create_codec(PYDEVD_JSON_CODEC)
@@ -7,7 +7,7 @@ from _pydevd_bundle.pydevd_constants import (
 from _pydevd_bundle.pydevd_utils import quote_smart as quote, to_string
 from _pydevd_bundle.pydevd_comm_constants import ID_TO_MEANING, CMD_EXIT
 from _pydevd_bundle.pydevd_constants import HTTP_PROTOCOL, HTTP_JSON_PROTOCOL, get_protocol, IS_JYTHON, ForkSafeLock
-import json
+from _pydevd_bundle import pydevd_json_codec
 from _pydev_bundle import pydev_log
 
 
@@ -21,9 +21,18 @@ class _BaseNetCommand(object):
     def send(self, *args, **kwargs):
         pass
 
+    def get_chunks_to_send(self):
+        return ()
+
     def call_after_send(self, callback):
         pass
 
+    def has_after_send(self):
+        return False
+
+    def notify_after_send(self, sock):
+        pass
+
 
 class _NullNetCommand(_BaseNetCommand):
     pass
@@ -77,16 +86,17 @@ class NetCommand(_BaseNetCommand):
             as_dict["pydevd_cmd_id"] = cmd_id
             as_dict["seq"] = seq
             self.as_dict = as_dict
-            text = json.dumps(as_dict, default=str)
-
-        assert isinstance(text, str)
+            msg = pydevd_json_codec.dumps(as_dict)
 
-        if DebugInfoHolder.DEBUG_TRACE_LEVEL >= 1:
-            self._show_debug_info(cmd_id, seq, text)
+            if DebugInfoHolder.DEBUG_TRACE_LEVEL >= 1:
+                self._show_debug_info(cmd_id, seq, msg.decode("utf-8"))
 
-        if is_json:
-            msg = text
         else:
+            assert isinstance(text, str)
+
+            if DebugInfoHolder.DEBUG_TRACE_LEVEL >= 1:
+                self._show_debug_info(cmd_id, seq, text)
+
             if protocol not in (HTTP_PROTOCOL, HTTP_JSON_PROTOCOL):
                 encoded = quote(to_string(text), '/<>_=" \t')
                 msg = "%s\t%s\t%s\n" % (cmd_id, seq, encoded)
@@ -101,15 +111,21 @@ class NetCommand(_BaseNetCommand):
         as_bytes = msg
         self._as_bytes = as_bytes
 
-    def send(self, sock):
+    def get_chunks_to_send(self):
+        """
+        :return tuple(bytes):
+            The chunks which must be written to the socket to send this command.
+        """
         as_bytes = self._as_bytes
+        if get_protocol() in (HTTP_PROTOCOL, HTTP_JSON_PROTOCOL):
+            return (("Content-Length: %s\r\n\r\n" % len(as_bytes)).encode("ascii"), as_bytes)
+        return (as_bytes,)
+
+    def send(self, sock):
         try:
-            if get_protocol() in (HTTP_PROTOCOL, HTTP_JSON_PROTOCOL):
-                sock.sendall(("Content-Length: %s\r\n\r\n" % len(as_bytes)).encode("ascii"))
-            sock.sendall(as_bytes)
-            if self._after_send:
-                for method in self._after_send:
-                    method(sock)
+            # Note: header and contents are sent in a single write.
+            sock.sendall(b"".join(self.get_chunks_to_send()))
+            self.notify_after_send(sock)
         except:
             if IS_JYTHON:
                 # Ignore errors in sock.sendall in Jython (seems to be common for Jython to
@@ -124,6 +140,17 @@ class NetCommand(_BaseNetCommand):
         else:
             self._after_send.append(callback)
 
+    def has_after_send(self):
+        return bool(self._after_send)
+
+    def notify_after_send(self, sock):
+        """
+        Should be called after the chunks of this command are written to the socket.
+        """
+        if self._after_send:
+            for method in self._after_send:
+                method(sock)
+
     @classmethod
     def _show_debug_info(cls, cmd_id, seq, text):
         with cls._show_debug_info_lock:
@@ -7,7 +7,7 @@ import socket as socket_module
 from _pydev_bundle._pydev_imports_tipper import TYPE_IMPORT, TYPE_CLASS, TYPE_FUNCTION, TYPE_ATTR, TYPE_BUILTIN, TYPE_PARAM
 from _pydev_bundle.pydev_is_thread_alive import is_thread_alive
 from _pydev_bundle.pydev_override import overrides
-from _pydevd_bundle._debug_adapter import pydevd_schema
+from _pydevd_bundle._debug_adapter import pydevd_schema, pydevd_base_schema
 from _pydevd_bundle._debug_adapter.pydevd_schema import (
     ModuleEvent,
     ModuleEventBody,
@@ -166,6 +166,8 @@ class NetCommandFactoryJson(NetCommandFactory):
 
     @overrides(NetCommandFactory.make_list_threads_message)
     def make_list_threads_message(self, py_db, seq):
+        # Note: the response is built directly as a dict (see: build_response_dict).
+        translate_id_to_dap = pydevd_base_schema.translate_id_to_dap
         threads = []
         for thread in get_non_pydevd_threads():
             if is_thread_alive(thread):
@@ -174,16 +176,12 @@ class NetCommandFactoryJson(NetCommandFactory):
                 # Notify that it's created (no-op if we already notified before).
                 py_db.notify_thread_created(thread_id, thread)
 
-                thread_schema = pydevd_schema.Thread(id=thread_id, name=thread.name)
-                threads.append(thread_schema.to_dict())
+                threads.append({"id": translate_id_to_dap(thread_id), "name": thread.name})
 
         for thread_id, thread_name in list(self._additional_thread_id_to_thread_name.items()):
-            thread_schema = pydevd_schema.Thread(id=thread_id, name=thread_name)
-            threads.append(thread_schema.to_dict())
-
-        body = pydevd_schema.ThreadsResponseBody(threads)
-        response = pydevd_schema.ThreadsResponse(request_seq=seq, success=True, command="threads", body=body)
+            threads.append({"id": translate_id_to_dap(thread_id), "name": thread_name})
 
+        response = pydevd_base_schema.build_response_dict(seq, "threads", {"threads": threads})
         return NetCommand(CMD_RETURN, 0, response, is_json=True)
 
     @overrides(NetCommandFactory.make_get_completions_message)
@@ -235,10 +233,40 @@ class NetCommandFactoryJson(NetCommandFactory):
 
         return frame_name
 
+    def _get_code_presentation_info(self, py_db, frame, original_filename):
+        """
+        :return tuple(str, bool):
+            The module name and whether the code is in the project scope (cached by the code
+            object as it's the same for all its frames).
+        """
+        code = frame.f_code
+        cache = py_db.code_presentation_cache
+        try:
+            return cache[code]
+        except KeyError:
+            pass
+
+        try:
+            module_name = str(frame.f_globals.get("__name__", ""))
+        except:
+            module_name = "<unknown>"
+
+        if getattr(frame, "IS_PLUGIN_FRAME", False):
+            # Plugin frames are never shown as subtle (and as they're created on demand, don't cache them).
+            return module_name, True
+
+        info = (module_name, py_db.in_project_scope(frame, original_filename))
+        try:
+            cache[code] = info
+        except TypeError:
+            pass  # Unable to create a weak reference to the code: don't cache it.
+        return info
+
     @overrides(NetCommandFactory.make_get_thread_stack_message)
     def make_get_thread_stack_message(self, py_db, seq, thread_id, topmost_frame, fmt, must_be_suspended=False, start_frame=0, levels=0):
         frames = []
         module_events = []
+        translate_id_to_dap = pydevd_base_schema.translate_id_to_dap
 
         try:
             # : :type suspended_frames_manager: SuspendedFramesManager
@@ -251,31 +279,39 @@ class NetCommandFactoryJson(NetCommandFactory):
                 else:
                     frames_list = pydevd_frame_utils.create_frames_list_from_frame(topmost_frame)
 
-            for (
-                frame_id,
-                frame,
-                method_name,
-                original_filename,
-                filename_in_utf8,
-                lineno,
-                applied_mapping,
-                show_as_current_frame,
-                line_col_info,
-            ) in self._iter_visible_frames_info(py_db, frames_list, flatten_chained=True):
-                try:
-                    module_name = str(frame.f_globals.get("__name__", ""))
-                except:
-                    module_name = "<unknown>"
-
-                module_events.extend(self.modules_manager.track_module(filename_in_utf8, module_name, frame))
-
-                presentation_hint = None
+            # Filtering the frames is cheap (the results are cached), so, do it for all the frames to
+            # know the total number of frames and then compute the info just for the frames requested.
+            visible_frames = []
+            for visible_frame in self._iter_visible_frames(py_db, frames_list, flatten_chained=True):
+                frame = visible_frame[1]
                 if not getattr(frame, "IS_PLUGIN_FRAME", False):  # Never filter out plugin frames!
-                    if py_db.is_files_filter_enabled and py_db.apply_files_filter(frame, original_filename, False):
+                    if py_db.is_files_filter_enabled and py_db.apply_files_filter(frame, visible_frame[3][0], False):
                         continue
+                visible_frames.append(visible_frame)
+
+            total_frames = len(visible_frames)
+            if bool(levels):
+                visible_frames = visible_frames[start_frame : start_frame + levels]
+
+            for visible_frame in visible_frames:
+                (
+                    frame_id,
+                    frame,
+                    method_name,
+                    original_filename,
+                    filename_in_utf8,
+                    lineno,
+                    applied_mapping,
+                    show_as_current_frame,
+                    line_col_info,
+                ) = self._get_visible_frame_info(py_db, *visible_frame)
+
+                module_name, in_project_scope = self._get_code_presentation_info(py_db, frame, original_filename)
+                module_events.extend(self.modules_manager.track_module(filename_in_utf8, module_name, frame))
 
-                    if not py_db.in_project_scope(frame):
-                        presentation_hint = "subtle"
+                presentation_hint = None
+                if not in_project_scope:
+                    presentation_hint = "subtle"
 
                 formatted_name = self._format_frame_name(fmt, method_name, module_name, lineno, filename_in_utf8)
                 if show_as_current_frame:
@@ -308,39 +344,31 @@ class NetCommandFactoryJson(NetCommandFactory):
                             if line_col_info.lineno == line_col_info.end_lineno:
                                 endcol = endcolno + 1
 
-                frames.append(
-                    pydevd_schema.StackFrame(
-                        frame_id,
-                        formatted_name,
-                        lineno,
-                        column=column,
-                        endColumn=endcol,
-                        source={
-                            "path": filename_in_utf8,
-                            "sourceReference": source_reference,
-                        },
-                        presentationHint=presentation_hint,
-                    ).to_dict()
-                )
+                # Note: the same dict which would be created by pydevd_schema.StackFrame.to_dict(update_ids_to_dap=True).
+                stack_frame = {
+                    "id": translate_id_to_dap(frame_id),
+                    "name": formatted_name,
+                    "line": lineno,
+                    "column": column,
+                    "source": {
+                        "path": filename_in_utf8,
+                        "sourceReference": source_reference,
+                    },
+                }
+                if endcol is not None:
+                    stack_frame["endColumn"] = endcol
+                if presentation_hint is not None:
+                    stack_frame["presentationHint"] = presentation_hint
+                frames.append(stack_frame)
         finally:
             topmost_frame = None
+            frame = None
+            visible_frames = None
 
         for module_event in module_events:
             py_db.writer.add_command(module_event)
 
-        total_frames = len(frames)
-        stack_frames = frames
-        if bool(levels):
-            start = start_frame
-            end = min(start + levels, total_frames)
-            stack_frames = frames[start:end]
-
-        response = pydevd_schema.StackTraceResponse(
-            request_seq=seq,
-            success=True,
-            command="stackTrace",
-            body=pydevd_schema.StackTraceResponseBody(stackFrames=stack_frames, totalFrames=total_frames),
-        )
+        response = pydevd_base_schema.build_response_dict(seq, "stackTrace", {"stackFrames": frames, "totalFrames": total_frames})
         return NetCommand(CMD_RETURN, 0, response, is_json=True)
 
     @overrides(NetCommandFactory.make_warning_message)
@@ -353,8 +381,8 @@ class NetCommandFactoryJson(NetCommandFactory):
     @overrides(NetCommandFactory.make_io_message)
     def make_io_message(self, msg, ctx):
         category = "stdout" if int(ctx) == 1 else "stderr"
-        body = OutputEventBody(msg, category)
-        event = OutputEvent(body)
+        # Note: the event is built directly as a dict (see: build_event_dict).
+        event = pydevd_base_schema.build_event_dict("output", {"output": msg, "category": category, "source": {}})
         return NetCommand(CMD_WRITE_TO_CONSOLE, 0, event, is_json=True)
 
     @overrides(NetCommandFactory.make_console_message)
@@ -194,12 +194,18 @@ class NetCommandFactory(object):
         except:
             return self.make_error_message(0, get_exception_traceback_str())
 
-    def _iter_visible_frames_info(self, py_db, frames_list, flatten_chained=False):
+    def _iter_visible_frames(self, py_db, frames_list, flatten_chained=False):
+        """
+        Provides the frames which may be shown to the user (pydevd frames are skipped) without
+        computing the info for the client (which is done by `_get_visible_frame_info` only for
+        the frames actually needed).
+
+        :return: yields tuple(frames_list, frame, method_name, abs_path_real_path_and_base)
+        """
         assert frames_list.__class__ == FramesList
         is_chained = False
         while True:
             for frame in frames_list:
-                show_as_current_frame = frame is frames_list.current_frame
                 if frame.f_code is None:
                     pydev_log.info("Frame without f_code: %s", frame)
                     continue  # IronPython sometimes does not have it!
@@ -215,28 +221,9 @@ class NetCommandFactory(object):
                 abs_path_real_path_and_base = get_abs_path_real_path_and_base_from_frame(frame)
                 if py_db.get_file_type(frame, abs_path_real_path_and_base) == py_db.PYDEV_FILE:
                     # Skip pydevd files.
-                    frame = frame.f_back
                     continue
 
-                frame_id = id(frame)
-                lineno = frames_list.frame_id_to_lineno.get(frame_id, frame.f_lineno)
-                line_col_info = frames_list.frame_id_to_line_col_info.get(frame_id)
-
-                filename_in_utf8, lineno, changed = py_db.source_mapping.map_to_client(abs_path_real_path_and_base[0], lineno)
-                new_filename_in_utf8, applied_mapping = pydevd_file_utils.map_file_to_client(filename_in_utf8)
-                applied_mapping = applied_mapping or changed
-
-                yield (
-                    frame_id,
-                    frame,
-                    method_name,
-                    abs_path_real_path_and_base[0],
-                    new_filename_in_utf8,
-                    lineno,
-                    applied_mapping,
-                    show_as_current_frame,
-                    line_col_info,
-                )
+                yield frames_list, frame, method_name, abs_path_real_path_and_base
 
             if not flatten_chained:
                 break
@@ -246,6 +233,31 @@ class NetCommandFactory(object):
                 break
             is_chained = True
 
+    def _get_visible_frame_info(self, py_db, frames_list, frame, method_name, abs_path_real_path_and_base):
+        frame_id = id(frame)
+        lineno = frames_list.frame_id_to_lineno.get(frame_id, frame.f_lineno)
+        line_col_info = frames_list.frame_id_to_line_col_info.get(frame_id)
+
+        filename_in_utf8, lineno, changed = py_db.source_mapping.map_to_client(abs_path_real_path_and_base[0], lineno)
+        new_filename_in_utf8, applied_mapping = pydevd_file_utils.map_file_to_client(filename_in_utf8)
+        applied_mapping = applied_mapping or changed
+
+        return (
+            frame_id,
+            frame,
+            method_name,
+            abs_path_real_path_and_base[0],
+            new_filename_in_utf8,
+            lineno,
+            applied_mapping,
+            frame is frames_list.current_frame,
+            line_col_info,
+        )
+
+    def _iter_visible_frames_info(self, py_db, frames_list, flatten_chained=False):
+        for frames_list, frame, method_name, abs_path_real_path_and_base in self._iter_visible_frames(py_db, frames_list, flatten_chained):
+            yield self._get_visible_frame_info(py_db, frames_list, frame, method_name, abs_path_real_path_and_base)
+
     def make_thread_stack_str(self, py_db, frames_list):
         assert frames_list.__class__ == FramesList
         make_valid_xml_value = pydevd_xml.make_valid_xml_value
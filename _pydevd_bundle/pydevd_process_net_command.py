@@ -335,6 +335,13 @@ class _PyDevCommandProcessor(object):
                         translated_filename,
                     )
 
+                elif error_code == self.api.ADD_BREAKPOINT_INVALID_EXPRESSION:
+                    msg = "pydev debugger: Error in breakpoint at: %s (%s).\n%s" % (
+                        translated_filename,
+                        translated_line,
+                        "".join(add_breakpoint_result.compile_errors),
+                    )
+
                 else:
                     # Shouldn't get here.
                     msg = "pydev debugger: Breakpoint not validated (reason unknown -- please report as error): %s (%s).\n" % (
@@ -275,6 +275,7 @@ class PyDevJsonCommandProcessor(object):
 
         body["pydevd"] = pydevd_info = {}
         pydevd_info["processId"] = os.getpid()
+        self.api.set_supports_variable_paging(py_db, request.arguments.supportsVariablePaging)
         self.api.notify_initialize(py_db)
         response = pydevd_base_schema.build_response(request, kwargs={"body": body})
         return NetCommand(CMD_RETURN, 0, response, is_json=True)
@@ -776,10 +777,18 @@ class PyDevJsonCommandProcessor(object):
             hit_condition = self._get_hit_condition_expression(bp.get("hitCondition"))
             condition = bp.get("condition")
 
-            function_breakpoints.append(FunctionBreakpoint(bp["name"], condition, expression, suspend_policy, hit_condition, is_logpoint))
+            function_breakpoint = FunctionBreakpoint(bp["name"], condition, expression, suspend_policy, hit_condition, is_logpoint)
+            function_breakpoints.append(function_breakpoint)
 
-            # Note: always succeeds.
-            breakpoints_set.append(pydevd_schema.Breakpoint(verified=True, id=self._next_breakpoint_id()).to_dict())
+            if function_breakpoint.compile_errors:
+                # Note: still added (the error is reported again when it's hit).
+                breakpoints_set.append(
+                    pydevd_schema.Breakpoint(
+                        verified=False, id=self._next_breakpoint_id(), message="".join(function_breakpoint.compile_errors)
+                    ).to_dict()
+                )
+            else:
+                breakpoints_set.append(pydevd_schema.Breakpoint(verified=True, id=self._next_breakpoint_id()).to_dict())
 
         self.api.set_function_breakpoints(py_db, function_breakpoints)
 
@@ -883,6 +892,9 @@ class PyDevJsonCommandProcessor(object):
             elif error_code == self.api.ADD_BREAKPOINT_INVALID_LINE:
                 error_msg = "Breakpoint added to invalid line."
 
+            elif error_code == self.api.ADD_BREAKPOINT_INVALID_EXPRESSION:
+                error_msg = "".join(result.compile_errors)
+
             else:
                 # Shouldn't get here.
                 error_msg = "Breakpoint not validated (reason unknown -- please report as bug)."
@@ -1128,6 +1140,20 @@ class PyDevJsonCommandProcessor(object):
             )
             return NetCommand(CMD_RETURN, 0, variables_response, is_json=True)
 
+    def on_pydevdgetarray_request(self, py_db, request):
+        """
+        :param PydevdGetArrayRequest request:
+        """
+        arguments = request.arguments  # : :type arguments: PydevdGetArrayArguments
+        thread_id = py_db.suspended_frames_manager.get_thread_id_for_variable_reference(arguments.variablesReference)
+        if thread_id is not None:
+            self.api.request_get_array_json(py_db, request, thread_id)
+        else:
+            response = pydevd_base_schema.build_response(
+                request, kwargs={"body": {}, "success": False, "message": "Unable to find thread to get the array."}
+            )
+            return NetCommand(CMD_RETURN, 0, response, is_json=True)
+
     def on_setvariable_request(self, py_db, request):
         arguments = request.arguments  # : :type arguments: SetVariableArguments
         variables_reference = arguments.variablesReference
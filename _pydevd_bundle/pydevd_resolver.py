@@ -5,6 +5,7 @@ import traceback
 from os.path import basename
 
 from functools import partial
+from itertools import islice
 from _pydevd_bundle.pydevd_constants import (
     IS_PY36_OR_GREATER,
     MethodWrapperType,
@@ -275,6 +276,25 @@ class DictResolver:
     def init_dict(self):
         return {}
 
+    def _get_key_entry(self, key, val, fmt, found_representations):
+        key_as_str = self.key_to_str(key, fmt)
+
+        if key_as_str not in found_representations:
+            found_representations.add(key_as_str)
+        else:
+            # If the key would be a duplicate, add the key id (otherwise
+            # VSCode won't show all keys correctly).
+            # See: https://github.com/microsoft/debugpy/issues/148
+            key_as_str = "%s (id: %s)" % (key_as_str, id(key))
+            found_representations.add(key_as_str)
+
+        if _does_obj_repr_evaluate_to_obj(key):
+            s = self.key_to_str(key)  # do not format the key
+            eval_key_str = "[%s]" % (s,)
+        else:
+            eval_key_str = None
+        return (key_as_str, val, eval_key_str)
+
     def get_contents_debug_adapter_protocol(self, dct, fmt=None):
         """
         This method is to be used in the case where the variables are all saved by its id (and as
@@ -293,23 +313,7 @@ class DictResolver:
 
         for key, val in dct.items():
             i += 1
-            key_as_str = self.key_to_str(key, fmt)
-
-            if key_as_str not in found_representations:
-                found_representations.add(key_as_str)
-            else:
-                # If the key would be a duplicate, add the key id (otherwise
-                # VSCode won't show all keys correctly).
-                # See: https://github.com/microsoft/debugpy/issues/148
-                key_as_str = "%s (id: %s)" % (key_as_str, id(key))
-                found_representations.add(key_as_str)
-
-            if _does_obj_repr_evaluate_to_obj(key):
-                s = self.key_to_str(key)  # do not format the key
-                eval_key_str = "[%s]" % (s,)
-            else:
-                eval_key_str = None
-            ret.append((key_as_str, val, eval_key_str))
+            ret.append(self._get_key_entry(key, val, fmt, found_representations))
             if i >= pydevd_constants.PYDEVD_CONTAINER_RANDOM_ACCESS_MAX_ITEMS:
                 ret.append((TOO_LARGE_ATTR, TOO_LARGE_MSG % (pydevd_constants.PYDEVD_CONTAINER_RANDOM_ACCESS_MAX_ITEMS,), None))
                 break
@@ -326,6 +330,58 @@ class DictResolver:
         ret.append((GENERATED_LEN_ATTR_NAME, len(dct), partial(_apply_evaluate_name, evaluate_name="len(%s)")))
         return ret
 
+    def get_indexed_variables_count(self, dct):
+        """
+        :return int|None:
+            The number of items to be fetched in pages with `get_contents_debug_adapter_protocol_indexed`
+            or None if the dict is small enough to be shown at once.
+        """
+        return _get_indexed_variables_count(dct)
+
+    def get_contents_debug_adapter_protocol_indexed(self, dct, start, count, fmt=None, cursor=None):
+        """
+        Provides a page of the items of the dict (in the iteration order of the dict).
+
+        Note: the key representations are only checked for duplicates inside the page.
+
+        :param DictItemsCursor cursor:
+            The cursor returned in the previous call for the same dict (or None).
+
+        :return tuple(list(tuple(name:str, value:object, evaluateName:str)), DictItemsCursor):
+            The entries in the page and the cursor to be used to get the next page.
+        """
+        if cursor is None:
+            cursor = DictItemsCursor(dct)
+
+        found_representations = set()
+        ret = [self._get_key_entry(key, val, fmt, found_representations) for key, val in cursor.get_items(start, count)]
+        return ret, cursor
+
+    def get_indexed_entry_named(self, dct, name, fmt=None):
+        """
+        :return tuple(name:str, value:object, evaluateName:str)|None:
+            The entry of the item whose name (as provided in `get_contents_debug_adapter_protocol_indexed`)
+            is the given name or None if there's no such item.
+        """
+        for key, val in dct.items():
+            key_as_str = self.key_to_str(key, fmt)
+            if key_as_str == name:
+                return self._get_key_entry(key, val, fmt, set())
+
+            if name.startswith(key_as_str) and name == "%s (id: %s)" % (key_as_str, id(key)):
+                # The name of a duplicated representation has the key id.
+                return self._get_key_entry(key, val, fmt, {key_as_str})
+        return None
+
+    def get_contents_debug_adapter_protocol_named(self, dct, fmt=None):
+        """
+        :return list(tuple(name:str, value:object, evaluateName:str)):
+            The entries which are not items of the dict (shown along with the pages of items).
+        """
+        ret = defaultResolver.get_contents_debug_adapter_protocol(dct, fmt)
+        ret.append((GENERATED_LEN_ATTR_NAME, len(dct), partial(_apply_evaluate_name, evaluate_name="len(%s)")))
+        return ret
+
     def get_dictionary(self, dct):
         ret = self.init_dict()
 
@@ -350,6 +406,60 @@ def _apply_evaluate_name(parent_name, evaluate_name):
     return evaluate_name % (parent_name,)
 
 
+def _get_indexed_variables_count(container):
+    container_len = len(container)
+    if container_len <= pydevd_constants.PYDEVD_CONTAINER_INITIAL_EXPANDED_ITEMS:
+        return None
+    return container_len
+
+
+class DictItemsCursor(object):
+    """
+    Iterates over the items of a dict in pages, resuming from the position where the previous
+    page ended (so that getting all the pages in order is O(n) and not O(n^2)).
+    """
+
+    def __init__(self, dct):
+        self._dct = dct
+        self._iter = None
+        self._position = 0
+
+    def get_items(self, start, count):
+        """
+        :param int start:
+            The index of the first item to get.
+
+        :param int count:
+            The number of items to get (if 0, all the items from start are gotten).
+
+        :return list(tuple(key, value))
+        """
+        for attempt in range(2):
+            if self._iter is None or start < self._position:
+                # The first page or going backwards: restart the iteration.
+                self._iter = iter(self._dct.items())
+                self._position = 0
+
+            try:
+                if start > self._position:
+                    for _item in islice(self._iter, start - self._position):
+                        pass
+                    self._position = start
+
+                if count > 0:
+                    items = list(islice(self._iter, count))
+                else:
+                    items = list(self._iter)
+            except RuntimeError:
+                # The dict changed during the iteration: restart it (once).
+                self._iter = None
+                if attempt == 1:
+                    raise
+            else:
+                self._position += len(items)
+                return items
+
+
 class MoreItemsRange:
     def __init__(self, value, from_i, to_i):
         self.value = value
@@ -452,6 +562,12 @@ class ForwardInternalResolverToObject:
         return var.resolve(attribute)
 
 
+def _get_index_format_str(lst_len, fmt):
+    if fmt is not None and fmt.get("hex", False):
+        return "0x%0" + str(int(len(hex(lst_len).lstrip("0x")))) + "x"
+    return "%0" + str(int(len(str(lst_len - 1)))) + "d"
+
+
 class TupleResolver:  # to enumerate tuples and lists
     def resolve(self, var, attribute):
         """
@@ -482,9 +598,7 @@ class TupleResolver:  # to enumerate tuples and lists
         lst_len = len(lst)
         ret = []
 
-        format_str = "%0" + str(int(len(str(lst_len - 1)))) + "d"
-        if fmt is not None and fmt.get("hex", False):
-            format_str = "0x%0" + str(int(len(hex(lst_len).lstrip("0x")))) + "x"
+        format_str = _get_index_format_str(lst_len, fmt)
 
         initial_expanded = pydevd_constants.PYDEVD_CONTAINER_INITIAL_EXPANDED_ITEMS
         for i, item in enumerate(lst):
@@ -509,6 +623,59 @@ class TupleResolver:  # to enumerate tuples and lists
         ret.append((GENERATED_LEN_ATTR_NAME, len(lst), partial(_apply_evaluate_name, evaluate_name="len(%s)")))
         return ret
 
+    def get_indexed_variables_count(self, lst):
+        """
+        :return int|None:
+            The number of items to be fetched in pages with `get_contents_debug_adapter_protocol_indexed`
+            or None if the sequence is small enough to be shown at once.
+        """
+        return _get_indexed_variables_count(lst)
+
+    def get_contents_debug_adapter_protocol_indexed(self, lst, start, count, fmt=None, cursor=None):
+        """
+        Provides a page of the items of the sequence (sliced directly from the sequence).
+
+        :return tuple(list(tuple(name:str, value:object, evaluateName:str)), None):
+            The entries in the page (no cursor is needed for sequences).
+        """
+        lst_len = len(lst)
+        format_str = _get_index_format_str(lst_len, fmt)
+        end = lst_len if count <= 0 else min(lst_len, start + count)
+        if type(lst) in (list, tuple):
+            items = lst[start:end]
+        else:
+            items = islice(lst, start, end)
+        return [(format_str % i, item, "[%s]" % i) for i, item in enumerate(items, start)], None
+
+    def get_indexed_entry_named(self, lst, name, fmt=None):
+        """
+        :return tuple(name:str, value:object, evaluateName:str)|None:
+            The entry of the item whose name (as provided in `get_contents_debug_adapter_protocol_indexed`)
+            is the given name or None if there's no such item.
+        """
+        try:
+            if fmt is not None and fmt.get("hex", False):
+                i = int(name, 16)
+            else:
+                i = int(name)
+        except ValueError:
+            return None
+
+        if 0 <= i < len(lst):
+            entries, _cursor = self.get_contents_debug_adapter_protocol_indexed(lst, i, 1, fmt=fmt)
+            if entries and entries[0][0] == name:
+                return entries[0]
+        return None
+
+    def get_contents_debug_adapter_protocol_named(self, lst, fmt=None):
+        """
+        :return list(tuple(name:str, value:object, evaluateName:str)):
+            The entries which are not items of the sequence (shown along with the pages of items).
+        """
+        ret = defaultResolver.get_contents_debug_adapter_protocol(lst, fmt=fmt)
+        ret.append((GENERATED_LEN_ATTR_NAME, len(lst), partial(_apply_evaluate_name, evaluate_name="len(%s)")))
+        return ret
+
     def get_dictionary(self, var, fmt={}):
         l = len(var)
         d = {}
@@ -4,6 +4,7 @@
 
 # Gotten from ptvsd for supporting the format expected there.
 import sys
+import time
 from _pydevd_bundle.pydevd_constants import IS_PY36_OR_GREATER
 import locale
 from _pydev_bundle import pydev_log
@@ -66,6 +67,11 @@ class SafeRepr(object):
     convert_to_hex = False
     raw_value = False
 
+    # If set (to a time.time() value), the items of collections are no longer added to the
+    # repr after the deadline is reached (note that the repr of a single object can't be
+    # interrupted, so, the deadline may still be exceeded).
+    deadline = None
+
     def __call__(self, obj):
         """
         :param object obj:
@@ -82,6 +88,25 @@ class SafeRepr(object):
             except Exception:
                 return "An exception was raised"
 
+    def iter_parts(self, obj):
+        """
+        Same as `__call__`, but provides the parts of the representation as they're computed
+        (so that a big representation may be sent without building it in memory).
+
+        Note: if an exception is raised, the message is provided after the parts already
+        provided (whereas in `__call__` it replaces the whole representation).
+
+        :return iterable(str):
+        """
+        try:
+            for part in self._repr(obj, 0):
+                yield part
+        except Exception:
+            try:
+                yield "An exception was raised: %r" % sys.exc_info()[1]
+            except Exception:
+                yield "An exception was raised"
+
     def _repr(self, obj, level):
         """Returns an iterable of the parts in the final repr string."""
 
@@ -181,6 +206,7 @@ class SafeRepr(object):
             yield "..."
         else:
             count = self.maxcollection[level]
+            deadline = self.deadline
             yield_comma = False
             for item in obj:
                 if yield_comma:
@@ -188,7 +214,7 @@ class SafeRepr(object):
                 yield_comma = True
 
                 count -= 1
-                if count <= 0:
+                if count <= 0 or (deadline is not None and time.time() > deadline):
                     yield "..."
                     break
 
@@ -234,13 +260,14 @@ class SafeRepr(object):
             except Exception:
                 sorted_keys = list(obj)
 
+        deadline = self.deadline
         for key in sorted_keys:
             if yield_comma:
                 yield ", "
             yield_comma = True
 
             count -= 1
-            if count <= 0:
+            if count <= 0 or (deadline is not None and time.time() > deadline):
                 yield "..."
                 break
 
@@ -311,7 +338,7 @@ class SafeRepr(object):
             yield part1
             yield "..."
             yield part2
-        except:
+        except Exception:  # Note: GeneratorExit must not be caught (the parts may be streamed).
             # This shouldn't really happen, but let's play it safe.
             pydev_log.exception("Error getting string representation to show.")
             for part in self._repr_obj(obj, level, self.maxother_inner, self.maxother_outer):
@@ -32,11 +32,63 @@ class SourceMappingEntry(object):
     __repr__ = __str__
 
 
+class _RuntimeSourceIndex(object):
+    """
+    The entries mapped to a runtime source (i.e.: <ipython-cell-xxx>) sorted by the runtime
+    line, so that the entry containing a runtime line is found with bisect.
+    """
+
+    __slots__ = ["runtime_lines", "entries", "max_runtime_end_lines"]
+
+    def __init__(self, entries):
+        """
+        :param list(SourceMappingEntry) entries:
+            The entries for the runtime source (in the same order as they'd be checked
+            when mapping to the client -- if more than one contains a line, the first wins).
+        """
+        # (runtime line, order, entry, runtime end line)
+        items = []
+        for order, entry in enumerate(entries):
+            line_count = entry.end_line + entry.line  # Note: the same computation from contains_runtime_line.
+            items.append((entry.runtime_line, order, entry, entry.runtime_line + line_count))
+        items.sort(key=lambda item: item[:2])
+
+        self.runtime_lines = [item[0] for item in items]
+        self.entries = [(item[1], item[2]) for item in items]
+
+        # The max runtime end line up to each index (to stop searching for entries
+        # containing a line as soon as no previous entry can contain it).
+        self.max_runtime_end_lines = []
+        max_runtime_end_line = None
+        for item in items:
+            if max_runtime_end_line is None or item[3] > max_runtime_end_line:
+                max_runtime_end_line = item[3]
+            self.max_runtime_end_lines.append(max_runtime_end_line)
+
+    def find_entry(self, runtime_line):
+        """
+        :return SourceMappingEntry|None: the entry which contains the given runtime line.
+        """
+        found_order = None
+        found = None
+        i = bisect.bisect_right(self.runtime_lines, runtime_line)
+        while i > 0:
+            i -= 1
+            if self.max_runtime_end_lines[i] < runtime_line:
+                break
+            order, entry = self.entries[i]
+            if (found_order is None or order < found_order) and entry.contains_runtime_line(runtime_line):
+                found_order = order
+                found = entry
+        return found
+
+
 class SourceMapping(object):
     def __init__(self, on_source_mapping_changed=NULL):
         self._mappings_to_server = {}  # dict(normalized(file.py) to [SourceMappingEntry])
         self._mappings_to_client = {}  # dict(<cell> to File.py)
-        self._cache = {}
+        self._runtime_source_to_index = {}  # dict(<cell> to _RuntimeSourceIndex)
+        self._cache = {}  # dict(<cell> to dict(lineno to map_to_client result))
         self._on_source_mapping_changed = on_source_mapping_changed
 
     def set_source_mapping(self, absolute_filename, mapping):
@@ -67,35 +119,55 @@ class SourceMapping(object):
                     map_entry.runtime_source,
                 )
 
+        # Only the runtime sources from the previous and from the new mapping of this file are affected.
+        affected_runtime_sources = set(map_entry.runtime_source for map_entry in mapping)
         try:
             absolute_normalized_filename = pydevd_file_utils.normcase(absolute_filename)
             current_mapping = self._mappings_to_server.get(absolute_normalized_filename, [])
             for map_entry in current_mapping:
-                del self._mappings_to_client[map_entry.runtime_source]
+                affected_runtime_sources.add(map_entry.runtime_source)
+                self._mappings_to_client.pop(map_entry.runtime_source, None)
 
-            self._mappings_to_server[absolute_normalized_filename] = sorted(mapping, key=lambda entry: entry.line)
+            self._mappings_to_server[absolute_normalized_filename] = sorted_mapping = sorted(mapping, key=lambda entry: entry.line)
 
             for map_entry in mapping:
                 self._mappings_to_client[map_entry.runtime_source] = absolute_filename
+
+            runtime_source_to_entries = {}
+            for map_entry in sorted_mapping:
+                runtime_source_to_entries.setdefault(map_entry.runtime_source, []).append(map_entry)
+
+            for runtime_source in affected_runtime_sources:
+                entries = runtime_source_to_entries.get(runtime_source)
+                if entries:
+                    self._runtime_source_to_index[runtime_source] = _RuntimeSourceIndex(entries)
+                else:
+                    self._runtime_source_to_index.pop(runtime_source, None)
         finally:
-            self._cache.clear()
+            for runtime_source in affected_runtime_sources:
+                self._cache.pop(runtime_source, None)
             self._on_source_mapping_changed()
         return ""
 
     def map_to_client(self, runtime_source_filename, lineno):
-        key = (lineno, "client", runtime_source_filename)
         try:
-            return self._cache[key]
+            return self._cache[runtime_source_filename][lineno]
         except KeyError:
-            for _, mapping in list(self._mappings_to_server.items()):
-                for map_entry in mapping:
-                    if map_entry.runtime_source == runtime_source_filename:  # <cell1>
-                        if map_entry.contains_runtime_line(lineno):  # matches line range
-                            self._cache[key] = (map_entry.source_filename, map_entry.line + (lineno - map_entry.runtime_line), True)
-                            return self._cache[key]
+            index = self._runtime_source_to_index.get(runtime_source_filename)
+            map_entry = None
+            if index is not None:
+                map_entry = index.find_entry(lineno)  # <cell1> matches line range
 
-            self._cache[key] = (runtime_source_filename, lineno, False)  # Mark that no translation happened in the cache.
-            return self._cache[key]
+            if map_entry is not None:
+                ret = (map_entry.source_filename, map_entry.line + (lineno - map_entry.runtime_line), True)
+            else:
+                ret = (runtime_source_filename, lineno, False)  # Mark that no translation happened in the cache.
+
+            cache = self._cache.get(runtime_source_filename)
+            if cache is None:
+                cache = self._cache[runtime_source_filename] = {}
+            cache[lineno] = ret
+            return ret
 
     def has_mapping_entry(self, runtime_source_filename):
         """
@@ -104,18 +176,7 @@ class SourceMapping(object):
         """
         # Note that we're not interested in the line here, just on knowing if a given filename
         # (from the server) has a mapping for it.
-        key = ("has_entry", runtime_source_filename)
-        try:
-            return self._cache[key]
-        except KeyError:
-            for _absolute_normalized_filename, mapping in list(self._mappings_to_server.items()):
-                for map_entry in mapping:
-                    if map_entry.runtime_source == runtime_source_filename:
-                        self._cache[key] = True
-                        return self._cache[key]
-
-            self._cache[key] = False
-            return self._cache[key]
+        return runtime_source_filename in self._runtime_source_to_index
 
     def map_to_server(self, absolute_filename, lineno):
         """
@@ -0,0 +1,154 @@
+"""
+Measures the time spent in each phase of the debugger startup (imports, loading of the
+cython accelerators, PyDB.__init__, connection, thread patching, waiting for the
+configuration done, etc.).
+
+It's enabled with the PYDEVD_STARTUP_PROFILE=<file> environment variable. The report
+is appended to that file as a single json line per process (so, subprocesses which
+inherit the environment variable append their own report to the same file).
+
+Usage:
+
+    with pydevd_startup_profile.phase("connect"):
+        ...
+
+    # or, when a `with` statement is not convenient:
+    import_phase = pydevd_startup_profile.phase("import pydevd")
+    ...
+    import_phase.end()
+
+Note: this module is imported before anything else in pydevd (so, it must only import
+builtin modules at the module level).
+"""
+
+import os
+import sys
+import time
+
+_profile_file = os.environ.get("PYDEVD_STARTUP_PROFILE", "")
+_initial_time = time.perf_counter()
+_initial_modules_count = len(sys.modules)
+_phases = []
+_report_written = False
+
+
+class _Phase(object):
+    __slots__ = ["name", "start", "end_time", "error"]
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.end_time = None
+        self.error = None
+
+    def end(self):
+        if self.end_time is None:
+            self.end_time = time.perf_counter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is not None:
+            self.error = exc_type.__name__
+        self.end()
+
+    def to_dict(self):
+        dct = {
+            "name": self.name,
+            "start": self.start - _initial_time,
+            "duration": None if self.end_time is None else self.end_time - self.start,
+        }
+        if self.error is not None:
+            dct["error"] = self.error
+        return dct
+
+
+class _NullPhase(object):
+    __slots__ = []
+
+    def end(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+
+
+def is_enabled():
+    return bool(_profile_file)
+
+
+def phase(name):
+    """
+    :return: an object which measures the phase from now until its `end()` is called
+        (it may also be used as a context manager).
+    """
+    if not _profile_file:
+        return _NULL_PHASE
+    p = _Phase(name)
+    _phases.append(p)
+    return p
+
+
+def get_report():
+    """
+    :return dict: the report with the phases measured so far (times are in seconds
+        and the `start` of each phase is relative to the time pydevd started to be imported).
+    """
+    return {
+        "pid": os.getpid(),
+        "ppid": os.getppid() if hasattr(os, "getppid") else None,
+        "argv": sys.argv,
+        "python": "%s.%s.%s" % sys.version_info[:3],
+        "total": time.perf_counter() - _initial_time,
+        "modules_imported": len(sys.modules) - _initial_modules_count,
+        "phases": [p.to_dict() for p in _phases],
+    }
+
+
+def write_report():
+    """
+    Writes the report (only the first call writes it -- it should be called when the
+    debugger startup finished).
+    """
+    global _report_written
+    if not _profile_file or _report_written:
+        return
+    _report_written = True
+
+    try:
+        import json
+
+        contents = json.dumps(get_report(), default=str)
+        with open(_profile_file, "a", encoding="utf-8") as stream:
+            stream.write(contents + "\n")
+    except Exception:
+        from _pydev_bundle import pydev_log
+
+        pydev_log.exception("Error writing startup profile to: %s", _profile_file)
+
+
+def after_fork():
+    """
+    Must be called in the new process after a fork (the startup of the debugger in the forked
+    process is measured from the fork and reported separately).
+    """
+    global _report_written, _initial_time, _initial_modules_count
+    _report_written = False
+    _initial_time = time.perf_counter()
+    _initial_modules_count = len(sys.modules)
+    del _phases[:]
+
+
+if _profile_file:
+    import atexit
+
+    # If the startup didn't finish in a place which writes the report (i.e.: only
+    # pydevd.enable_attach() was used), write whatever was collected at exit.
+    atexit.register(write_report)
@@ -1,7 +1,16 @@
 from contextlib import contextmanager
 import sys
-
-from _pydevd_bundle.pydevd_constants import get_frame, RETURN_VALUES_DICT, ForkSafeLock, GENERATED_LEN_ATTR_NAME, silence_warnings_decorator
+import time
+
+from _pydevd_bundle.pydevd_constants import (
+    get_frame,
+    RETURN_VALUES_DICT,
+    ForkSafeLock,
+    GENERATED_LEN_ATTR_NAME,
+    silence_warnings_decorator,
+    PYDEVD_VARIABLES_TIME_BUDGET,
+    PYDEVD_VARIABLES_PRESENTATION_CACHE_MAX_ENTRIES,
+)
 from _pydevd_bundle.pydevd_xml import get_variable_details, get_type
 from _pydev_bundle.pydev_override import overrides
 from _pydevd_bundle.pydevd_resolver import sorted_attributes_key, TOO_LARGE_ATTR, get_var_scope
@@ -10,7 +19,8 @@ from _pydev_bundle import pydev_log
 from _pydevd_bundle import pydevd_vars
 from _pydev_bundle.pydev_imports import Exec
 from _pydevd_bundle.pydevd_frame_utils import FramesList
-from _pydevd_bundle.pydevd_utils import ScopeRequest, DAPGrouper, Timer
+from _pydevd_bundle.pydevd_utils import ScopeRequest, DAPGrouper, Timer, slow_repr_types
+from _pydevd_bundle.pydevd_bounded_cache import BoundedCache
 from typing import Optional
 
 
@@ -21,6 +31,9 @@ class _AbstractVariable(object):
     value = None
     evaluate_name = None
 
+    # Whether this is a placeholder for a variable whose value wasn't computed.
+    lazy = False
+
     def __init__(self, py_db):
         assert py_db is not None
         self.py_db = py_db
@@ -34,7 +47,7 @@ class _AbstractVariable(object):
     def get_variable_reference(self):
         return id(self.value)
 
-    def get_var_data(self, fmt: Optional[dict] = None, context: Optional[str] = None, **safe_repr_custom_attrs):
+    def get_var_data(self, fmt: Optional[dict] = None, context: Optional[str] = None, stream_value=False, **safe_repr_custom_attrs):
         """
         :param dict fmt:
             Format expected by the DAP (keys: 'hex': bool, 'rawString': bool)
@@ -45,6 +58,11 @@ class _AbstractVariable(object):
                 "repl",
                 "hover",
                 "clipboard"
+
+        :param bool stream_value:
+            If True the `value` may be provided as an iterable(str) with the parts of the
+            value, which are only computed as it's iterated (so that a big value can be sent
+            in chunks without building it in memory).
         """
         timer = Timer()
         safe_repr = SafeRepr()
@@ -54,9 +72,11 @@ class _AbstractVariable(object):
         for key, val in safe_repr_custom_attrs.items():
             setattr(safe_repr, key, val)
 
+        initial_time = time.time()
         type_name, _type_qualifier, _is_exception_on_eval, resolver, value = get_variable_details(
-            self.value, to_string=safe_repr, context=context
+            self.value, to_string=safe_repr.iter_parts if stream_value else safe_repr, context=context
         )
+        slow_repr_types.on_repr_computed(self.value, time.time() - initial_time)
 
         is_raw_string = type_name in ("str", "bytes", "bytearray")
 
@@ -91,6 +111,8 @@ class _AbstractVariable(object):
 
         if resolver is not None:  # I.e.: it's a container
             var_data["variablesReference"] = self.get_variable_reference()
+            if self.py_db.supports_variable_paging:
+                self._add_paging_info(var_data, resolver, fmt)
         else:
             var_data["variablesReference"] = 0  # It's mandatory (although if == 0 it doesn't have children).
 
@@ -100,9 +122,47 @@ class _AbstractVariable(object):
         timer.report_if_compute_repr_attr_slow("", name, type_name)
         return var_data
 
+    def _add_paging_info(self, var_data, resolver, fmt):
+        get_indexed_variables_count = getattr(resolver, "get_indexed_variables_count", None)
+        if get_indexed_variables_count is None:
+            return
+        try:
+            indexed_variables = get_indexed_variables_count(self.value)
+            if indexed_variables is not None:
+                var_data["indexedVariables"] = indexed_variables
+                var_data["namedVariables"] = len(self._get_named_contents(resolver, fmt))
+        except:
+            pydev_log.exception("Error getting paging info for: %s", self.name)
+            var_data.pop("indexedVariables", None)
+
+    def _get_named_contents(self, resolver, fmt):
+        lst = resolver.get_contents_debug_adapter_protocol_named(self.value, fmt=fmt)
+        lst, group_entries = self._group_entries(lst, handle_return_values=False)
+        if group_entries:
+            lst = group_entries + lst
+        return lst
+
     def get_children_variables(self, fmt=None, scope=None):
         raise NotImplementedError()
 
+    def get_children_variables_page(self, fmt=None, scope=None, filter_type=None, start=0, count=0):
+        """
+        Provides the children variables honoring the paging arguments of the DAP `variables` request.
+
+        :param str filter_type:
+            'indexed' or 'named' to get only the indexed or named children (the indexed children
+            are only available for the variables which report `indexedVariables`).
+
+        :param int start:
+            The index of the first child to return.
+
+        :param int count:
+            The number of children to return (0 means all).
+        """
+        if filter_type == "indexed":
+            return []
+        return _get_page(self.get_children_variables(fmt=fmt, scope=scope), start, count)
+
     def get_child_variable_named(self, name, fmt=None, scope=None):
         for child_var in self.get_children_variables(fmt=fmt, scope=scope):
             if child_var.get_name() == name:
@@ -151,6 +211,148 @@ class _AbstractVariable(object):
         return new_lst, group_entries
 
 
+class _LazyValueVariable(_AbstractVariable):
+    """
+    Placeholder for a variable whose value wasn't computed (the client can get the actual
+    variable as its only child).
+    """
+
+    lazy = True
+
+    def __init__(self, py_db, variable, register_variable):
+        _AbstractVariable.__init__(self, py_db)
+        self.variable = variable
+        self.name = variable.name
+        self.value = variable.value
+        self.evaluate_name = variable.evaluate_name
+        register_variable(self)
+
+    @overrides(_AbstractVariable.get_variable_reference)
+    def get_variable_reference(self):
+        return id(self)
+
+    @overrides(_AbstractVariable.get_var_data)
+    def get_var_data(self, fmt: Optional[dict] = None, context: Optional[str] = None, **safe_repr_custom_attrs):
+        try:
+            type_name = self.value.__class__.__name__
+        except:
+            type_name = ""
+
+        name = self.name
+        if self.variable._is_return_value:
+            name = "(return) %s" % (name,)
+
+        var_data = {
+            "name": name,
+            "value": "...",
+            "type": type_name,
+            "variablesReference": self.get_variable_reference(),
+            "presentationHint": {"lazy": True},
+        }
+        if self.evaluate_name is not None:
+            var_data["evaluateName"] = self.evaluate_name
+        return var_data
+
+    @overrides(_AbstractVariable.get_children_variables)
+    def get_children_variables(self, fmt=None, scope=None):
+        return [self.variable]
+
+
+# The types whose presentation may be cached (if the value is the same object, the presentation
+# is the same).
+_PRESENTATION_CACHE_TYPES = frozenset((int, float, complex, str, bytes, bool, type(None)))
+
+
+class VariablesPresentationCache(object):
+    """
+    Cache of the var data of the variables with immutable values, kept across suspensions (so
+    that when stepping only the values which changed are recomputed).
+
+    The key is (id(frame), name, evaluate name, format) and the entry keeps a reference to the
+    value, which must be the same object for the entry to be used (as the reference is kept,
+    the id of a value in the cache can't be reused by another object).
+    """
+
+    def __init__(self, max_entries):
+        self._cache = BoundedCache("variables_presentation", max_entries)
+        self.hits = 0
+        self.misses = 0
+
+    def get_var_data(self, variable, fmt=None, **kwargs):
+        value = variable.value
+        frame = getattr(variable, "frame", None)
+        if frame is None or type(value) not in _PRESENTATION_CACHE_TYPES:
+            return variable.get_var_data(fmt=fmt, **kwargs)
+
+        if fmt:
+            key = (id(frame), variable.name, variable.evaluate_name, fmt.get("hex", False), fmt.get("rawString", False))
+        else:
+            key = (id(frame), variable.name, variable.evaluate_name, False, False)
+
+        entry = self._cache.entries.get(key)
+        if entry is not None and entry[0] is value:
+            self.hits += 1
+            return entry[1].copy()
+
+        self.misses += 1
+        var_data = variable.get_var_data(fmt=fmt, **kwargs)
+        self._cache.set(key, (value, var_data.copy()))
+        return var_data
+
+    def get_stats(self):
+        requests = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": float(self.hits) / requests if requests else 0.0,
+            "entries": len(self._cache.entries),
+        }
+
+    def clear(self):
+        self._cache.clear()
+
+
+def _get_var_data(variable, **kwargs):
+    return variable.get_var_data(**kwargs)
+
+
+def get_variables_var_data(variables, fmt=None, time_budget=PYDEVD_VARIABLES_TIME_BUDGET, presentation_cache=None):
+    """
+    :param list(_AbstractVariable) variables:
+        The variables for which the var data is needed.
+
+    :param float time_budget:
+        The time to compute the values. After it elapses, the remaining variables are provided
+        as lazy variables (the variables whose repr is known to be slow are always provided as
+        lazy variables). If 0 all the values are computed.
+
+    :param VariablesPresentationCache presentation_cache:
+        If given, the var data of immutable values is reused from (and saved in) the cache.
+
+    :return list(dict)
+    """
+    if presentation_cache is not None:
+        get_var_data = presentation_cache.get_var_data
+    else:
+        get_var_data = _get_var_data
+
+    if time_budget <= 0:
+        return [get_var_data(variable, fmt=fmt) for variable in variables]
+
+    deadline = time.time() + time_budget
+    is_deferred = slow_repr_types.is_deferred
+    ret = []
+    budget_elapsed = False
+    for variable in variables:
+        if budget_elapsed or is_deferred(variable.value):
+            variable = _LazyValueVariable(variable.py_db, variable, variable._register_variable)
+            ret.append(variable.get_var_data(fmt=fmt))
+        else:
+            ret.append(get_var_data(variable, fmt=fmt, deadline=deadline))
+            budget_elapsed = time.time() > deadline
+    return ret
+
+
 class _ObjectVariable(_AbstractVariable):
     def __init__(self, py_db, name, value, register_variable, is_return_value=False, evaluate_name=None, frame=None):
         _AbstractVariable.__init__(self, py_db)
@@ -162,6 +364,10 @@ class _ObjectVariable(_AbstractVariable):
         self._is_return_value = is_return_value
         self.evaluate_name = evaluate_name
 
+        # The cursor to resume getting the indexed children in pages (kept while the variable
+        # is tracked, i.e.: until the thread is resumed).
+        self._indexed_cursor = None
+
     @silence_warnings_decorator
     @overrides(_AbstractVariable.get_children_variables)
     def get_children_variables(self, fmt=None, scope=None):
@@ -182,22 +388,58 @@ class _ObjectVariable(_AbstractVariable):
             lst, group_entries = self._group_entries(lst, handle_return_values=False)
             if group_entries:
                 lst = group_entries + lst
-            parent_evaluate_name = self.evaluate_name
-            if parent_evaluate_name:
-                for key, val, evaluate_name in lst:
-                    if evaluate_name is not None:
-                        if callable(evaluate_name):
-                            evaluate_name = evaluate_name(parent_evaluate_name)
-                        else:
-                            evaluate_name = parent_evaluate_name + evaluate_name
-                    variable = _ObjectVariable(self.py_db, key, val, self._register_variable, evaluate_name=evaluate_name, frame=self.frame)
-                    children_variables.append(variable)
-            else:
-                for key, val, evaluate_name in lst:
-                    # No evaluate name
-                    variable = _ObjectVariable(self.py_db, key, val, self._register_variable, frame=self.frame)
-                    children_variables.append(variable)
+            children_variables = self._create_children_variables(lst)
+
+        return children_variables
+
+    @silence_warnings_decorator
+    @overrides(_AbstractVariable.get_children_variables_page)
+    def get_children_variables_page(self, fmt=None, scope=None, filter_type=None, start=0, count=0):
+        if filter_type is not None:
+            _type, _type_name, resolver = get_type(self.value)
+            get_indexed_variables_count = getattr(resolver, "get_indexed_variables_count", None)
+            if get_indexed_variables_count is not None and get_indexed_variables_count(self.value) is not None:
+                if filter_type == "indexed":
+                    lst, self._indexed_cursor = resolver.get_contents_debug_adapter_protocol_indexed(
+                        self.value, start, count, fmt=fmt, cursor=self._indexed_cursor
+                    )
+                else:
+                    lst = _get_page(self._get_named_contents(resolver, fmt), start, count)
+                return self._create_children_variables(lst)
 
+        return _AbstractVariable.get_children_variables_page(self, fmt=fmt, scope=scope, filter_type=filter_type, start=start, count=count)
+
+    @overrides(_AbstractVariable.get_child_variable_named)
+    def get_child_variable_named(self, name, fmt=None, scope=None):
+        child_var = _AbstractVariable.get_child_variable_named(self, name, fmt=fmt, scope=scope)
+        if child_var is None:
+            # When paged, the items may be only available as indexed children (in which case just
+            # the requested one is created).
+            _type, _type_name, resolver = get_type(self.value)
+            get_indexed_variables_count = getattr(resolver, "get_indexed_variables_count", None)
+            if get_indexed_variables_count is not None and get_indexed_variables_count(self.value) is not None:
+                entry = resolver.get_indexed_entry_named(self.value, name, fmt=fmt)
+                if entry is not None:
+                    return self._create_children_variables([entry])[0]
+        return child_var
+
+    def _create_children_variables(self, lst):
+        children_variables = []
+        parent_evaluate_name = self.evaluate_name
+        if parent_evaluate_name:
+            for key, val, evaluate_name in lst:
+                if evaluate_name is not None:
+                    if callable(evaluate_name):
+                        evaluate_name = evaluate_name(parent_evaluate_name)
+                    else:
+                        evaluate_name = parent_evaluate_name + evaluate_name
+                variable = _ObjectVariable(self.py_db, key, val, self._register_variable, evaluate_name=evaluate_name, frame=self.frame)
+                children_variables.append(variable)
+        else:
+            for key, val, evaluate_name in lst:
+                # No evaluate name
+                variable = _ObjectVariable(self.py_db, key, val, self._register_variable, frame=self.frame)
+                children_variables.append(variable)
         return children_variables
 
     def change_variable(self, name, value, py_db, fmt=None, scope: Optional[ScopeRequest]=None):
@@ -240,6 +482,14 @@ class _ObjectVariable(_AbstractVariable):
         return self.get_child_variable_named(name, fmt=fmt)
 
 
+def _get_page(lst, start, count):
+    if count > 0:
+        return lst[start : start + count]
+    if start > 0:
+        return lst[start:]
+    return lst
+
+
 def sorted_variables_key(obj):
     return sorted_attributes_key(obj.name)
 
@@ -360,6 +610,9 @@ class _FramesTracker(object):
         if variable is not None:
             return variable
 
+        if variable_reference in self._frame_id_to_frame:
+            return self.get_variable(variable_reference)
+
         # Still not created, let's do it now.
         return _ObjectVariable(
             self.py_db, name, value, self._register_variable, is_return_value=False, evaluate_name=evaluate_name, frame=frame
@@ -369,7 +622,19 @@ class _FramesTracker(object):
         return self._main_thread_id
 
     def get_variable(self, variable_reference):
-        return self._variable_reference_to_variable[variable_reference]
+        try:
+            return self._variable_reference_to_variable[variable_reference]
+        except KeyError:
+            # The variable for a tracked frame is only created when it's first requested.
+            with self._lock:
+                frame = self._frame_id_to_frame.get(variable_reference)
+                if frame is None:
+                    raise
+
+                variable = self._variable_reference_to_variable.get(variable_reference)
+                if variable is None:
+                    variable = _FrameVariable(self.py_db, frame, self._register_variable)  # Instancing is enough to register.
+                return variable
 
     def track(self, thread_id, frames_list, frame_custom_thread_id=None):
         """
@@ -397,8 +662,9 @@ class _FramesTracker(object):
             self._thread_id_to_frames_list[coroutine_or_main_thread_id] = frames_list
             for frame in frames_list:
                 frame_id = id(frame)
+                # Note: the _FrameVariable is created lazily in `get_variable` (stacks may be big
+                # and usually only the variables of a few frames are requested).
                 self._frame_id_to_frame[frame_id] = frame
-                _FrameVariable(self.py_db, frame, self._register_variable)  # Instancing is enough to register.
                 self._suspended_frames_manager._variable_reference_to_frames_tracker[frame_id] = self
                 frame_ids_from_thread.append(frame_id)
 
@@ -455,6 +721,11 @@ class SuspendedFramesManager(object):
         # Mappings
         self._variable_reference_to_frames_tracker = {}
 
+        # Kept across suspensions (None if disabled).
+        self.variables_presentation_cache = None
+        if PYDEVD_VARIABLES_PRESENTATION_CACHE_MAX_ENTRIES > 0:
+            self.variables_presentation_cache = VariablesPresentationCache(PYDEVD_VARIABLES_PRESENTATION_CACHE_MAX_ENTRIES)
+
     def _get_tracker_for_variable_reference(self, variable_reference):
         tracker = self._variable_reference_to_frames_tracker.get(variable_reference)
         if tracker is not None:
@@ -1,20 +1,96 @@
 from _pydevd_bundle import pydevd_utils
 from _pydevd_bundle.pydevd_additional_thread_info import set_additional_thread_info
 from _pydevd_bundle.pydevd_comm_constants import CMD_STEP_INTO, CMD_THREAD_SUSPEND
-from _pydevd_bundle.pydevd_constants import PYTHON_SUSPEND, STATE_SUSPEND, get_thread_id, STATE_RUN, PYDEVD_USE_SYS_MONITORING
+from _pydevd_bundle.pydevd_constants import (
+    PYTHON_SUSPEND,
+    STATE_SUSPEND,
+    get_thread_id,
+    STATE_RUN,
+    PYDEVD_USE_SYS_MONITORING,
+    get_global_debugger,
+    _current_frames,
+)
 from _pydev_bundle._pydev_saved_modules import threading
 from _pydev_bundle import pydev_log
+from _pydev_bundle.pydev_is_thread_alive import is_thread_alive
 import sys
+import weakref
 from _pydevd_sys_monitoring import pydevd_sys_monitoring
 
 
+class ThreadsIndex(object):
+    """
+    Index of the thread id -> thread (weakly referenced), so that finding a thread by its id
+    (which is done for each request with a thread id) doesn't need to enumerate all the threads.
+
+    Threads are added when their creation is notified (which is done when a thread starts, from
+    the patched thread startup in pydev_monkey, and when the threads alive are reconciled in
+    `PyDB.process_internal_commands`) and removed when they're notified as no longer alive.
+
+    A thread id which isn't in the index is searched in all the threads (see: `reconcile`).
+    """
+
+    def __init__(self):
+        # Note: no lock is used as only atomic dict operations are done.
+        self._thread_id_to_ref = {}
+
+    def add(self, thread_id, thread):
+        self._thread_id_to_ref[thread_id] = weakref.ref(thread)
+
+    def remove(self, thread_id):
+        self._thread_id_to_ref.pop(thread_id, None)
+
+    def clear(self):
+        self._thread_id_to_ref.clear()
+
+    def _get(self, thread_id):
+        ref = self._thread_id_to_ref.get(thread_id)
+        if ref is not None:
+            thread = ref()
+            # The thread id may have been reset (i.e.: after a fork) or the thread may be dead.
+            if thread is not None and getattr(thread, "__pydevd_id__", None) == thread_id and is_thread_alive(thread):
+                return thread
+            self._thread_id_to_ref.pop(thread_id, None)
+        return None
+
+    def find_thread(self, thread_id):
+        """
+        :return threading.Thread|None:
+            The thread with the given id (which may also be in the format: <prefix>|<thread id>).
+        """
+        thread = self._get(thread_id)
+        if thread is None and "|" in thread_id:
+            thread = self._get(thread_id.rpartition("|")[2])
+        return thread
+
+    def reconcile(self):
+        """
+        Adds all the threads (from `threading.enumerate()`) to the index.
+
+        :return list(threading.Thread):
+            All the threads.
+        """
+        threads = threading.enumerate()
+        thread_id_to_ref = self._thread_id_to_ref
+        for t in threads:
+            thread_id_to_ref[get_thread_id(t)] = weakref.ref(t)
+        return threads
+
+
+threads_index = ThreadsIndex()
+
+
 def pydevd_find_thread_by_id(thread_id):
     try:
-        threads = threading.enumerate()
-        for i in threads:
-            tid = get_thread_id(i)
-            if thread_id == tid or thread_id.endswith("|" + tid):
-                return i
+        thread = threads_index.find_thread(thread_id)
+        if thread is not None:
+            return thread
+
+        # i.e.: its creation wasn't notified yet (search all the threads).
+        threads = threads_index.reconcile()
+        thread = threads_index.find_thread(thread_id)
+        if thread is not None:
+            return thread
 
         # This can happen when a request comes for a thread which was previously removed.
         pydev_log.info("Could not find thread %s.", thread_id)
@@ -25,7 +101,15 @@ def pydevd_find_thread_by_id(thread_id):
     return None
 
 
-def mark_thread_suspended(thread, stop_reason: int, original_step_cmd: int = -1, main_suspend: bool = True):
+def mark_thread_suspended(
+    thread, stop_reason: int, original_step_cmd: int = -1, main_suspend: bool = True, update_stepping_info: bool = True
+):
+    """
+    :param update_stepping_info:
+        If False, the caller must call `update_stepping_info()` afterwards (which updates
+        the stepping info of all the threads, so, it can be called once when many threads
+        are marked as suspended).
+    """
     pydev_log.info("Marking thread suspended. Name: %s, stop_reason: %s, main_suspend: %s", thread.name, stop_reason, main_suspend)
     info = set_additional_thread_info(thread)
     info.suspend_type = PYTHON_SUSPEND
@@ -46,17 +130,34 @@ def mark_thread_suspended(thread, stop_reason: int, original_step_cmd: int = -1,
 
     # Mark as suspended as the last thing.
     info.pydev_state = STATE_SUSPEND
-    info.update_stepping_info()
+    if update_stepping_info:
+        info.update_stepping_info()
     return info
 
 
-def internal_run_thread(thread, set_additional_thread_info):
+def internal_run_thread(thread, set_additional_thread_info, update_stepping_info: bool = True):
+    """
+    :param update_stepping_info:
+        If False, the caller must call `update_stepping_info()` and then `notify_thread_resumed()`
+        afterwards (so that it can be done once when many threads are resumed).
+    """
     info = set_additional_thread_info(thread)
     info.pydev_original_step_cmd = -1
     info.pydev_step_cmd = -1
     info.pydev_step_stop = None
     info.pydev_state = STATE_RUN
-    info.update_stepping_info()
+    if update_stepping_info:
+        info.update_stepping_info()
+        notify_thread_resumed(thread, info)
+    return info
+
+
+def notify_thread_resumed(thread, info):
+    if info.is_in_wait_loop:
+        # The thread is blocked in the suspend loop: wake it up.
+        py_db = get_global_debugger()
+        if py_db is not None:
+            py_db.notify_thread_state_changed(get_thread_id(thread))
 
 
 def resume_threads(thread_id, except_thread=None):
@@ -71,12 +172,19 @@ def resume_threads(thread_id, except_thread=None):
     else:
         threads = [pydevd_find_thread_by_id(thread_id)]
 
+    resumed = []
     for t in threads:
         if t is None or t is except_thread:
             pydev_log.info("Skipped resuming thread: %s", t)
             continue
 
-        internal_run_thread(t, set_additional_thread_info=set_additional_thread_info)
+        resumed.append((t, internal_run_thread(t, set_additional_thread_info=set_additional_thread_info, update_stepping_info=False)))
+
+    if resumed:
+        # Updates the stepping info of all the threads at once and only then wakes up the threads.
+        resumed[-1][1].update_stepping_info()
+        for t, info in resumed:
+            notify_thread_resumed(t, info)
 
 
 from _pydevd_bundle.pydevd_constants import ForkSafeLock
@@ -94,21 +202,34 @@ def suspend_all_threads(py_db, except_thread):
 
     pydev_log.info("Suspending all threads except: %s", except_thread)
     all_threads = pydevd_utils.get_non_pydevd_threads()
-    for t in all_threads:
-        if getattr(t, "pydev_do_not_trace", None):
-            pass  # skip some other threads, i.e. ipython history saving thread from debug console
-        else:
-            if t is except_thread:
-                continue
-            info = mark_thread_suspended(t, CMD_THREAD_SUSPEND, main_suspend=False)
-            frame = info.get_topmost_frame(t)
-
-            # Reset the tracing as in this case as it could've set scopes to be untraced.
-            if frame is not None:
-                try:
-                    py_db.set_trace_for_frame_and_parents(t.ident, frame)
-                finally:
-                    frame = None
+
+    # Note: the topmost frames of all the threads are gotten at once (getting it for each thread
+    # would create the dict with the frames of all the threads for each thread).
+    current_frames = _current_frames()
+    thread_ident_to_frame = {}
+    try:
+        info = None
+        for t in all_threads:
+            if getattr(t, "pydev_do_not_trace", None):
+                pass  # skip some other threads, i.e. ipython history saving thread from debug console
+            else:
+                if t is except_thread:
+                    continue
+                info = mark_thread_suspended(t, CMD_THREAD_SUSPEND, main_suspend=False, update_stepping_info=False)
+                frame = current_frames.get(t.ident)
+                if frame is not None:
+                    thread_ident_to_frame[t.ident] = frame
+
+        if info is not None:
+            # Updates the stepping info of all the threads at once.
+            info.update_stepping_info()
+
+        # Reset the tracing as in this case as it could've set scopes to be untraced.
+        py_db.set_trace_for_threads_frames_and_parents(thread_ident_to_frame)
+    finally:
+        frame = None
+        current_frames = None
+        thread_ident_to_frame = None
 
     if PYDEVD_USE_SYS_MONITORING:
         # After suspending the frames we need the monitoring to be reset.
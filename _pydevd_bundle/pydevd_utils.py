@@ -1,6 +1,8 @@
 from __future__ import nested_scopes
 import traceback
 import warnings
+import weakref
+from functools import partial
 from _pydev_bundle import pydev_log
 from _pydev_bundle._pydev_saved_modules import thread, threading
 from _pydev_bundle import _pydev_saved_modules
@@ -20,6 +22,7 @@ from _pydevd_bundle.pydevd_constants import (
     GEVENT_SUPPORT_NOT_SET_MSG,
     GENERATED_LEN_ATTR_NAME,
     PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT,
+    PYDEVD_DEFER_SLOW_REPR_COUNT,
     get_global_debugger,
 )
 
@@ -491,6 +494,130 @@ class Timer(object):
         ) % (cls, attr_name, diff, PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT)
 
 
+class SlowReprTypes(object):
+    """
+    Keeps the stats of the types whose repr was slow so that the values of the types which are
+    consistently slow can be provided without computing their repr (as lazy variables).
+
+    Note: builtin types are not tracked as their repr is only slow because of their contents.
+
+    Note: the stats are kept per debug session (they're cleared when the session is configured)
+    and the types are kept as weak references (so that dynamically created classes aren't kept
+    alive by the stats).
+    """
+
+    def __init__(self, slow_timeout=PYDEVD_WARN_SLOW_RESOLVE_TIMEOUT, defer_count=PYDEVD_DEFER_SLOW_REPR_COUNT):
+        self.slow_timeout = slow_timeout
+        self.defer_count = defer_count
+        self._lock = threading.Lock()
+
+        # id(type) -> [weakref(type), number of slow reprs, total time of the slow reprs]
+        self._type_id_to_stats = {}
+
+        # id(type) -> weakref(type)
+        self._deferred_type_ids = {}
+
+    def on_repr_computed(self, value, elapsed):
+        if elapsed < self.slow_timeout:
+            return
+
+        value_type = type(value)
+        if getattr(value_type, "__module__", None) == "builtins":
+            return
+
+        type_id = id(value_type)
+        with self._lock:
+            stats = self._type_id_to_stats.get(type_id)
+            if stats is None or stats[0]() is not value_type:
+                try:
+                    type_ref = weakref.ref(value_type, partial(self._on_type_collected, type_id))
+                except TypeError:
+                    return  # Unable to create a weak reference: don't track it.
+                stats = self._type_id_to_stats[type_id] = [type_ref, 0, 0.0]
+            stats[1] += 1
+            stats[2] += elapsed
+            if 0 < self.defer_count <= stats[1] and type_id not in self._deferred_type_ids:
+                pydev_log.info("Repr of %s was slow %s times (values will be provided as lazy variables).", value_type, stats[1])
+                self._deferred_type_ids[type_id] = stats[0]
+
+    def _on_type_collected(self, type_id, type_ref):
+        # Note: no locking as this may be called by the gc while the lock is held.
+        stats = self._type_id_to_stats.get(type_id)
+        if stats is not None and stats[0] is type_ref:
+            self._type_id_to_stats.pop(type_id, None)
+        if self._deferred_type_ids.get(type_id) is type_ref:
+            self._deferred_type_ids.pop(type_id, None)
+
+    def is_deferred(self, value):
+        """
+        :return bool: whether the repr of the value should not be computed (because the repr of
+            its type is known to be slow).
+        """
+        if not self._deferred_type_ids:
+            return False
+        try:
+            value_type = type(value)
+            type_ref = self._deferred_type_ids.get(id(value_type))
+            return type_ref is not None and type_ref() is value_type
+        except Exception:
+            return False
+
+    def get_stats(self):
+        """
+        :return list(dict): the stats of the types whose repr was slow (slowest first).
+        """
+        with self._lock:
+            ret = []
+            for type_id, (type_ref, slow_count, total_time) in list(self._type_id_to_stats.items()):
+                value_type = type_ref()
+                if value_type is None:
+                    continue
+                ret.append(
+                    {
+                        "type": "%s.%s" % (getattr(value_type, "__module__", ""), getattr(value_type, "__qualname__", value_type)),
+                        "slow_count": slow_count,
+                        "total_time": total_time,
+                        "deferred": type_id in self._deferred_type_ids,
+                    }
+                )
+        return sorted(ret, key=lambda stats: -stats["total_time"])
+
+    def clear(self):
+        with self._lock:
+            self._type_id_to_stats.clear()
+            self._deferred_type_ids.clear()
+
+
+slow_repr_types = SlowReprTypes()
+
+
+def iter_chunks(parts, chunk_size):
+    """
+    :param iterable(str) parts:
+        The parts to be regrouped.
+
+    :return iterable(str):
+        The contents of the parts regrouped in chunks with `chunk_size` chars (the last chunk
+        may be smaller).
+    """
+    buf = []
+    buf_len = 0
+    for part in parts:
+        offset = 0
+        part_len = len(part)
+        while offset < part_len:
+            size = min(chunk_size - buf_len, part_len - offset)
+            buf.append(part[offset : offset + size] if size != part_len else part)
+            buf_len += size
+            offset += size
+            if buf_len == chunk_size:
+                yield "".join(buf)
+                buf = []
+                buf_len = 0
+    if buf:
+        yield "".join(buf)
+
+
 def import_attr_from_module(import_with_attr_access):
     if "." not in import_with_attr_access:
         # We need at least one '.' (we don't support just the module import, we need the attribute access too).
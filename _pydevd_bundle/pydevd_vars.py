@@ -2,10 +2,11 @@
 resolution/conversion to XML.
 """
 
+import base64
 import pickle
 from _pydevd_bundle.pydevd_constants import get_frame, get_current_thread_id, iter_chars, silence_warnings_decorator, get_global_debugger
 
-from _pydevd_bundle.pydevd_xml import ExceptionOnEvaluate, get_type, var_to_xml
+from _pydevd_bundle.pydevd_xml import ExceptionOnEvaluate, get_type, var_to_xml, make_valid_xml_value
 from _pydev_bundle import pydev_log
 import functools
 from _pydevd_bundle.pydevd_thread_lifecycle import resume_threads, mark_thread_suspended, suspend_all_threads, suspend_threads_lock
@@ -647,8 +648,21 @@ def change_attr_expression(frame, attr, expression, dbg, value=SENTINEL_VALUE, s
 MAXIMUM_ARRAY_SIZE = 100
 MAX_SLICE_SIZE = 1000
 
+# Format which requests the contents of the array in the columnar (binary) mode.
+ARRAY_COLUMNAR_FORMAT = "columnar"
+
+# The dtype kinds whose raw buffers are sent in the columnar mode (other kinds -- i.e.: objects or
+# strings -- fall back to the xml, where each value is formatted as a string).
+_COLUMNAR_DTYPE_KINDS = "biufcmM"
+
 
 def table_like_struct_to_xml(array, name, roffset, coffset, rows, cols, format):
+    if format == ARRAY_COLUMNAR_FORMAT:
+        columnar = table_like_struct_to_columnar(array, roffset, coffset, rows, cols)
+        if columnar is not None:
+            return "<xml>%s</xml>" % columnar_to_xml(columnar)
+        format = "%"  # Fall back to the xml with the default format.
+
     _, type_name, _ = get_type(array)
     if type_name == "ndarray":
         array, metaxml, r, c, f = array_to_meta_xml(array, name, format)
@@ -825,7 +839,7 @@ def dataframe_to_xml(df, name, roffset, coffset, rows, cols, format):
     format = format.replace("%", "")
     col_formats = []
 
-    get_label = lambda label: str(label) if not isinstance(label, tuple) else "/".join(map(str, label))
+    get_label = _get_table_label
 
     for col in range(cols):
         dtype = df.dtypes.iloc[col].kind
@@ -859,3 +873,171 @@ def dataframe_to_xml(df, name, roffset, coffset, rows, cols, format):
             value = col_formats[col] % value
             xml += var_to_xml(value, "")
     return xml
+
+
+def _get_table_label(label):
+    return str(label) if not isinstance(label, tuple) else "/".join(map(str, label))
+
+
+def _is_columnar_values(values):
+    return type(values).__name__ == "ndarray" and values.ndim == 1 and values.dtype.kind in _COLUMNAR_DTYPE_KINDS
+
+
+def _get_columnar_data(values):
+    """
+    :param numpy.ndarray values:
+        A 1-dimensional array (where `_is_columnar_values(values)` is True).
+
+    :return memoryview:
+        The raw bytes of the values (the buffer of the array is shared if it's contiguous).
+    """
+    if not values.flags["C_CONTIGUOUS"]:
+        values = values.copy()
+    # Note: viewed as bytes as datetimes don't support the buffer protocol.
+    return memoryview(values.view("u1"))
+
+
+def table_like_struct_to_columnar(array, roffset, coffset, rows, cols, max_bytes=None):
+    """
+    Provides the contents of a numpy array (with 1 or 2 dimensions) or of a pandas DataFrame as
+    the raw buffers of its columns (formatting the values is left to the client).
+
+    :param int rows:
+        The number of rows requested (-1 means all the rows after the `roffset`). Note that
+        fewer rows may be provided so that the chunk fits in `max_bytes` (the client must ask for
+        the remaining rows in a new request).
+
+    :param int cols:
+        The number of columns requested (-1 means all the columns after the `coffset`).
+
+    :param int max_bytes:
+        The maximum number of bytes of the columns provided (PYDEVD_ARRAY_CHUNK_MAX_BYTES if
+        not given).
+
+    :return dict|None:
+        None if the contents can't be provided as raw buffers (i.e.: some column has an object
+        or a pandas extension dtype), in which case `table_like_struct_to_xml` should be used.
+
+        Otherwise a dict with the `totalRows`, `totalColumns`, `rowOffset`, `rows`,
+        `columnOffset` and the `columns` in the chunk. Each column is a dict with the `name`,
+        the `dtype` (i.e.: "<f8") and the `data` (a memoryview with the raw bytes of the values).
+
+        For a DataFrame the `index` is also provided (as a column dict) or, if the index can't be
+        provided as raw bytes, the `rowLabels` (a list(str)).
+    """
+    if max_bytes is None:
+        max_bytes = pydevd_constants.PYDEVD_ARRAY_CHUNK_MAX_BYTES
+
+    _, type_name, _ = get_type(array)
+    df = None
+    if type_name == "ndarray":
+        if array.ndim == 1:
+            total_rows, total_cols = len(array), 1
+            get_column = lambda col: (str(col), array)
+        elif array.ndim == 2:
+            total_rows, total_cols = array.shape
+            get_column = lambda col: (str(col), array[:, col])
+        else:
+            return None
+
+    elif type_name == "DataFrame":
+        import numpy  # pandas depends on numpy.
+
+        df = array
+        total_rows, total_cols = df.shape
+        dtypes = df.dtypes
+
+        def get_column(col):
+            # Columns with an extension dtype (i.e.: tz-aware datetimes or categoricals) fall back
+            # to the xml as their `values` may drop information (such as the timezone).
+            if not isinstance(dtypes.iloc[col], numpy.dtype):
+                return None, None
+            return _get_table_label(df.columns[col]), df.iloc[:, col].values
+
+    else:
+        raise VariableError("Do not know how to convert type %s to table" % (type_name))
+
+    roffset = max(0, min(roffset, total_rows))
+    coffset = max(0, min(coffset, total_cols))
+    if rows < 0:
+        rows = total_rows
+    if cols < 0:
+        cols = total_cols
+    rows = min(rows, total_rows - roffset)
+    cols = min(cols, total_cols - coffset)
+
+    names_and_values = []
+    row_bytes = 0
+    for col in range(coffset, coffset + cols):
+        name, values = get_column(col)
+        if not _is_columnar_values(values):
+            return None
+        row_bytes += values.dtype.itemsize
+        names_and_values.append((name, values))
+
+    if row_bytes > 0:
+        rows = min(rows, max(1, max_bytes // row_bytes))
+
+    end = roffset + rows
+    columnar = {
+        "totalRows": total_rows,
+        "totalColumns": total_cols,
+        "rowOffset": roffset,
+        "rows": rows,
+        "columnOffset": coffset,
+        "columns": [
+            {"name": name, "dtype": values.dtype.str, "data": _get_columnar_data(values[roffset:end])} for name, values in names_and_values
+        ],
+    }
+
+    if df is not None:
+        index = df.index[roffset:end]
+        values = index.values
+        if isinstance(index.dtype, numpy.dtype) and _is_columnar_values(values):
+            name = _get_table_label(index.name) if index.name is not None else ""
+            columnar["index"] = {"name": name, "dtype": values.dtype.str, "data": _get_columnar_data(values)}
+        else:
+            columnar["rowLabels"] = [_get_table_label(label) for label in index]
+
+    return columnar
+
+
+def columnar_to_xml(columnar):
+    """
+    :param dict columnar:
+        The contents gotten from `table_like_struct_to_columnar` (the raw data of the columns is
+        encoded as base64 in the xml).
+    """
+    xml = [
+        '<columnar rows="%s" cols="%s" roffset="%s" coffset="%s" total_rows="%s" total_cols="%s">\n'
+        % (
+            columnar["rows"],
+            len(columnar["columns"]),
+            columnar["rowOffset"],
+            columnar["columnOffset"],
+            columnar["totalRows"],
+            columnar["totalColumns"],
+        )
+    ]
+    for col, column in enumerate(columnar["columns"]):
+        xml.append(
+            '<column index="%s" label="%s" dtype="%s" data="%s"/>\n'
+            % (
+                col,
+                make_valid_xml_value(column["name"]),
+                make_valid_xml_value(column["dtype"]),
+                base64.b64encode(column["data"]).decode("ascii"),
+            )
+        )
+
+    index = columnar.get("index")
+    if index is not None:
+        xml.append(
+            '<index label="%s" dtype="%s" data="%s"/>\n'
+            % (make_valid_xml_value(index["name"]), make_valid_xml_value(index["dtype"]), base64.b64encode(index["data"]).decode("ascii"))
+        )
+    for row, label in enumerate(columnar.get("rowLabels", ())):
+        xml.append('<rowheader index="%s" label="%s"/>\n' % (row, make_valid_xml_value(label)))
+
+    xml.append("</columnar>")
+    return "".join(xml)
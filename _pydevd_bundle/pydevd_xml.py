@@ -1,7 +1,9 @@
 from _pydev_bundle import pydev_log
 from _pydevd_bundle import pydevd_extension_utils
 from _pydevd_bundle import pydevd_resolver
+from functools import partial
 import sys
+import weakref
 from _pydevd_bundle.pydevd_constants import (
     BUILTINS_MODULE_NAME,
     MAXIMUM_VARIABLE_REPRESENTATION_SIZE,
@@ -135,15 +137,27 @@ def _create_default_type_map():
     return default_type_map
 
 
+# Flag of the types which are dynamically allocated (i.e.: classes created with a class statement).
+_Py_TPFLAGS_HEAPTYPE = 1 << 9
+
+
 class TypeResolveHandler(object):
     NO_PROVIDER = []  # Sentinel value (any mutable object to be used as a constant would be valid).
 
     def __init__(self):
         # Note: don't initialize with the types we already know about so that the extensions can override
         # the default resolvers that are already available if they want.
-        self._type_to_resolver_cache = {}
-        self._type_to_str_provider_cache = {}
+
+        # The dispatch of each type is: [weakref(type), resolver, str provider (None if still not computed)]
+
+        # Static types (i.e.: builtins) are never collected: type -> dispatch
+        self._static_type_to_dispatch = {}
+
+        # Other types are keyed by the id (and not the type) so that dynamically created classes aren't
+        # kept alive by the cache (the entry is removed when the type is collected): id(type) -> dispatch
+        self._type_id_to_dispatch = {}
         self._initialized = False
+        pydevd_extension_utils.EXTENSION_MANAGER_INSTANCE.add_on_loaded_callback(self.clear_cache)
 
     def _initialize(self):
         self._default_type_map = _create_default_type_map()
@@ -151,6 +165,14 @@ class TypeResolveHandler(object):
         self._str_providers = pydevd_extension_utils.extensions_of_type(StrPresentationProvider)
         self._initialized = True
 
+    def clear_cache(self):
+        """
+        Called when the extensions are loaded (the providers are collected again on the next request).
+        """
+        self._static_type_to_dispatch.clear()
+        self._type_id_to_dispatch.clear()
+        self._initialized = False
+
     def get_type(self, o):
         try:
             try:
@@ -177,34 +199,57 @@ class TypeResolveHandler(object):
             return "Unable to get Type", "Unable to get Type", None
 
     def _get_type(self, o, type_object, type_name):
-        # Note: we could have an exception here if the type_object is not hashable...
-        resolver = self._type_to_resolver_cache.get(type_object)
-        if resolver is not None:
-            return type_object, type_name, resolver
-
+        dispatch = self._static_type_to_dispatch.get(type_object)
+        if dispatch is None:
+            dispatch = self._type_id_to_dispatch.get(id(type_object))
+            if dispatch is None or dispatch[0]() is not type_object:
+                dispatch = self._create_dispatch(o, type_object, type_name)
+        return type_object, type_name, dispatch[1]
+
+    def _create_dispatch(self, o, type_object, type_name):
         if not self._initialized:
             self._initialize()
 
+        dispatch = [None, self._find_resolver(o, type_object, type_name), None]
+        try:
+            is_static_type = not (type_object.__flags__ & _Py_TPFLAGS_HEAPTYPE)
+        except:
+            is_static_type = False
+
+        if is_static_type:
+            dispatch[0] = lambda: type_object
+            self._static_type_to_dispatch[type_object] = dispatch
+            return dispatch
+
+        type_id = id(type_object)
+        try:
+            dispatch[0] = weakref.ref(type_object, partial(self._on_type_collected, type_id))
+        except TypeError:
+            # Unable to create a weak reference: don't cache it.
+            dispatch[0] = lambda: type_object
+        else:
+            self._type_id_to_dispatch[type_id] = dispatch
+        return dispatch
+
+    def _on_type_collected(self, type_id, type_ref):
+        dispatch = self._type_id_to_dispatch.get(type_id)
+        if dispatch is not None and dispatch[0] is type_ref:
+            del self._type_id_to_dispatch[type_id]
+
+    def _find_resolver(self, o, type_object, type_name):
         try:
             for resolver in self._resolve_providers:
                 if resolver.can_provide(type_object, type_name):
-                    # Cache it
-                    self._type_to_resolver_cache[type_object] = resolver
-                    return type_object, type_name, resolver
+                    return resolver
 
             for t in self._default_type_map:
                 if isinstance_checked(o, t[0]):
-                    # Cache it
-                    resolver = t[1]
-                    self._type_to_resolver_cache[type_object] = resolver
-                    return (type_object, type_name, resolver)
+                    return t[1]
         except:
             pydev_log.exception()
 
-        # No match return default (and cache it).
-        resolver = pydevd_resolver.defaultResolver
-        self._type_to_resolver_cache[type_object] = resolver
-        return type_object, type_name, resolver
+        # No match return default.
+        return pydevd_resolver.defaultResolver
 
     if _IS_JYTHON:
         _base_get_type = _get_type
@@ -227,26 +272,28 @@ class TypeResolveHandler(object):
         return provider.get_str(o)
 
     def str_from_providers(self, o, type_object, type_name, context: Optional[str] = None):
-        provider = self._type_to_str_provider_cache.get(type_object)
+        dispatch = self._static_type_to_dispatch.get(type_object)
+        if dispatch is None:
+            dispatch = self._type_id_to_dispatch.get(id(type_object))
+            if dispatch is None or dispatch[0]() is not type_object:
+                dispatch = self._create_dispatch(o, type_object, type_name)
 
+        provider = dispatch[2]
         if provider is self.NO_PROVIDER:
             return None
 
         if provider is not None:
             return self._get_str_from_provider(provider, o, context)
 
-        if not self._initialized:
-            self._initialize()
-
         for provider in self._str_providers:
             if provider.can_provide(type_object, type_name):
-                self._type_to_str_provider_cache[type_object] = provider
+                dispatch[2] = provider
                 try:
                     return self._get_str_from_provider(provider, o, context)
                 except:
                     pydev_log.exception("Error when getting str with custom provider: %s." % (provider,))
 
-        self._type_to_str_provider_cache[type_object] = self.NO_PROVIDER
+        dispatch[2] = self.NO_PROVIDER
         return None
 
 
@@ -1,3 +1,8 @@
+from _pydevd_bundle import pydevd_startup_profile
+
+# Note: if the accelerator can't be loaded the phase is reported without a duration.
+_load_phase = pydevd_startup_profile.phase("load accelerator: pydevd_frame_evaluator")
+
 try:
     try:
         from _pydevd_frame_eval_ext import pydevd_frame_evaluator as mod
@@ -32,6 +37,8 @@ except ImportError:
     except ImportError:
         raise
 
+_load_phase.end()
+
 frame_eval_func = mod.frame_eval_func
 
 stop_frame_eval = mod.stop_frame_eval
@@ -2,14 +2,15 @@
 #
 # License: EPL
 
-from collections import namedtuple
+from collections import namedtuple, OrderedDict
+from bisect import bisect_left
 import dis
 import os
 import re
 import sys
 from _pydev_bundle._pydev_saved_modules import threading
 from types import CodeType, FrameType
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 from os.path import basename, splitext
 
 from _pydev_bundle import pydev_log
@@ -22,6 +23,7 @@ from _pydevd_bundle.pydevd_constants import (
     EXCEPTION_TYPE_USER_UNHANDLED,
     RETURN_VALUES_DICT,
     PYTHON_SUSPEND,
+    PYDEVD_FUNC_CODE_INFO_CACHE_SIZE,
 )
 from pydevd_file_utils import (
     NORM_PATHS_AND_BASE_CONTAINER,
@@ -376,6 +378,109 @@ def _create_thread_info(depth):
         return ThreadInfo(t, thread_ident, True, additional_info)
 
 
+# fmt: off
+# IFDEF CYTHON
+# cdef class _CodeLineInfo:
+#     cdef dict line_to_offset
+#     cdef int first_line
+#     cdef int last_line
+#     cdef list offset_starts
+#     cdef list offset_ends
+#     cdef list offset_lines
+# ELSE
+class _CodeLineInfo:
+    line_to_offset: Dict[int, Any]
+    first_line: int
+    last_line: int
+    offset_starts: List[int]
+    offset_ends: List[int]
+    offset_lines: List[int]
+# ENDIF
+# fmt: on
+
+    # fmt: off
+    # IFDEF CYTHON
+    # def __init__(self, dict line_to_offset, int first_line, int last_line, list offset_starts, list offset_ends, list offset_lines):
+    #     self.line_to_offset = line_to_offset
+    #     self.first_line = first_line
+    #     self.last_line = last_line
+    #     self.offset_starts = offset_starts
+    #     self.offset_ends = offset_ends
+    #     self.offset_lines = offset_lines
+    # ELSE
+    def __init__(self, line_to_offset, first_line, last_line, offset_starts, offset_ends, offset_lines):
+        self.line_to_offset = line_to_offset
+        self.first_line = first_line
+        self.last_line = last_line
+
+        # Sorted (start, end, line) intervals from code.co_lines() (in parallel lists) used
+        # to get the line of an offset with a bisect.
+        self.offset_starts = offset_starts
+        self.offset_ends = offset_ends
+        self.offset_lines = offset_lines
+
+    # ENDIF
+    # fmt: on
+
+    # fmt: off
+    # IFDEF CYTHON
+    # cpdef int get_line_of_offset(self, int offset):
+    #     cdef Py_ssize_t i
+    # ELSE
+    def get_line_of_offset(self, offset: int) -> int:
+    # ENDIF
+    # fmt: on
+        # Note: the end is inclusive (so, if an offset is both the end of an interval and
+        # the start of the next, the first interval is the one which matches).
+        i = bisect_left(self.offset_ends, offset)
+        if i < len(self.offset_ends) and self.offset_starts[i] <= offset:
+            return self.offset_lines[i]
+        return -1
+
+
+# Note: entries are removed when the related code object is evicted from the
+# _FuncCodeInfoCache or when it's cleared (so, it's bounded by it).
+_code_to_code_line_info_cache: Dict[CodeType, _CodeLineInfo] = {}
+
+
+# Note: this method has a version in cython too
+# fmt: off
+# IFDEF CYTHON
+# cdef _CodeLineInfo _get_code_line_info(code_obj):
+# ELSE
+def _get_code_line_info(code_obj) -> _CodeLineInfo:
+# ENDIF
+# fmt: on
+    _cache = _code_to_code_line_info_cache
+    try:
+        return _cache[code_obj]
+    except:
+        line_to_offset = {}
+        first_line = None
+        last_line = None
+
+        for offset, line in dis.findlinestarts(code_obj):
+            if line is not None:
+                line_to_offset[line] = offset
+
+        if len(line_to_offset):
+            first_line = min(line_to_offset)
+            last_line = max(line_to_offset)
+
+        offset_starts = []
+        offset_ends = []
+        offset_lines = []
+        for start, end, line in code_obj.co_lines():
+            if start is not None and end is not None and line is not None:
+                offset_starts.append(start)
+                offset_ends.append(end)
+                offset_lines.append(line)
+
+        ret = _CodeLineInfo(line_to_offset, first_line, last_line, offset_starts, offset_ends, offset_lines)
+        _cache[code_obj] = ret
+        return ret
+
+
 # fmt: off
 # IFDEF CYTHON
 # cdef class FuncCodeInfo:
@@ -391,12 +496,15 @@ def _create_thread_info(depth):
 #     cdef bint plugin_call_stepping
 #     cdef bint plugin_return_stepping
 #     cdef int pydb_mtime
+#     cdef int breakpoints_mtime
+#     cdef int function_breakpoint_mtime
 #     cdef dict bp_line_to_breakpoint
 #     cdef object function_breakpoint
 #     cdef bint always_filtered_out
 #     cdef bint filtered_out_force_checked
 #     cdef object try_except_container_obj
 #     cdef object code_obj
+#     cdef _CodeLineInfo code_line_info
 #     cdef str co_name
 # ELSE
 class FuncCodeInfo:
@@ -428,6 +536,11 @@ class FuncCodeInfo:
         # tracing can't be disabled for the related frames).
         self.pydb_mtime: int = -1
 
+        # Besides the global PyDb.mtime, the mtime of the breakpoints in the file
+        # and of the function breakpoints with the same name must also match.
+        self.breakpoints_mtime: int = 0
+        self.function_breakpoint_mtime: int = 0
+
         self.bp_line_to_breakpoint: Dict[int, Any] = {}
         self.function_breakpoint = None
 
@@ -442,14 +555,17 @@ class FuncCodeInfo:
 
         self.try_except_container_obj: Optional[_TryExceptContainerObj] = None
         self.code_obj: CodeType = None
+        self.code_line_info: _CodeLineInfo = None
         self.co_name: str = ""
 
-    def get_line_of_offset(self, offset):
-        for start, end, line in self.code_obj.co_lines():
-            if start is not None and end is not None and line is not None:
-                if offset >= start and offset <= end:
-                    return line
-        return -1
+    # fmt: off
+    # IFDEF CYTHON
+    # cpdef int get_line_of_offset(self, int offset):
+    # ELSE
+    def get_line_of_offset(self, offset: int) -> int:
+    # ENDIF
+    # fmt: on
+        return self.code_line_info.get_line_of_offset(offset)
 
 
 # fmt: off
@@ -481,62 +597,127 @@ def _get_thread_info(create: bool, depth: int) -> Optional[ThreadInfo]:
 
 # fmt: off
 # IFDEF CYTHON
-# cdef class _CodeLineInfo:
-#     cdef dict line_to_offset
-#     cdef int first_line
-#     cdef int last_line
+# cdef class _FuncCodeInfoCache:
+#     cdef object _code_to_func_code_info
+#     cdef Py_ssize_t _max_size
+#     cdef int _mtime
+#     cdef public Py_ssize_t hits
+#     cdef public Py_ssize_t misses
+#     cdef public Py_ssize_t evictions
 # ELSE
-class _CodeLineInfo:
-    line_to_offset: Dict[int, Any]
-    first_line: int
-    last_line: int
+class _FuncCodeInfoCache:
+    _code_to_func_code_info: OrderedDict
+    _max_size: int
+    _mtime: int
+    hits: int
+    misses: int
+    evictions: int
 # ENDIF
 # fmt: on
+    """
+    Bounded cache from code objects to the related FuncCodeInfo.
+
+    When the maximum size is reached the least recently used entries are evicted
+    (so that code objects which are dynamically generated aren't kept alive forever).
+
+    When the `py_db.mtime` changes all the entries become stale at once, so, they're
+    evicted in bulk when the change is first noticed.
+
+    Note that this can be called by any thread (and OrderedDict operations are atomic
+    under the GIL, so, a concurrent change may just make us miss an entry).
+    """
 
     # fmt: off
     # IFDEF CYTHON
-    # def __init__(self, dict line_to_offset, int first_line, int last_line):
-    #     self.line_to_offset = line_to_offset
-    #     self.first_line = first_line
-    #     self.last_line = last_line
+    # def __init__(self, Py_ssize_t max_size):
     # ELSE
-    def __init__(self, line_to_offset, first_line, last_line):
-        self.line_to_offset = line_to_offset
-        self.first_line = first_line
-        self.last_line = last_line
+    def __init__(self, max_size: int):
+    # ENDIF
+    # fmt: on
+        self._code_to_func_code_info = OrderedDict()
+        self._max_size = max_size
+        self._mtime = -1
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
+    # fmt: off
+    # IFDEF CYTHON
+    # cdef FuncCodeInfo get(self, code_obj, int mtime):
+    #     cdef FuncCodeInfo func_code_info
+    # ELSE
+    def get(self, code_obj, mtime: int) -> Optional[FuncCodeInfo]:
     # ENDIF
     # fmt: on
+        if mtime != self._mtime:
+            self._evict_all(mtime)
+
+        func_code_info = self._code_to_func_code_info.get(code_obj)
+        if func_code_info is None or func_code_info.pydb_mtime != mtime:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        try:
+            self._code_to_func_code_info.move_to_end(code_obj)
+        except KeyError:
+            pass  # Removed by some other thread in the meanwhile.
+        return func_code_info
+
+    # fmt: off
+    # IFDEF CYTHON
+    # cdef put(self, code_obj, FuncCodeInfo func_code_info):
+    # ELSE
+    def put(self, code_obj, func_code_info: FuncCodeInfo) -> None:
+    # ENDIF
+    # fmt: on
+        code_to_func_code_info = self._code_to_func_code_info
+        code_to_func_code_info[code_obj] = func_code_info
+        while len(code_to_func_code_info) > self._max_size:
+            try:
+                evicted_code_obj, _ = code_to_func_code_info.popitem(last=False)
+            except KeyError:
+                break  # Emptied by some other thread in the meanwhile.
+            _code_to_code_line_info_cache.pop(evicted_code_obj, None)
+            self.evictions += 1
+
+    # fmt: off
+    # IFDEF CYTHON
+    # cdef _evict_all(self, int mtime):
+    # ELSE
+    def _evict_all(self, mtime: int) -> None:
+    # ENDIF
+    # fmt: on
+        self._mtime = mtime
+        self.evictions += len(self._code_to_func_code_info)
+        self._code_to_func_code_info.clear()
+        _code_to_code_line_info_cache.clear()
+
+    def get_stats(self):
+        return {
+            "size": len(self._code_to_func_code_info),
+            "max_size": self._max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
 
 
-# Note: this method has a version in cython too
 # fmt: off
 # IFDEF CYTHON
-# cdef _CodeLineInfo _get_code_line_info(code_obj, _cache={}):
+# cdef _FuncCodeInfoCache _func_code_info_cache = _FuncCodeInfoCache(PYDEVD_FUNC_CODE_INFO_CACHE_SIZE)
 # ELSE
-def _get_code_line_info(code_obj, _cache={}) -> _CodeLineInfo:
+_func_code_info_cache: _FuncCodeInfoCache = _FuncCodeInfoCache(PYDEVD_FUNC_CODE_INFO_CACHE_SIZE)
 # ENDIF
 # fmt: on
-    try:
-        return _cache[code_obj]
-    except:
-        line_to_offset = {}
-        first_line = None
-        last_line = None
-
-        for offset, line in dis.findlinestarts(code_obj):
-            if line is not None:
-                line_to_offset[line] = offset
-
-        if len(line_to_offset):
-            first_line = min(line_to_offset)
-            last_line = max(line_to_offset)
-        ret = _CodeLineInfo(line_to_offset, first_line, last_line)
-        _cache[code_obj] = ret
-        return ret
 
 
-_code_to_func_code_info_cache: Dict[CodeType, "FuncCodeInfo"] = {}
+def get_func_code_info_cache_stats() -> Dict[str, int]:
+    """
+    :return: a dict with the size/max_size/hits/misses/evictions of the cache
+        which maps code objects to the related FuncCodeInfo.
+    """
+    return _func_code_info_cache.get_stats()
 
 
 # fmt: off
@@ -559,9 +740,11 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
     if py_db is None:
         return None
 
-    func_code_info = _code_to_func_code_info_cache.get(code_obj)
+    func_code_info = _func_code_info_cache.get(code_obj, py_db.mtime)
     if func_code_info is not None:
-        if func_code_info.pydb_mtime == py_db.mtime:
+        if func_code_info.breakpoints_mtime == py_db.file_to_breakpoints_mtime.get(
+            func_code_info.canonical_normalized_filename, 0
+        ) and func_code_info.function_breakpoint_mtime == py_db.func_name_to_breakpoints_mtime.get(func_code_info.co_name, 0):
             # if DEBUG:
             # print('_get_func_code_info: matched mtime', key, code_obj)
             return func_code_info
@@ -590,6 +773,7 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
     func_code_info = FuncCodeInfo()
     func_code_info.code_obj = code_obj
     code_line_info = _get_code_line_info(code_obj)
+    func_code_info.code_line_info = code_line_info
     line_to_offset = code_line_info.line_to_offset
     func_code_info.pydb_mtime = py_db.mtime
 
@@ -604,6 +788,8 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
 
     func_code_info.abs_path_filename = abs_path_real_path_and_base[0]
     func_code_info.canonical_normalized_filename = abs_path_real_path_and_base[1]
+    func_code_info.breakpoints_mtime = py_db.file_to_breakpoints_mtime.get(func_code_info.canonical_normalized_filename, 0)
+    func_code_info.function_breakpoint_mtime = py_db.func_name_to_breakpoints_mtime.get(co_name, 0)
 
     frame = None
     cache_file_type = py_db.get_cache_file_type()
@@ -625,7 +811,7 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
     if file_type is not None:
         func_code_info.always_skip_code = True
         func_code_info.always_filtered_out = True
-        _code_to_func_code_info_cache[code_obj] = func_code_info
+        _func_code_info_cache.put(code_obj, func_code_info)
         return func_code_info
 
     # still not set, check for dont trace comments.
@@ -642,7 +828,7 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
             assert frame.f_code is code_obj
 
             func_code_info.always_filtered_out = True
-            _code_to_func_code_info_cache[code_obj] = func_code_info
+            _func_code_info_cache.put(code_obj, func_code_info)
             return func_code_info
 
     if frame is None:
@@ -657,7 +843,7 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
     if py_db.is_files_filter_enabled:
         func_code_info.always_filtered_out = func_code_info.filtered_out_force_checked
         if func_code_info.always_filtered_out:
-            _code_to_func_code_info_cache[code_obj] = func_code_info
+            _func_code_info_cache.put(code_obj, func_code_info)
             return func_code_info
 
     else:
@@ -703,7 +889,7 @@ def _get_func_code_info(code_obj, frame_or_depth) -> FuncCodeInfo:
             func_code_info.plugin_call_stepping: bool = "call" in required_events_stepping
             func_code_info.plugin_return_stepping: bool = "return" in required_events_stepping
 
-    _code_to_func_code_info_cache[code_obj] = func_code_info
+    _func_code_info_cache.put(code_obj, func_code_info)
     return func_code_info
 
 
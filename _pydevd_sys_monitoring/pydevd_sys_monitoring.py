@@ -1,4 +1,7 @@
 from _pydevd_bundle.pydevd_constants import USE_CYTHON_FLAG, ENV_TRUE_LOWER_VALUES, ENV_FALSE_LOWER_VALUES, IS_PY312_OR_GREATER
+from _pydevd_bundle import pydevd_startup_profile
+
+_load_phase = pydevd_startup_profile.phase("load accelerator: pydevd_sys_monitoring")
 
 if IS_PY312_OR_GREATER:
     if USE_CYTHON_FLAG in ENV_TRUE_LOWER_VALUES:
@@ -14,3 +17,5 @@ if IS_PY312_OR_GREATER:
             from ._pydevd_sys_monitoring import *
 else:
     from ._pydevd_sys_monitoring import *
+
+_load_phase.end()
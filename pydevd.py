@@ -18,6 +18,12 @@ sys.path.insert(0, this_dir)
 
 import _pydev_bundle
 
+# Import this before the other pydevd modules so that the time to import them is also measured
+# (when PYDEVD_STARTUP_PROFILE is set).
+from _pydevd_bundle import pydevd_startup_profile
+
+_import_pydevd_phase = pydevd_startup_profile.phase("import pydevd")
+
 # Import this first as it'll check for shadowed modules and will make sure that we import
 # things as needed for gevent.
 from _pydevd_bundle import pydevd_constants
@@ -93,6 +99,8 @@ from _pydevd_bundle.pydevd_constants import (
     PYDEVD_IPYTHON_COMPATIBLE_DEBUGGING,
     PYDEVD_IPYTHON_CONTEXT,
     PYDEVD_USE_SYS_MONITORING,
+    PYDEVD_THREADS_RECONCILE_INTERVAL,
+    IS_WINDOWS,
 )
 from _pydevd_bundle.pydevd_defaults import PydevdCustomization  # Note: import alias used on pydev_monkey.
 from _pydevd_bundle.pydevd_custom_frames import CustomFramesContainer, custom_frames_container_init
@@ -152,7 +160,7 @@ from _pydevd_bundle.pydevd_suspended_frames import SuspendedFramesManager
 from socket import SHUT_RDWR
 from _pydevd_bundle.pydevd_api import PyDevdAPI
 from _pydevd_bundle.pydevd_timeout import TimeoutTracker
-from _pydevd_bundle.pydevd_thread_lifecycle import suspend_all_threads, mark_thread_suspended, suspend_threads_lock
+from _pydevd_bundle.pydevd_thread_lifecycle import suspend_all_threads, mark_thread_suspended, suspend_threads_lock, threads_index
 
 if PYDEVD_USE_SYS_MONITORING:
     from _pydevd_sys_monitoring import pydevd_sys_monitoring
@@ -625,6 +633,13 @@ class PyDB(object):
         # tracing in place (such as breakpoints change or filtering).
         self.mtime = 0
 
+        # When only the line breakpoints of some file (or some function breakpoints) change,
+        # just the mtime of the related file (canonical_normalized_filename) or function name
+        # is raised (so that only the related code needs to be re-evaluated).
+        # Note: only checked in sys.monitoring mode (in other modes `mtime` is also raised).
+        self.file_to_breakpoints_mtime = {}
+        self.func_name_to_breakpoints_mtime = {}
+
         self.file_to_id_to_line_breakpoint = {}
         self.file_to_id_to_plugin_breakpoint = {}
 
@@ -672,6 +687,9 @@ class PyDB(object):
         self._running_thread_ids = {}
         # Note: also access '_enable_thread_notifications' with '_lock_running_thread_ids'
         self._enable_thread_notifications = False
+        # The last time that all the threads were enumerated to reconcile them with
+        # `_running_thread_ids` (threads are usually notified as they're started/finished).
+        self._threads_reconciled_time = 0.0
 
         self._set_breakpoints_with_id = False
 
@@ -708,6 +726,9 @@ class PyDB(object):
         self.is_files_filter_enabled = self._exclude_filters_enabled or self._is_libraries_filter_enabled
         self.show_return_values = False
         self.remove_return_values_flag = False
+        # Whether the client supports the paging of variables (in which case `indexedVariables`
+        # is reported for big containers and their items are requested in pages).
+        self.supports_variable_paging = False
         self.redirect_output = False
         # Note that besides the `redirect_output` flag, we also need to consider that someone
         # else is already redirecting (i.e.: debugpy).
@@ -767,6 +788,10 @@ class PyDB(object):
         self._in_project_scope_cache = {}
         self._exclude_by_filter_cache = {}
         self._apply_filter_cache = {}
+        # code -> info which is shown for the frames of that code in the stackTrace (it's
+        # cleared along with the filter caches as it depends on the project scope). Weakly
+        # keyed so that it doesn't keep the code objects alive.
+        self.code_presentation_cache = weakref.WeakKeyDictionary()
         self._ignore_system_exit_codes = set()
 
         # DAP related
@@ -887,11 +912,12 @@ class PyDB(object):
         return 0
 
     def wait_for_ready_to_run(self):
-        while not self.ready_to_run:
-            # busy wait until we receive run command
-            self.process_internal_commands()
-            self._py_db_command_thread_event.clear()
-            self._py_db_command_thread_event.wait(TIMEOUT_FAST)
+        with pydevd_startup_profile.phase("wait_for_ready_to_run"):
+            while not self.ready_to_run:
+                # busy wait until we receive run command
+                self.process_internal_commands()
+                self._py_db_command_thread_event.clear()
+                self._py_db_command_thread_event.wait(TIMEOUT_FAST)
 
     def on_initialize(self):
         """
@@ -903,6 +929,8 @@ class PyDB(object):
         """
         Note: only called when using the DAP (Debug Adapter Protocol).
         """
+        # The types whose repr was slow in a previous session are not deferred in a new one.
+        pydevd_utils.slow_repr_types.clear()
         self._on_configuration_done_event.set()
         self._py_db_command_thread_event.set()
 
@@ -930,14 +958,15 @@ class PyDB(object):
         if cancel is None:
             cancel = NULL
 
-        while not cancel.is_set():
-            if self._on_configuration_done_event.is_set():
-                cancel.set()  # Set cancel to prevent reuse
-                return
+        with pydevd_startup_profile.phase("block_until_configuration_done"):
+            while not cancel.is_set():
+                if self._on_configuration_done_event.is_set():
+                    cancel.set()  # Set cancel to prevent reuse
+                    return
 
-            self.process_internal_commands()
-            self._py_db_command_thread_event.clear()
-            self._py_db_command_thread_event.wait(TIMEOUT_FAST)
+                self.process_internal_commands()
+                self._py_db_command_thread_event.clear()
+                self._py_db_command_thread_event.wait(TIMEOUT_FAST)
 
     def add_fake_frame(self, thread_id, frame_id, frame):
         self.suspended_frames_manager.add_fake_frame(thread_id, frame_id, frame)
@@ -951,7 +980,7 @@ class PyDB(object):
             if not condition:
                 return False
 
-            return eval(condition, new_frame.f_globals, new_frame.f_locals)
+            return eval(pybreakpoint.condition_code, new_frame.f_globals, new_frame.f_locals)
         except Exception as e:
             if not isinstance(e, self.skip_print_breakpoint_exception):
                 stack_trace = io.StringIO()
@@ -984,7 +1013,7 @@ class PyDB(object):
     def handle_breakpoint_expression(self, pybreakpoint, info, new_frame):
         try:
             try:
-                val = eval(pybreakpoint.expression, new_frame.f_globals, new_frame.f_locals)
+                val = eval(pybreakpoint.expression_code, new_frame.f_globals, new_frame.f_locals)
             except:
                 val = sys.exc_info()[1]
         finally:
@@ -1169,15 +1198,32 @@ class PyDB(object):
         else:
             pydevd_tracing.SetTrace(None)
 
-    def on_breakpoints_changed(self, removed=False):
+    def on_breakpoints_changed(self, removed=False, changed_files=None, changed_func_names=None):
         """
         When breakpoints change, we have to re-evaluate all the assumptions we've made so far.
+
+        :param changed_files:
+            If given, the changes are restricted to the line breakpoints of these files
+            (canonical normalized filenames), so, only the code from those files needs to
+            be re-evaluated.
+
+        :param changed_func_names:
+            If given, the changes are restricted to the function breakpoints with these
+            names, so, only the code with those names needs to be re-evaluated.
         """
         if not self.ready_to_run:
             # No need to do anything if we're still not running.
             return
 
-        self.mtime += 1
+        changes_restricted = changed_files is not None or changed_func_names is not None
+        if changes_restricted:
+            for canonical_normalized_filename in changed_files or ():
+                self._increment_breakpoints_mtime(self.file_to_breakpoints_mtime, canonical_normalized_filename)
+            for func_name in changed_func_names or ():
+                self._increment_breakpoints_mtime(self.func_name_to_breakpoints_mtime, func_name)
+        else:
+            self.mtime += 1
+
         if not removed:
             # When removing breakpoints we can leave tracing as was, but if a breakpoint was added
             # we have to reset the tracing for the existing functions to be re-evaluated.
@@ -1185,9 +1231,20 @@ class PyDB(object):
             # The caches also need to be cleared because of django breakpoints use case,
             # where adding a file needs to start tracking a context which was previously
             # untracked.
-            self._clear_caches()
+            if changes_restricted:
+                # Filters are still valid, but code which was skipped may now need to be traced.
+                global_cache_skips.clear()
+                global_cache_frame_skips.clear()
+            else:
+                self._clear_caches()
             self.set_tracing_for_untraced_contexts(breakpoints_changed=True)
 
+    def _increment_breakpoints_mtime(self, key_to_breakpoints_mtime, key):
+        key_to_breakpoints_mtime[key] = key_to_breakpoints_mtime.get(key, 0) + 1
+        if not PYDEVD_USE_SYS_MONITORING:
+            # Only the sys.monitoring mode checks the per-file/function mtime.
+            self.mtime += 1
+
     def set_tracing_for_untraced_contexts(self, breakpoints_changed=False):
         # Enable the tracing for existing threads (because there may be frames being executed that
         # are currently untraced).
@@ -1305,20 +1362,29 @@ class PyDB(object):
     def in_project_roots_filename_uncached(self, absolute_filename):
         return self._files_filtering.in_project_roots(absolute_filename)
 
-    def _clear_caches(self):
+    def _clear_caches(self, canonical_normalized_filename=None):
+        """
+        :param canonical_normalized_filename:
+            If given, only the line breakpoints of this file changed (so, filters are still
+            valid and only the code from this file needs to be re-evaluated).
+        """
         # Skip caches
         global_cache_skips.clear()
         global_cache_frame_skips.clear()
 
-        # Filter caches
-        self._in_project_scope_cache.clear()
-        self._exclude_by_filter_cache.clear()
-        self._apply_filter_cache.clear()
-        self._exclude_filters_enabled = self._files_filtering.use_exclude_filters()
-        self._is_libraries_filter_enabled = self._files_filtering.use_libraries_filter()
-        self.is_files_filter_enabled = self._exclude_filters_enabled or self._is_libraries_filter_enabled
-
-        self.mtime += 1
+        if canonical_normalized_filename is not None:
+            self._increment_breakpoints_mtime(self.file_to_breakpoints_mtime, canonical_normalized_filename)
+        else:
+            # Filter caches
+            self._in_project_scope_cache.clear()
+            self._exclude_by_filter_cache.clear()
+            self._apply_filter_cache.clear()
+            self.code_presentation_cache.clear()
+            self._exclude_filters_enabled = self._files_filtering.use_exclude_filters()
+            self._is_libraries_filter_enabled = self._files_filtering.use_libraries_filter()
+            self.is_files_filter_enabled = self._exclude_filters_enabled or self._is_libraries_filter_enabled
+
+            self.mtime += 1
         if PYDEVD_USE_SYS_MONITORING:
             pydevd_sys_monitoring.update_monitor_events()
             pydevd_sys_monitoring.restart_events()
@@ -1499,12 +1565,13 @@ class PyDB(object):
         time.sleep(0.1)  # give threads time to start
 
     def connect(self, host, port):
-        if host:
-            s = start_client(host, port)
-        else:
-            s = start_server(port)
+        with pydevd_startup_profile.phase("connect"):
+            if host:
+                s = start_client(host, port)
+            else:
+                s = start_server(port)
 
-        self.initialize_network(s)
+            self.initialize_network(s)
 
     def create_wait_for_connection_thread(self):
         if self._waiting_for_connection_thread is not None:
@@ -1600,6 +1667,17 @@ class PyDB(object):
         else:
             event.set()
 
+    def notify_thread_state_changed(self, thread_id):
+        """
+        Wakes up the given thread if it's waiting in the suspend loop (must be called when its
+        state is changed by some other thread, i.e.: when it's resumed).
+        """
+        if thread_id.startswith("__frame__"):
+            thread_id = thread_id[thread_id.rfind("|") + 1 :]
+        event = self._thread_events.get(thread_id)
+        if event is not None:
+            event.set()
+
     def enable_output_redirection(self, redirect_stdout, redirect_stderr):
         global _global_redirect_stdout_to_server
         global _global_redirect_stderr_to_server
@@ -1703,6 +1781,7 @@ class PyDB(object):
         self.writer.add_command(self.cmd_factory.make_skipped_step_in_because_of_filters(self, frame))
 
     def notify_thread_created(self, thread_id, thread, use_lock=True):
+        threads_index.add(thread_id, thread)
         if self.writer is None:
             # Protect about threads being created before the communication structure is in place
             # (note that they will appear later on anyways as pydevd does reconcile live/dead threads
@@ -1729,6 +1808,7 @@ class PyDB(object):
 
     def notify_thread_not_alive(self, thread_id, use_lock=True):
         """if thread is not alive, cancel trace_dispatch processing"""
+        threads_index.remove(thread_id)
         if self.writer is None:
             return
 
@@ -1769,9 +1849,20 @@ class PyDB(object):
         dispose = False
         with self._main_lock:
             program_threads_alive = {}
+            reconcile_threads = False
             if ready_to_run:
                 self.check_output_redirect()
 
+                # Threads are notified as they're started/finished, so, enumerating all the threads
+                # is just a safety net (for threads not started through the patched thread modules),
+                # done when no thread is known or at most at PYDEVD_THREADS_RECONCILE_INTERVAL.
+                curr_time = time.time()
+                reconcile_threads = (
+                    not self._running_thread_ids or curr_time - self._threads_reconciled_time >= PYDEVD_THREADS_RECONCILE_INTERVAL
+                )
+
+            if reconcile_threads:
+                self._threads_reconciled_time = curr_time
                 all_threads = threadingEnumerate()
                 program_threads_dead = []
                 with self._lock_running_thread_ids:
@@ -1809,7 +1900,7 @@ class PyDB(object):
             cmds_to_execute = []
 
             # Without self._lock_running_thread_ids
-            if len(program_threads_alive) == 0 and ready_to_run:
+            if len(program_threads_alive) == 0 and reconcile_threads:
                 dispose = True
             else:
                 curr_thread_id = get_current_thread_id(threadingCurrentThread())
@@ -1865,7 +1956,11 @@ class PyDB(object):
             break_dict[pybreakpoint.line] = pybreakpoint
 
         file_to_line_to_breakpoints[canonical_normalized_filename] = break_dict
-        self._clear_caches()
+        if file_to_line_to_breakpoints is self.breakpoints:
+            self._clear_caches(canonical_normalized_filename)
+        else:
+            # Plugin breakpoints (i.e.: django/jinja2 templates) affect code in other files.
+            self._clear_caches()
 
     def add_break_on_exception(
         self,
@@ -2021,6 +2116,7 @@ class PyDB(object):
         """Sends a message that a new process has been created."""
         if self.writer is None or self.cmd_factory is None:
             return
+        pydevd_io.flush_output_buffer()
         cmd = self.cmd_factory.make_process_about_to_be_replaced_message()
         if cmd is NULL_NET_COMMAND:
             return
@@ -2099,6 +2195,9 @@ class PyDB(object):
         # Only process from all threads, not for current one (we'll do that later on in this method).
         self.process_internal_commands(("*",))
 
+        # The output must be sent before the suspend notification.
+        pydevd_io.flush_output_buffer()
+
         thread_id = get_current_thread_id(thread)
 
         # if DebugInfoHolder.DEBUG_TRACE_LEVEL >= 2:
@@ -2216,7 +2315,11 @@ class PyDB(object):
             curr_thread_id = get_current_thread_id(threadingCurrentThread())
             queue, notify_event = self.get_internal_queue_and_event(curr_thread_id)
 
-            wait_timeout = TIMEOUT_SLOW
+            # The thread just blocks until it's notified (a command is posted to it or its state
+            # is changed in `notify_thread_state_changed`), so, there are no periodic wake-ups
+            # unless a GUI input hook must be called (or in the main thread on Windows, where a
+            # wait without a timeout can't be interrupted by a Ctrl+C).
+            wait_timeout = TIMEOUT_SLOW if (in_main_thread and IS_WINDOWS) else None
             while True:
                 with self._main_lock:  # Use lock to check if suspended state changed
                     if info.pydev_state != STATE_SUSPEND or (self.pydb_disposed and not self.terminate_requested):
@@ -2241,6 +2344,9 @@ class PyDB(object):
                             internal_cmd.do_it(self)
                         except:
                             pydev_log.exception("Error processing internal command.")
+                        # Only wait when the queue is empty (more commands may have been posted while
+                        # the event was set -- in which case the wait wouldn't be notified again).
+                        continue
                     else:
                         # This shouldn't really happen...
                         pydev_log.verbose("NOT processing internal command: %s ", internal_cmd)
@@ -2423,6 +2529,55 @@ class PyDB(object):
 
         del frame
 
+    def set_trace_for_threads_frames_and_parents(self, thread_ident_to_frame):
+        """
+        Same as `set_trace_for_frame_and_parents` for the topmost frames of many threads (i.e.: when
+        all the threads are suspended), but whether a frame should be traced is computed only once
+        for each code object (and with sys.monitoring the code tracing is also enabled only once
+        for each code object).
+
+        :param dict(int->frame) thread_ident_to_frame:
+            The thread ident -> topmost frame of each thread.
+
+        Note: the threads must be in the same state (i.e.: all marked as suspended).
+        """
+        code_to_trace = {}
+        code_tracing_enabled = set()
+        for thread_ident, frame in thread_ident_to_frame.items():
+            # The code tracing isn't enabled for a thread which isn't in threading._active (i.e.: a
+            # dummy or foreign thread), so, in that case it must still be enabled for other threads.
+            is_tracked_thread = thread_ident in threading._active
+            while frame is not None:
+                if not isinstance(frame, FrameType):
+                    # This is the case for django/jinja frames.
+                    frame = frame.f_back
+                    continue
+
+                code = frame.f_code
+                trace = code_to_trace.get(code)
+                if trace is None:
+                    # Don't change the tracing on debugger-related files
+                    trace = code_to_trace[code] = self.get_file_type(frame) is None
+
+                if trace:
+                    if PYDEVD_USE_SYS_MONITORING:
+                        if code not in code_tracing_enabled:
+                            pydevd_sys_monitoring.enable_code_tracing(thread_ident, code, frame)
+                            if is_tracked_thread:
+                                code_tracing_enabled.add(code)
+
+                    elif frame.f_trace is not self.trace_dispatch:
+                        frame.f_trace = self.trace_dispatch
+
+                frame = frame.f_back
+
+        pydev_log.debug(
+            "Set tracing of frames of %s threads (%s code objects, %s traced).",
+            len(thread_ident_to_frame),
+            len(code_to_trace),
+            sum(code_to_trace.values()),
+        )
+
     def _create_pydb_command_thread(self):
         curr_pydb_command_thread = self.py_db_command_thread
         if curr_pydb_command_thread is not None:
@@ -2440,8 +2595,9 @@ class PyDB(object):
         check_alive_thread.start()
 
     def start_auxiliary_daemon_threads(self):
-        self._create_pydb_command_thread()
-        self._create_check_output_thread()
+        with pydevd_startup_profile.phase("start_auxiliary_daemon_threads"):
+            self._create_pydb_command_thread()
+            self._create_check_output_thread()
 
     def __wait_for_threads_to_finish(self, timeout):
         try:
@@ -2514,6 +2670,8 @@ class PyDB(object):
 
             pydev_log.debug("PyDB.dispose_and_kill_all_pydevd_threads (first call)")
 
+            pydevd_io.flush_output_buffer()
+
             # Wait until a time when there are no commands being processed to kill the threads.
             started_at = time.time()
             while time.time() < started_at + timeout:
@@ -2525,6 +2683,10 @@ class PyDB(object):
             else:
                 pydev_log.debug("PyDB.dispose_and_kill_all_pydevd_threads timed out waiting for writer to be empty.")
 
+            # Wake up the threads in the suspend loop so that they notice the debugger was disposed.
+            for event in list(self._thread_events.values()):
+                event.set()
+
             pydb_daemon_threads = set(self.created_pydb_daemon_threads)
             for t in pydb_daemon_threads:
                 if hasattr(t, "do_kill_pydev_thread"):
@@ -2555,18 +2717,19 @@ class PyDB(object):
         self.start_auxiliary_daemon_threads()
 
     def patch_threads(self):
-        if PYDEVD_USE_SYS_MONITORING:
-            pydevd_sys_monitoring.start_monitoring(all_threads=True)
-        else:
-            try:
-                # not available in jython!
-                threading.settrace(self.trace_dispatch)  # for all future threads
-            except:
-                pass
+        with pydevd_startup_profile.phase("patch_threads"):
+            if PYDEVD_USE_SYS_MONITORING:
+                pydevd_sys_monitoring.start_monitoring(all_threads=True)
+            else:
+                try:
+                    # not available in jython!
+                    threading.settrace(self.trace_dispatch)  # for all future threads
+                except:
+                    pass
 
-        from _pydev_bundle.pydev_monkey import patch_thread_modules
+            from _pydev_bundle.pydev_monkey import patch_thread_modules
 
-        patch_thread_modules()
+            patch_thread_modules()
 
     def run(self, file, globals=None, locals=None, is_module=False, set_trace=True):
         module_name = None
@@ -2655,6 +2818,9 @@ class PyDB(object):
             # call prepare_to_run when we already have all information about breakpoints
             self.prepare_to_run()
 
+            # Startup finished (the user code will be run now).
+            pydevd_startup_profile.write_report()
+
         t = threadingCurrentThread()
         thread_id = get_current_thread_id(t)
 
@@ -2903,6 +3069,7 @@ def _wait_for_attach(cancel=None):
         raise AssertionError("Debugger still not created. Please use _enable_attach() before using _wait_for_attach().")
 
     py_db.block_until_configuration_done(cancel=cancel)
+    pydevd_startup_profile.write_report()
 
 
 def _is_attached():
@@ -3052,7 +3219,8 @@ def _locked_settrace(
         except:
             pass
         else:
-            pydev_monkey.patch_new_process_functions()
+            with pydevd_startup_profile.phase("patch_new_process_functions"):
+                pydev_monkey.patch_new_process_functions()
 
     if host is None:
         from _pydev_bundle import pydev_localhost
@@ -3066,7 +3234,8 @@ def _locked_settrace(
     if __setup_holder__:
         SetupHolder.setup = __setup_holder__
     if py_db is None:
-        py_db = PyDB()
+        with pydevd_startup_profile.phase("PyDB.__init__"):
+            py_db = PyDB()
         pydevd_vm_type.setup_type()
 
         if SetupHolder.setup is None:
@@ -3140,6 +3309,11 @@ def _locked_settrace(
             for _frameId, custom_frame in CustomFramesContainer.custom_frames.items():
                 py_db.set_trace_for_frame_and_parents(None, custom_frame.frame)
 
+        if wait_for_ready_to_run:
+            # Startup finished (when it's not waiting for the configuration done, the
+            # report is written when the configuration is done or at exit).
+            pydevd_startup_profile.write_report()
+
     else:
         # ok, we're already in debug mode, with all set, so, let's just set the break
         if access_token is not None:
@@ -3542,7 +3716,8 @@ def main():
 
     debugger = get_global_debugger()
     if debugger is None:
-        debugger = PyDB()
+        with pydevd_startup_profile.phase("PyDB.__init__"):
+            debugger = PyDB()
 
     try:
         from _pydev_bundle import pydev_monkey
@@ -3550,7 +3725,8 @@ def main():
         pass  # Not usable on jython 2.1
     else:
         if setup["multiprocess"]:  # PyDev
-            pydev_monkey.patch_new_process_functions()
+            with pydevd_startup_profile.phase("patch_new_process_functions"):
+                pydev_monkey.patch_new_process_functions()
 
         elif setup["multiproc"]:  # PyCharm
             pydev_log.debug("Started in multiproc mode\n")
@@ -3575,7 +3751,8 @@ def main():
                 dispatcher.close()
         else:
             try:
-                pydev_monkey.patch_new_process_functions_with_warning()
+                with pydevd_startup_profile.phase("patch_new_process_functions"):
+                    pydev_monkey.patch_new_process_functions_with_warning()
             except:
                 pydev_log.exception("Error patching process functions.")
 
@@ -3703,5 +3880,7 @@ try:
 except Exception:
     pass
 
+_import_pydevd_phase.end()
+
 if __name__ == "__main__":
     main()
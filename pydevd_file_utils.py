@@ -42,10 +42,20 @@ debugged is case-independent, 'normcase()' should be used on the paths defined i
 """
 
 from _pydev_bundle import pydev_log
-from _pydevd_bundle.pydevd_constants import DebugInfoHolder, IS_WINDOWS, IS_JYTHON, DISABLE_FILE_VALIDATION, is_true_in_env, IS_MAC
+from _pydevd_bundle.pydevd_constants import (
+    DebugInfoHolder,
+    IS_WINDOWS,
+    IS_JYTHON,
+    DISABLE_FILE_VALIDATION,
+    is_true_in_env,
+    IS_MAC,
+    PYDEVD_PATHS_CACHE_MAX_ENTRIES,
+)
 from _pydev_bundle._pydev_filesystem_encoding import getfilesystemencoding
 from _pydevd_bundle.pydevd_comm_constants import file_system_encoding, filesystem_encoding_is_utf8
 from _pydev_bundle.pydev_log import error_once
+from _pydevd_bundle import pydevd_filtering_cache
+from _pydevd_bundle.pydevd_bounded_cache import BoundedCache
 
 import json
 import os.path
@@ -95,6 +105,7 @@ def _get_library_dir():
         else:
             # "threading" is not a frozen import an thus "threading.__file__" is always set.
             import threading
+
             library_dir = os.path.dirname(threading.__file__)
 
     return library_dir
@@ -135,13 +146,14 @@ get_path_with_real_case = lambda filename: filename
 # issue is if the user actually changes the case of an existing file on while
 # the debugger is executing (as this seems very unlikely and the cache can save a
 # reasonable time -- especially on mapped drives -- it seems nice to have it).
-_listdir_cache = {}
+_listdir_bounded_cache = BoundedCache("listdir", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+_listdir_cache = _listdir_bounded_cache.entries
 
 # May be changed during tests.
 os_listdir = os.listdir
 
 
-def _resolve_listing(resolved, iter_parts_lowercase, cache=_listdir_cache):
+def _resolve_listing(resolved, iter_parts_lowercase, cache=_listdir_cache, set_in_cache=_listdir_bounded_cache.set):
     while True:  # Note: while True to make iterative and not recursive
         try:
             resolve_lowercase = next(iter_parts_lowercase)  # must be lowercase already
@@ -154,12 +166,12 @@ def _resolve_listing(resolved, iter_parts_lowercase, cache=_listdir_cache):
         if resolved_joined is None:
             dir_contents = cache.get(resolved_lower)
             if dir_contents is None:
-                dir_contents = cache[resolved_lower] = os_listdir(resolved)
+                dir_contents = set_in_cache(resolved_lower, os_listdir(resolved))
 
             for filename in dir_contents:
                 if filename.lower() == resolve_lowercase:
                     resolved_joined = os.path.join(resolved, filename)
-                    cache[(resolved_lower, resolve_lowercase)] = resolved_joined
+                    set_in_cache((resolved_lower, resolve_lowercase), resolved_joined)
                     break
             else:
                 raise FileNotFoundError("Unable to find: %s in %s. Dir Contents: %s" % (resolve_lowercase, resolved, dir_contents))
@@ -173,7 +185,7 @@ def _resolve_listing_parts(resolved, parts_in_lowercase, filename):
             return resolved
         return _resolve_listing(resolved, iter(parts_in_lowercase))
     except FileNotFoundError:
-        _listdir_cache.clear()
+        _listdir_bounded_cache.clear()
         # Retry once after clearing the cache we have.
         try:
             return _resolve_listing(resolved, iter(parts_in_lowercase))
@@ -346,12 +358,14 @@ else:
     _default_normcase = _normcase_linux
 
 
-def normcase(s, NORMCASE_CACHE={}):
+_normcase_cache = BoundedCache("normcase", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+
+
+def normcase(s, NORMCASE_CACHE=_normcase_cache.entries, set_in_cache=_normcase_cache.set):
     try:
         return NORMCASE_CACHE[s]
     except:
-        normalized = NORMCASE_CACHE[s] = _default_normcase(s)
-        return normalized
+        return set_in_cache(s, _default_normcase(s))
 
 
 _ide_os = "WINDOWS" if IS_WINDOWS else "UNIX"
@@ -403,9 +417,13 @@ def set_ide_os(os):
         setup_client_server_paths(_last_client_server_paths_set)
 
 
-# Caches filled as requested during the debug session.
-NORM_PATHS_CONTAINER = {}
-NORM_PATHS_AND_BASE_CONTAINER = {}
+# Caches filled as requested during the debug session (note: the containers are read
+# directly and must only be written through the related BoundedCache).
+_norm_paths_cache = BoundedCache("norm_paths", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+NORM_PATHS_CONTAINER = _norm_paths_cache.entries
+
+_norm_paths_and_base_cache = BoundedCache("norm_paths_and_base", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+NORM_PATHS_AND_BASE_CONTAINER = _norm_paths_and_base_cache.entries
 
 
 def canonical_normalized_path(filename):
@@ -466,7 +484,7 @@ def _abs_and_canonical_path(filename, NORM_PATHS_CONTAINER=NORM_PATHS_CONTAINER)
         real_path = _apply_func_and_normalize_case(filename, os_path_real_path, isabs, normalize)
 
         # cache it for fast access later
-        NORM_PATHS_CONTAINER[filename] = abs_path, real_path
+        _norm_paths_cache.set(filename, (abs_path, real_path))
         return abs_path, real_path
 
 
@@ -631,13 +649,15 @@ def _path_to_expected_str(filename):
     return filename
 
 
-def _original_file_to_client(filename, cache={}):
+_file_to_client_cache = BoundedCache("file_to_client", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+
+
+def _original_file_to_client(filename, cache=_file_to_client_cache.entries, set_in_cache=_file_to_client_cache.set):
     try:
         return cache[filename]
     except KeyError:
         translated = _path_to_expected_str(get_path_with_real_case(absolute_path(filename)))
-        cache[filename] = (translated, False)
-    return cache[filename]
+        return set_in_cache(filename, (translated, False))
 
 
 def _original_map_file_to_server(filename):
@@ -709,10 +729,15 @@ def get_frame_id_from_source_reference(source_reference):
 
 _global_resolve_symlinks = is_true_in_env("PYDEVD_RESOLVE_SYMLINKS")
 
+# Persistent cache of the results of get_abs_path_real_path_and_base_from_file (None if disabled).
+_paths_disk_cache = pydevd_filtering_cache.get_cache("paths", (_global_resolve_symlinks, IS_WINDOWS))
+
 
 def set_resolve_symlinks(resolve_symlinks):
     global _global_resolve_symlinks
+    global _paths_disk_cache
     _global_resolve_symlinks = resolve_symlinks
+    _paths_disk_cache = pydevd_filtering_cache.get_cache("paths", (_global_resolve_symlinks, IS_WINDOWS))
 
 
 def setup_client_server_paths(paths):
@@ -733,8 +758,8 @@ def setup_client_server_paths(paths):
     python_sep = "\\" if IS_WINDOWS else "/"
     eclipse_sep = "\\" if _ide_os == "WINDOWS" else "/"
 
-    norm_filename_to_server_container = {}
-    norm_filename_to_client_container = {}
+    norm_filename_to_server_cache = BoundedCache("mapped_file_to_server", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
+    norm_filename_to_client_cache = BoundedCache("mapped_file_to_client", PYDEVD_PATHS_CACHE_MAX_ENTRIES)
 
     initial_paths = []
     initial_paths_with_end_sep = []
@@ -762,12 +787,7 @@ def setup_client_server_paths(paths):
     if DEBUG_CLIENT_SERVER_TRANSLATION:
         pydev_log.critical(
             "pydev debugger: paths_from_eclipse_to_python %s",
-            ", ".join(
-                [
-                    '"%s=>%s"' % (x[0], x[1])
-                    for x in paths_from_eclipse_to_python
-                ]
-            ),
+            ", ".join(['"%s=>%s"' % (x[0], x[1]) for x in paths_from_eclipse_to_python]),
         )
     # Fix things so that we always match the versions with a slash in the end first.
     initial_paths = initial_paths_with_end_sep + initial_paths
@@ -780,7 +800,7 @@ def setup_client_server_paths(paths):
         return
 
     # only setup translation functions if absolutely needed!
-    def _map_file_to_server(filename, cache=norm_filename_to_server_container):
+    def _map_file_to_server(filename, cache=norm_filename_to_server_cache.entries):
         # Eclipse will send the passed filename to be translated to the python process
         # So, this would be 'NormFileFromEclipseToPython'
         try:
@@ -831,10 +851,9 @@ def setup_client_server_paths(paths):
                     # step by the caller.
                     translated = absolute_path(translated)
 
-            cache[filename] = translated
-            return translated
+            return norm_filename_to_server_cache.set(filename, translated)
 
-    def _map_file_to_client(filename, cache=norm_filename_to_client_container):
+    def _map_file_to_client(filename, cache=norm_filename_to_client_cache.entries):
         # The result of this method will be passed to eclipse
         # So, this would be 'NormFileFromPythonToEclipse'
         try:
@@ -880,7 +899,7 @@ def setup_client_server_paths(paths):
 
             # The resulting path is not in the python process, so, we cannot do a normalize the path here,
             # only at the beginning of this method.
-            cache[filename] = (translated, path_mapping_applied)
+            norm_filename_to_client_cache.set(filename, (translated, path_mapping_applied))
 
             if translated not in _client_filename_in_utf8_to_source_reference:
                 if path_mapping_applied:
@@ -925,6 +944,13 @@ def get_abs_path_real_path_and_base_from_file(filename, NORM_PATHS_AND_BASE_CONT
             elif f.endswith("$py.class"):
                 f = f[: -len("$py.class")] + ".py"
 
+        paths_disk_cache = _paths_disk_cache
+        if paths_disk_cache is not None:
+            # Note: only absolute paths are saved (relative paths depend on the cwd/sys.path).
+            ret = paths_disk_cache.get_paths(f)
+            if ret is not None:
+                return _norm_paths_and_base_cache.set(filename, ret)
+
         abs_path, canonical_normalized_filename = _abs_and_canonical_path(f)
 
         try:
@@ -933,8 +959,9 @@ def get_abs_path_real_path_and_base_from_file(filename, NORM_PATHS_AND_BASE_CONT
             # Error during shutdown.
             i = max(f.rfind("/"), f.rfind("\\"))
             base = f[i + 1 :]
-        ret = abs_path, canonical_normalized_filename, base
-        NORM_PATHS_AND_BASE_CONTAINER[filename] = ret
+        ret = _norm_paths_and_base_cache.set(filename, (abs_path, canonical_normalized_filename, base))
+        if paths_disk_cache is not None and os.path.isabs(f):
+            paths_disk_cache.set_paths(f, ret)
         return ret
 
 
@@ -960,8 +987,7 @@ def get_abs_path_real_path_and_base_from_frame(frame, NORM_PATHS_AND_BASE_CONTAI
 
         ret = get_abs_path_real_path_and_base_from_file(f)
         # Also cache based on the frame.f_code.co_filename (if we had it inside build/bdist it can make a difference).
-        NORM_PATHS_AND_BASE_CONTAINER[frame.f_code.co_filename] = ret
-        return ret
+        return _norm_paths_and_base_cache.set(frame.f_code.co_filename, ret)
 
 
 def get_fullname(mod_name):
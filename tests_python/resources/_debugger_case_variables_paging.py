@@ -0,0 +1,10 @@
+def Call():
+    variable_for_test_list = list(range(1000))
+    variable_for_test_dict = dict((i, i) for i in range(1000))
+
+    all_vars_set = True  # Break here
+
+
+if __name__ == '__main__':
+    Call()
+    print('TEST SUCEEDED!')
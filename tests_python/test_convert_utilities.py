@@ -494,6 +494,56 @@ def test_source_mapping():
     assert source_mapping.map_to_client(filename, 12) == (filename, 12, False)
 
 
+def test_source_mapping_multiple_cells():
+    from _pydevd_bundle.pydevd_source_mapping import SourceMapping, SourceMappingEntry
+
+    changes = []
+    source_mapping = SourceMapping(on_source_mapping_changed=lambda: changes.append(1))
+
+    def create_mapping(filename, *entries):
+        mapping = []
+        for line, end_line, runtime_line, runtime_source in entries:
+            entry = SourceMappingEntry(line=line, end_line=end_line, runtime_line=runtime_line, runtime_source=runtime_source)
+            entry.source_filename = filename
+            mapping.append(entry)
+        return mapping
+
+    # The same cell may be mapped from multiple ranges of a file.
+    file1 = "c:\\temp\\file1.py" if IS_WINDOWS else "/temp/file1.py"
+    file2 = "c:\\temp\\file2.py" if IS_WINDOWS else "/temp/file2.py"
+    assert source_mapping.set_source_mapping(file1, create_mapping(file1, (20, 21, 3, "<cell1>"), (1, 2, 1, "<cell1>"))) == ""
+    assert source_mapping.set_source_mapping(file2, create_mapping(file2, (1, 5, 1, "<cell2>"))) == ""
+    assert len(changes) == 2
+
+    assert source_mapping.has_mapping_entry("<cell1>")
+    assert source_mapping.has_mapping_entry("<cell2>")
+    assert not source_mapping.has_mapping_entry("<cell3>")
+
+    # Note: the runtime range of the first entry is 1-4 (so, the first one wins in 3-4).
+    assert source_mapping.map_to_client("<cell1>", 1) == (file1, 1, True)
+    assert source_mapping.map_to_client("<cell1>", 4) == (file1, 4, True)
+    assert source_mapping.map_to_client("<cell1>", 5) == (file1, 22, True)
+    assert source_mapping.map_to_client("<cell1>", 100) == ("<cell1>", 100, False)
+    assert source_mapping.map_to_client("<cell2>", 2) == (file2, 2, True)
+    assert source_mapping.map_to_client("<cell3>", 2) == ("<cell3>", 2, False)
+
+    # Changing the mapping of a file only invalidates the cached translations of its cells.
+    assert source_mapping.set_source_mapping(file2, create_mapping(file2, (10, 15, 1, "<cell3>"))) == ""
+    assert sorted(source_mapping._cache) == ["<cell1>"]
+    assert not source_mapping.has_mapping_entry("<cell2>")
+    assert source_mapping.map_to_client("<cell2>", 2) == ("<cell2>", 2, False)
+    assert source_mapping.map_to_client("<cell3>", 2) == (file2, 11, True)
+
+    # Conflicts are still reported.
+    assert "Cannot apply mapping" in source_mapping.set_source_mapping(file1, create_mapping(file1, (1, 2, 1, "<cell3>")))
+    assert source_mapping.map_to_client("<cell3>", 2) == (file2, 11, True)
+
+    # The mapping can be changed again when a cell has multiple entries.
+    assert source_mapping.set_source_mapping(file1, []) == ""
+    assert not source_mapping.has_mapping_entry("<cell1>")
+    assert source_mapping.map_to_client("<cell1>", 1) == ("<cell1>", 1, False)
+
+
 @pytest.mark.skipif(IS_WINDOWS, reason="Linux/Mac-only test")
 def test_mapping_conflict_to_client():
     import pydevd_file_utils
@@ -560,3 +610,79 @@ _MAPPING_CONFLICT_TO_SERVER = [
     {"remoteRoot": "/var/home/p3", "localRoot": "/opt/v2/path"},
     {"remoteRoot": "/var/home/p4", "localRoot": "/opt/v2/pathsomething"},
 ]
+
+
+def test_bounded_cache():
+    from _pydevd_bundle.pydevd_bounded_cache import BoundedCache, get_caches_stats
+
+    cache = BoundedCache("test_bounded_cache", 16)
+    entries = cache.entries
+    for i in range(16):
+        assert cache.set(i, str(i)) == str(i)
+    assert len(entries) == 16
+
+    # Updating an existing entry doesn't evict anything.
+    cache.set(0, "0")
+    assert len(entries) == 16
+
+    # When the limit is reached the oldest entries are evicted in a batch.
+    cache.set(16, "16")
+    assert sorted(entries) == list(range(2, 17))
+    assert entries[16] == "16"
+
+    for i in range(100, 1000):
+        cache.set(i, str(i))
+        assert len(entries) <= 16
+    assert 999 in entries
+
+    stats = [s for s in get_caches_stats() if s["name"] == "test_bounded_cache"]
+    assert stats == [{"name": "test_bounded_cache", "max_entries": 16, "entries": len(entries), "sets": 918, "evictions": 918 - 16}]
+
+    cache.clear()
+    assert not entries
+
+    unbounded = BoundedCache("test_unbounded_cache", 0)
+    for i in range(1000):
+        unbounded.set(i, i)
+    assert len(unbounded.entries) == 1000
+
+
+def test_bounded_cache_threads():
+    from _pydevd_bundle.pydevd_bounded_cache import BoundedCache
+    import threading
+
+    cache = BoundedCache("test_bounded_cache_threads", 100)
+    entries = cache.entries
+
+    def worker(thread_i):
+        for i in range(5000):
+            key = (thread_i, i)
+            cache.set(key, i)
+            entries.get((thread_i, i - 50))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(entries) <= 100
+    assert cache.sets == 20000
+
+
+def test_file_utils_caches_bounded(monkeypatch):
+    import pydevd_file_utils
+
+    monkeypatch.setattr(pydevd_file_utils._normcase_cache, "max_entries", 50)
+    monkeypatch.setattr(pydevd_file_utils._norm_paths_and_base_cache, "max_entries", 50)
+    monkeypatch.setattr(pydevd_file_utils._norm_paths_cache, "max_entries", 50)
+
+    # i.e.: code exec'd with unique synthetic filenames.
+    for i in range(500):
+        filename = "<string-%s>" % (i,)
+        assert pydevd_file_utils.get_abs_path_real_path_and_base_from_file(filename) == (filename, filename, filename)
+        filename = os.path.abspath("synthetic_%s.py" % (i,))
+        assert pydevd_file_utils.get_abs_path_real_path_and_base_from_file(filename)[0] == filename
+
+    assert len(pydevd_file_utils._normcase_cache.entries) <= 50
+    assert len(pydevd_file_utils.NORM_PATHS_AND_BASE_CONTAINER) <= 50
+    assert len(pydevd_file_utils.NORM_PATHS_CONTAINER) <= 50
@@ -1,5 +1,6 @@
 # coding: utf-8
 from collections import namedtuple
+import base64
 import json
 from os.path import normcase
 import os.path
@@ -345,10 +346,10 @@ class JsonFacade(object):
 
         return _JsonHit(thread_id=thread_id, frame_id=frame_id, stack_trace_response=stack_trace_response)
 
-    def get_variables_response(self, variables_reference, fmt=None, success=True):
+    def get_variables_response(self, variables_reference, fmt=None, success=True, **kwargs):
         assert variables_reference < MAX_EXPECTED_ID
         variables_request = self.write_request(
-            pydevd_schema.VariablesRequest(pydevd_schema.VariablesArguments(variables_reference, format=fmt))
+            pydevd_schema.VariablesRequest(pydevd_schema.VariablesArguments(variables_reference, format=fmt, **kwargs))
         )
         variables_response = self.wait_for_response(variables_request)
         assert variables_response.success == success
@@ -531,10 +532,8 @@ class JsonFacade(object):
         assert response.success == success
         return response
 
-    def write_initialize(self, success=True):
-        arguments = InitializeRequestArguments(
-            adapterID="pydevd_test_case",
-        )
+    def write_initialize(self, success=True, **kwargs):
+        arguments = InitializeRequestArguments(adapterID="pydevd_test_case", **kwargs)
         response = self.wait_for_response(self.write_request(InitializeRequest(arguments)))
         assert response.success == success
         if success:
@@ -767,6 +766,31 @@ def test_case_process_event(case_setup_dap):
         writer.finished_ok = True
 
 
+def test_startup_profile(case_setup_dap, tmpdir):
+    profile_file = str(tmpdir.join("startup_profile.jsonl"))
+
+    def get_environ(self):
+        env = os.environ.copy()
+        env["PYDEVD_STARTUP_PROFILE"] = profile_file
+        return env
+
+    with case_setup_dap.test_file("_debugger_case_print.py", get_environ=get_environ) as writer:
+        json_facade = JsonFacade(writer)
+
+        json_facade.write_launch()
+        json_facade.write_make_initial_run()
+
+        writer.finished_ok = True
+
+    with open(profile_file, "r", encoding="utf-8") as stream:
+        reports = [json.loads(line) for line in stream.read().splitlines()]
+
+    assert len(reports) == 1
+    name_to_phase = dict((phase["name"], phase) for phase in reports[0]["phases"])
+    for name in ("import pydevd", "PyDB.__init__", "connect", "wait_for_ready_to_run", "patch_threads", "start_auxiliary_daemon_threads"):
+        assert name_to_phase[name]["duration"] is not None, name
+
+
 def test_case_json_change_breaks(case_setup_dap):
     with case_setup_dap.test_file("_debugger_case_change_breaks.py") as writer:
         json_facade = JsonFacade(writer)
@@ -3245,6 +3269,46 @@ def test_hex_variables(case_setup_dap):
         writer.finished_ok = True
 
 
+def test_variables_paging(case_setup_dap):
+    with case_setup_dap.test_file("_debugger_case_variables_paging.py") as writer:
+        json_facade = JsonFacade(writer)
+        json_facade.write_initialize(supportsVariablePaging=True)
+
+        writer.write_add_breakpoint(writer.get_line_index_with_content("Break here"))
+        json_facade.write_make_initial_run()
+
+        json_hit = json_facade.wait_for_thread_stopped()
+        name_to_var = json_facade.get_locals_name_to_var(json_hit.frame_id)
+
+        variable_for_test_list = name_to_var["variable_for_test_list"]
+        assert variable_for_test_list.indexedVariables == 1000
+        variables_reference = variable_for_test_list.variablesReference
+
+        variables = json_facade.get_variables_response(variables_reference, filter="named").body.variables
+        assert len(variables) == variable_for_test_list.namedVariables
+        assert variables[-1]["name"] == "len()"
+
+        variables = json_facade.get_variables_response(variables_reference, filter="indexed", start=500, count=3).body.variables
+        assert [(v["name"], v["value"], v["evaluateName"]) for v in variables] == [
+            ("500", "500", "variable_for_test_list[500]"),
+            ("501", "501", "variable_for_test_list[501]"),
+            ("502", "502", "variable_for_test_list[502]"),
+        ]
+
+        variable_for_test_dict = name_to_var["variable_for_test_dict"]
+        assert variable_for_test_dict.indexedVariables == 1000
+        variables_reference = variable_for_test_dict.variablesReference
+        values = []
+        for start in range(0, 1000, 100):
+            variables = json_facade.get_variables_response(variables_reference, filter="indexed", start=start, count=100).body.variables
+            values.extend(int(v["value"]) for v in variables)
+        assert values == list(range(1000))
+
+        json_facade.write_continue()
+
+        writer.finished_ok = True
+
+
 def test_stopped_event(case_setup_dap):
     with case_setup_dap.test_file("_debugger_case_print.py") as writer:
         json_facade = JsonFacade(writer)
@@ -3672,6 +3736,33 @@ def test_stack_levels(case_setup_dap):
         writer.finished_ok = True
 
 
+def test_stack_levels_window_variables(case_setup_dap):
+    with case_setup_dap.test_file("_debugger_case_deep_stacks.py") as writer:
+        json_facade = JsonFacade(writer)
+
+        json_facade.write_set_breakpoints(writer.get_line_index_with_content("Break here"))
+
+        json_facade.write_make_initial_run()
+        json_hit = json_facade.wait_for_thread_stopped()
+
+        # Only a window in the middle of the stack is requested (and its frame variables
+        # must still be available).
+        stack_trace_request = json_facade.write_request(
+            pydevd_schema.StackTraceRequest(pydevd_schema.StackTraceArguments(threadId=json_hit.thread_id, startFrame=50, levels=2))
+        )
+        stack_trace_response = json_facade.wait_for_response(stack_trace_request)
+        stack_frames = stack_trace_response.body.stackFrames
+        assert stack_trace_response.body.totalFrames > 100
+        assert [stack_frame["name"] for stack_frame in stack_frames] == ["method1", "method2"]
+
+        for stack_frame, n in zip(stack_frames, (50, 51)):
+            assert json_facade.get_local_var(stack_frame["id"], "n").value == str(n)
+
+        json_facade.write_continue()
+
+        writer.finished_ok = True
+
+
 def test_breakpoint_adjustment(case_setup_dap):
     with case_setup_dap.test_file("_debugger_case_adjust_breakpoint.py") as writer:
         json_facade = JsonFacade(writer)
@@ -6127,6 +6218,106 @@ def test_debugger_case_deadlock_notify_evaluate_timeout(case_setup_dap, pyfile):
         writer.finished_ok = True
 
 
+def test_variables_time_budget(case_setup_dap, pyfile):
+    @pyfile
+    def case_slow_repr():
+        import time
+
+        class SlowRepr(object):
+            def __repr__(self):
+                time.sleep(0.3)
+                return "SlowRepr()"
+
+        a_slow = SlowRepr()
+        b_slow = SlowRepr()
+        c_fast = 1
+        print("TEST SUCEEDED!")  # Break here
+
+    def get_environ(self):
+        env = os.environ.copy()
+        env["PYDEVD_VARIABLES_TIME_BUDGET"] = "0.2"
+        return env
+
+    with case_setup_dap.test_file(case_slow_repr, get_environ=get_environ) as writer:
+        json_facade = JsonFacade(writer)
+        json_facade.write_launch(justMyCode=False)
+        json_facade.write_set_breakpoints(writer.get_line_index_with_content("Break here"))
+
+        json_facade.write_make_initial_run()
+        json_hit = json_facade.wait_for_thread_stopped()
+
+        name_to_var = json_facade.get_locals_name_to_var(json_hit.frame_id)
+
+        # The first value is computed (exceeding the budget) and the others are lazy.
+        assert name_to_var["a_slow"].value == "SlowRepr()"
+        for name in ("b_slow", "c_fast"):
+            variable = name_to_var[name]
+            assert variable.value == "..."
+            assert variable.presentationHint.lazy
+            assert variable.evaluateName == name
+
+            # The value is provided as the child of the lazy variable.
+            children = json_facade.get_variables_response(variable.variablesReference).body.variables
+            assert len(children) == 1
+            assert children[0]["name"] == name
+            assert children[0]["value"] == {"b_slow": "SlowRepr()", "c_fast": "1"}[name]
+
+        json_facade.write_continue()
+
+        writer.finished_ok = True
+
+
+def test_evaluate_streamed_value(case_setup_dap, pyfile):
+    @pyfile
+    def case_big_value():
+        big_str = "".join(str(i) for i in range(2000))
+        small_list = [1, 2]
+        print("TEST SUCEEDED!")  # Break here
+
+    def get_environ(self):
+        env = os.environ.copy()
+        env["PYDEVD_STREAM_VALUE_CHUNK_SIZE"] = "1000"
+        env["PYDEVD_STREAM_VALUE_MAX_PENDING_CHUNKS"] = "2"
+        return env
+
+    with case_setup_dap.test_file(case_big_value, get_environ=get_environ) as writer:
+        json_facade = JsonFacade(writer)
+        json_facade.write_launch(justMyCode=False)
+        json_facade.write_set_breakpoints(writer.get_line_index_with_content("Break here"))
+
+        json_facade.write_make_initial_run()
+        json_hit = json_facade.wait_for_thread_stopped()
+
+        # Small values are sent in the response.
+        response = json_facade.evaluate("small_list", json_hit.frame_id, context="clipboard", fmt={"stream": True})
+        assert response.body.result == "[1, 2]"
+        assert response.body.variablesReference
+
+        request = json_facade.evaluate("big_str", json_hit.frame_id, context="clipboard", fmt={"stream": True}, wait_for_response=False)
+        chunks = []
+        while True:
+            msg = json_facade.wait_for_json_message(
+                (pydevd_schema.PydevdValueChunkEvent, pydevd_schema.EvaluateResponse),
+                lambda msg: getattr(msg, "request_seq", None) == request.seq or getattr(msg, "event", None) == "pydevdValueChunk",
+            )
+            if msg.type == "response":
+                break
+            assert msg.body.requestSeq == request.seq
+            assert msg.body.chunkSeq == len(chunks)
+            chunks.append(msg.body.data)
+
+        body = msg.body.to_dict()
+        assert body["result"] == ""
+        assert body["pydevdValueChunks"] == len(chunks)
+        assert len(chunks) > 5
+        assert all(len(chunk) == 1000 for chunk in chunks[:-1])
+        assert "".join(chunks) == repr("".join(str(i) for i in range(2000)))
+
+        json_facade.write_continue()
+
+        writer.finished_ok = True
+
+
 def test_debugger_case_deadlock_interrupt_thread(case_setup_dap, pyfile):
     @pyfile
     def case_infinite_evaluate():
@@ -6590,6 +6781,71 @@ def test_pandas(case_setup_dap, pyfile):
         writer.finished_ok = True
 
 
+@pytest.mark.skipif(pandas is None, reason="Pandas not installed.")
+def test_pydevd_get_array(case_setup_dap, pyfile):
+    @pyfile
+    def pandas_mod():
+        import pandas as pd
+        import numpy as np
+
+        df = pd.DataFrame({"ints": np.arange(10), "floats": np.arange(10) / 2}, index=["row%s" % i for i in range(10)])
+        df_str = pd.DataFrame({"strs": ["a", "b", "c"], "ints": [1, 2, 3]})
+
+        print("TEST SUCEEDED")  # Break here
+
+    with case_setup_dap.test_file(pandas_mod) as writer:
+        json_facade = JsonFacade(writer)
+        json_facade.write_launch(justMyCode=False)
+
+        bp = writer.get_line_index_with_content("Break here")
+        json_facade.write_set_breakpoints([bp])
+
+        json_facade.write_make_initial_run()
+
+        json_hit = json_facade.wait_for_thread_stopped()
+        name_to_var = json_facade.get_locals_name_to_var(json_hit.frame_id)
+
+        request = json_facade.write_request(
+            pydevd_schema.PydevdGetArrayRequest(
+                pydevd_schema.PydevdGetArrayArguments(name_to_var["df"].variablesReference, rowOffset=2, rowCount=3)
+            )
+        )
+        response = json_facade.wait_for_response(request)
+        assert response.success
+        body = response.body.to_dict()
+        assert (body["totalRows"], body["totalColumns"], body["rowOffset"], body["rows"]) == (10, 2, 2, 3)
+        assert body["rowLabels"] == ["row2", "row3", "row4"]
+        import numpy
+
+        assert [
+            (column["name"], numpy.frombuffer(base64.b64decode(column["data"]), column["dtype"]).tolist()) for column in body["columns"]
+        ] == [("ints", [2, 3, 4]), ("floats", [1.0, 1.5, 2.0])]
+
+        # Object columns fall back to the xml.
+        writer.reader_thread.accept_xml_messages = True
+        request = json_facade.write_request(
+            pydevd_schema.PydevdGetArrayRequest(pydevd_schema.PydevdGetArrayArguments(name_to_var["df_str"].variablesReference))
+        )
+        response = json_facade.wait_for_response(request)
+        assert response.success
+        assert '<arraydata rows="3" cols="2"/>' in response.body.to_dict()["xml"]
+
+        # The rows not requested in the fallback are all the rows after the offset.
+        request = json_facade.write_request(
+            pydevd_schema.PydevdGetArrayRequest(
+                pydevd_schema.PydevdGetArrayArguments(name_to_var["df_str"].variablesReference, rowOffset=1, columnCount=1)
+            )
+        )
+        response = json_facade.wait_for_response(request)
+        assert response.success
+        xml = response.body.to_dict()["xml"]
+        assert '<arraydata rows="2" cols="1"/>' in xml
+        assert "str%3A b" in xml and "str%3A c" in xml
+
+        json_facade.write_continue()
+        writer.finished_ok = True
+
+
 @pytest.mark.skipif(not IS_PY38_OR_GREATER, reason="Python 3.8 onwards required for test.")
 def test_same_lineno_and_filename(case_setup_dap, pyfile):
     @pyfile
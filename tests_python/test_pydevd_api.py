@@ -65,3 +65,97 @@ c = 3
     api.remove_all_breakpoints(py_db, filename_replaced)
     assert not py_db.breakpoints
     assert not py_db.file_to_id_to_line_breakpoint
+
+
+def test_pydevd_api_breakpoints_mtime_per_file(tmpdir):
+    from _pydevd_bundle.pydevd_api import PyDevdAPI
+    from _pydevd_bundle.pydevd_constants import PYDEVD_USE_SYS_MONITORING
+    from pydevd import PyDB
+    import pydevd_file_utils
+
+    api = PyDevdAPI()
+
+    py_db = PyDB(set_as_global=False)
+
+    filenames = []
+    for basename in ("file_a.py", "file_b.py"):
+        f = tmpdir.join(basename)
+        f.write_text("a = 1\nb = 2\n", "utf-8")
+        filenames.append(str(f))
+
+    canonical_a, canonical_b = [pydevd_file_utils.canonical_normalized_path(f) for f in filenames]
+    initial_mtime = py_db.mtime
+
+    for breakpoint_id in (0, 1):
+        result = api.add_breakpoint(
+            py_db,
+            filenames[0],
+            breakpoint_type="python-line",
+            breakpoint_id=breakpoint_id,
+            line=breakpoint_id + 1,
+            condition=None,
+            func_name="None",
+            expression=None,
+            suspend_policy="NONE",
+            hit_condition="",
+            is_logpoint=False,
+        )
+        assert not result.error_code
+
+    # Only the file with the changed breakpoints needs to be re-evaluated.
+    assert py_db.file_to_breakpoints_mtime[canonical_a] == 2
+    assert canonical_b not in py_db.file_to_breakpoints_mtime
+    if PYDEVD_USE_SYS_MONITORING:
+        assert py_db.mtime == initial_mtime
+
+    py_db.ready_to_run = True
+    api.remove_breakpoint(py_db, filenames[0], "python-line", 0)
+    assert py_db.file_to_breakpoints_mtime[canonical_a] > 2
+    last_file_mtime = py_db.file_to_breakpoints_mtime[canonical_a]
+    api.remove_all_breakpoints(py_db, filenames[0])
+    assert py_db.file_to_breakpoints_mtime[canonical_a] > last_file_mtime
+    assert canonical_b not in py_db.file_to_breakpoints_mtime
+    if PYDEVD_USE_SYS_MONITORING:
+        assert py_db.mtime == initial_mtime
+
+    # Removing all the breakpoints affects every file.
+    api.add_breakpoint(py_db, filenames[1], "python-line", 2, 1, None, "None", None, "NONE", "", False)
+    api.remove_all_breakpoints(py_db, "*")
+    assert py_db.mtime > initial_mtime
+
+
+def test_pydevd_api_breakpoint_compile_errors(tmpdir):
+    from _pydevd_bundle.pydevd_api import PyDevdAPI
+    from _pydevd_bundle.pydevd_breakpoints import LineBreakpoint
+    from pydevd import PyDB
+
+    api = PyDevdAPI()
+
+    py_db = PyDB(set_as_global=False)
+
+    f = tmpdir.join("file_a.py")
+    f.write_text("a = 1\nb = 2\n", "utf-8")
+    filename = str(f)
+
+    result = api.add_breakpoint(py_db, filename, "python-line", 0, 1, "a ==", "None", None, "NONE", "@HIT@ >", False)
+    assert result.error_code == api.ADD_BREAKPOINT_INVALID_EXPRESSION
+    msg = "".join(result.compile_errors)
+    assert "Error compiling breakpoint condition: a ==" in msg
+    assert "Error compiling breakpoint hit condition: @HIT@ >" in msg
+    assert "SyntaxError" in msg
+
+    result = api.add_breakpoint(py_db, filename, "python-line", 1, 2, " a == 1", "None", None, "NONE", "@HIT@ == 2", False)
+    assert result.error_code == api.ADD_BREAKPOINT_NO_ERROR
+
+    # Compiled only once, when the breakpoint is created.
+    breakpoint = LineBreakpoint(2, 2, "a == 1", "None", None, "NONE", hit_condition="@HIT@ == 2")
+    assert not breakpoint.compile_errors
+    assert eval(breakpoint.condition_code, {"a": 1})
+
+    class DummyFrame(object):
+        f_globals = {}
+        f_locals = {"a": 1}
+
+    frame = DummyFrame()
+    assert [breakpoint.handle_hit_condition(frame) for _i in range(3)] == [False, True, False]
+    assert frame.f_locals == {"a": 1}
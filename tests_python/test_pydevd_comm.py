@@ -0,0 +1,63 @@
+class _DummySocket(object):
+    def __init__(self):
+        self.sent = []
+        self.after_send_called_with = []
+
+    def sendall(self, as_bytes):
+        self.sent.append(as_bytes)
+
+    def shutdown(self, *args):
+        pass
+
+
+def test_writer_thread_batches_queued_commands():
+    from _pydevd_bundle.pydevd_comm import WriterThread
+    from _pydevd_bundle.pydevd_comm_constants import CMD_EXIT, CMD_WRITE_TO_CONSOLE
+    from _pydevd_bundle.pydevd_net_command import NetCommand
+    from pydevd import PyDB
+
+    py_db = PyDB(set_as_global=False)
+    sock = _DummySocket()
+    writer = WriterThread(sock, py_db)
+
+    commands = [NetCommand(CMD_WRITE_TO_CONSOLE, 0, "output %s" % (i,)) for i in range(3)]
+    commands[1].call_after_send(lambda s: s.after_send_called_with.append(len(s.sent)))
+    commands.append(NetCommand(CMD_WRITE_TO_CONSOLE, 0, "output 3"))
+    commands.append(NetCommand(CMD_EXIT, 0, ""))
+    for cmd in commands:
+        writer.add_command(cmd)
+
+    writer._on_run()
+
+    # The batch is finished at the command with the after send callback (which is called
+    # right after its contents are sent) and then the remaining commands are sent.
+    assert len(sock.sent) == 2
+    assert sock.after_send_called_with == [1]
+    assert sock.sent[0] == b"".join(b"".join(cmd.get_chunks_to_send()) for cmd in commands[:2])
+    assert sock.sent[1] == b"".join(b"".join(cmd.get_chunks_to_send()) for cmd in commands[2:])
+
+    stats = writer.get_stats()
+    assert stats["commands_sent"] == 5
+    assert stats["batches_sent"] == 2
+    assert stats["bytes_sent"] == sum(len(b) for b in sock.sent)
+    assert stats["max_queue_depth"] == 5
+
+
+def test_writer_thread_max_batch_bytes():
+    from _pydevd_bundle.pydevd_comm import WriterThread
+    from _pydevd_bundle.pydevd_comm_constants import CMD_EXIT, CMD_WRITE_TO_CONSOLE
+    from _pydevd_bundle.pydevd_net_command import NetCommand
+    from pydevd import PyDB
+
+    py_db = PyDB(set_as_global=False)
+    sock = _DummySocket()
+    writer = WriterThread(sock, py_db)
+    writer.max_batch_bytes = 1
+
+    for i in range(3):
+        writer.add_command(NetCommand(CMD_WRITE_TO_CONSOLE, 0, "output %s" % (i,)))
+    writer.add_command(NetCommand(CMD_EXIT, 0, ""))
+    writer._on_run()
+
+    assert len(sock.sent) == 4
+    assert writer.get_stats()["batches_sent"] == 4
@@ -140,6 +140,40 @@ def test_in_project_roots(tmpdir):
         sys.path.remove(str(site_packages))
 
 
+def test_in_project_roots_deepest_root(tmpdir):
+    from _pydevd_bundle.pydevd_filtering import FilesFiltering
+    import os.path
+
+    files_filtering = FilesFiltering()
+    base = str(tmpdir)
+
+    def join(*parts):
+        return os.path.join(base, *parts)
+
+    files_filtering.set_project_roots([join("a"), join("a", "b", "c"), join("same")])
+    files_filtering.set_library_roots([join("a", "b"), join("a", "b", "c", "d"), join("same")])
+
+    assert files_filtering.in_project_roots(join("a", "f.py"))
+    assert not files_filtering.in_project_roots(join("a", "b", "f.py"))
+    assert files_filtering.in_project_roots(join("a", "b", "c", "f.py"))
+    assert files_filtering.in_project_roots(join("a", "b", "c"))
+    assert not files_filtering.in_project_roots(join("a", "b", "c", "d", "f.py"))
+    assert not files_filtering.in_project_roots(join("a", "b", "cd", "f.py"))
+    assert not files_filtering.in_project_roots(join("same", "f.py"))  # Library wins if the same root is in both.
+    assert not files_filtering.in_project_roots(join("another", "f.py"))
+
+    # The roots must be updated when changed.
+    files_filtering.set_library_roots([])
+    assert files_filtering.in_project_roots(join("a", "b", "c", "d", "f.py"))
+    assert files_filtering.in_project_roots(join("same", "f.py"))
+
+    files_filtering.set_project_roots([])
+    assert files_filtering.in_project_roots(join("another", "f.py"))
+    files_filtering.set_library_roots([join("another")])
+    assert not files_filtering.in_project_roots(join("another", "f.py"))
+    assert files_filtering.in_project_roots(join("a", "f.py"))
+
+
 def test_filtering(tmpdir):
     from _pydevd_bundle.pydevd_filtering import FilesFiltering
     from _pydevd_bundle.pydevd_filtering import ExcludeFilter
@@ -235,6 +269,48 @@ def test_glob_matching():
         assert glob_matches_path(build("/"), r"*", sep, altsep)
 
 
+def test_exclude_filters_matcher_same_as_glob_matching():
+    from _pydevd_bundle.pydevd_filtering import glob_matches_path, _ExcludeFiltersMatcher, ExcludeFilter
+
+    patterns = ["", "*", "**", "/*", "/**", "**/*", "**/a", "**/d", "**/c/**", "**/c/", "/a/**/c/*.py", "/a/**/c/so?.py"]
+    patterns += ["/a/**/[!b]/*", "/a/[a-c]/**", "/*/b/*/d", r"**\d", r"c:\**\d", "d:/**", "**/*.p[xy]", "**/[]", "**/[.-0]/**"]
+    paths = ["", "/", "/a", "/a/b", "/a/b/c", "/a/b/c/", "/a/b/c/d", "/a/b/c/d.py", "/a/b/c/some.py", "/a/b/c/d.pyx", "/a/b/./d"]
+    for sep, altsep in (("\\", "/"), ("/", None)):
+        for path in paths:
+            if sep == "\\":
+                path = ("c:" + path).replace("/", "\\")
+            for pattern in patterns:
+                matcher = _ExcludeFiltersMatcher([ExcludeFilter(pattern, True, True)], sep, altsep)
+                expected = True if glob_matches_path(path, pattern, sep, altsep) else None
+                assert matcher.get_exclude(path, "") is expected, "Mismatch matching %s with %s" % (path, pattern)
+
+
+def test_exclude_filters_first_match_wins():
+    from _pydevd_bundle.pydevd_filtering import FilesFiltering, ExcludeFilter
+
+    files_filtering = FilesFiltering()
+    files_filtering.set_exclude_filters(
+        [
+            ExcludeFilter("/foo/project/included/**", False, True),
+            ExcludeFilter("my_module.sub", False, False),
+            ExcludeFilter("**/project/**", True, True),
+            ExcludeFilter("my_module", True, False),
+            ExcludeFilter("**/*.py", False, True),
+            ExcludeFilter("other", True, False),
+        ]
+    )
+    assert files_filtering.exclude_by_filter("/foo/project/included/a.py", "my_module") is False
+    assert files_filtering.exclude_by_filter("/foo/project/a.py", "my_module.sub.a") is False
+    assert files_filtering.exclude_by_filter("/foo/project/a.py", "my_module.subpackage") is True
+    assert files_filtering.exclude_by_filter("/foo/a.py", "my_module.a") is True
+    assert files_filtering.exclude_by_filter("/foo/a.py", "my_module_a") is False
+    assert files_filtering.exclude_by_filter("/foo/a.txt", "other.a") is True
+    assert files_filtering.exclude_by_filter("/foo/a.txt", "another") is None
+
+    files_filtering.set_exclude_filters([])
+    assert files_filtering.exclude_by_filter("/foo/project/a.py", "my_module") is None
+
+
 def test_rules_to_exclude_filter(tmpdir):
     from _pydevd_bundle.pydevd_process_net_command_json import _convert_rules_to_exclude_filters
     from _pydevd_bundle.pydevd_filtering import ExcludeFilter
@@ -270,3 +346,139 @@ def test_rules_to_exclude_filter(tmpdir):
         ExcludeFilter(name="bar.foo", exclude=False, is_path=False),
         ExcludeFilter(name="bar", exclude=True, is_path=False),
     ]
+
+
+def test_filtering_disk_cache(tmpdir, monkeypatch):
+    from _pydevd_bundle import pydevd_filtering_cache
+    from _pydevd_bundle.pydevd_filtering import FilesFiltering, ExcludeFilter
+
+    cache_dir = tmpdir.join("cache")
+    monkeypatch.setattr(pydevd_filtering_cache, "PYDEVD_FILTERING_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(pydevd_filtering_cache, "_fingerprint_to_cache", {})
+    monkeypatch.setattr(pydevd_filtering_cache.atexit, "register", lambda func: None)
+
+    project_dir = tmpdir.mkdir("project")
+    library_dir = tmpdir.mkdir("library")
+    project_file = project_dir.join("my_code.py")
+    project_file.write("a = 1")
+    library_file = library_dir.join("lib.py")
+    library_file.write("b = 1")
+    project_file = str(project_file)
+    library_file = str(library_file)
+
+    def create_files_filtering():
+        files_filtering = FilesFiltering()
+        files_filtering.set_project_roots([str(project_dir)])
+        files_filtering.set_library_roots([str(library_dir)])
+        files_filtering.set_exclude_filters([ExcludeFilter("**/lib.py", True, True)])
+        return files_filtering
+
+    files_filtering = create_files_filtering()
+    assert files_filtering.in_project_roots(project_file)
+    assert not files_filtering.in_project_roots(library_file)
+    assert files_filtering.exclude_by_filter(library_file, None) is True
+    assert files_filtering.exclude_by_filter(project_file, None) is None
+    pydevd_filtering_cache.flush_all()
+    assert len(cache_dir.listdir()) == 1
+
+    # Simulate a new process (the values must now come from the file).
+    monkeypatch.setattr(pydevd_filtering_cache, "_fingerprint_to_cache", {})
+    files_filtering = create_files_filtering()
+
+    def uncached(*args):
+        raise AssertionError("Should come from the cache.")
+
+    files_filtering._in_project_roots = uncached
+    files_filtering._exclude_by_filter = uncached
+    assert files_filtering.in_project_roots(project_file)
+    assert not files_filtering.in_project_roots(library_file)
+    assert files_filtering.exclude_by_filter(library_file, None) is True
+    assert files_filtering.exclude_by_filter(project_file, None) is None
+
+    # Once the file changes the entry is no longer valid (so, it's computed again).
+    with open(project_file, "a") as stream:
+        stream.write("\nb = 2")
+    del files_filtering._in_project_roots
+    original_in_project_roots = files_filtering._in_project_roots
+    computed = []
+
+    def in_project_roots_computed(filename):
+        computed.append(filename)
+        return original_in_project_roots(filename)
+
+    files_filtering._in_project_roots = in_project_roots_computed
+    assert files_filtering.in_project_roots(project_file)
+    assert computed == [project_file]
+    assert not files_filtering.in_project_roots(library_file)
+    assert computed == [project_file]
+    del files_filtering._in_project_roots
+
+    # Changing the settings uses another file.
+    files_filtering.set_project_roots([str(library_dir)])
+    files_filtering.set_library_roots([str(project_dir)])
+    assert files_filtering.in_project_roots(library_file)
+    pydevd_filtering_cache.flush_all()
+    assert len(cache_dir.listdir()) == 2
+
+
+def test_filtering_disk_cache_after_fork(tmpdir, monkeypatch):
+    from _pydevd_bundle import pydevd_filtering_cache
+
+    cache = pydevd_filtering_cache.FilteringDiskCache(str(tmpdir.join("fork.cache")))
+    monkeypatch.setattr(pydevd_filtering_cache, "_fingerprint_to_cache", {"fingerprint": cache})
+    f = tmpdir.join("a.py")
+    f.write("")
+    cache.set_in_project(str(f), True)
+    assert cache.get_in_project(str(f)) is True
+
+    # The entries pending in the parent are not written again by the forked process.
+    pydevd_filtering_cache.after_fork()
+    assert cache.get_in_project(str(f)) is None
+    cache.flush()
+    assert not tmpdir.join("fork.cache").exists()
+
+
+def test_filtering_disk_cache_paths(tmpdir, monkeypatch):
+    from _pydevd_bundle import pydevd_filtering_cache
+
+    cache = pydevd_filtering_cache.FilteringDiskCache(str(tmpdir.join("paths.cache")))
+    files = []
+    for i in range(20):
+        f = tmpdir.join("ação_%s.py" % (i,))
+        f.write("")
+        files.append(str(f))
+        cache.set_paths(str(f), (str(f), str(f).lower(), "ação_%s.py" % (i,)))
+
+    cache.set_paths(str(tmpdir.join("does_not_exist.py")), ("a", "b", "c"))
+    cache.flush()
+
+    cache = pydevd_filtering_cache.FilteringDiskCache(str(tmpdir.join("paths.cache")))
+    for i, f in enumerate(files):
+        assert cache.get_paths(f) == (f, f.lower(), "ação_%s.py" % (i,))
+        assert cache.get_in_project(f) is None
+    assert cache.get_paths(str(tmpdir.join("does_not_exist.py"))) is None
+
+    # New entries are merged with the existing ones.
+    cache.set_in_project(files[0], True)
+    cache.flush()
+    cache = pydevd_filtering_cache.FilteringDiskCache(str(tmpdir.join("paths.cache")))
+    assert cache.get_in_project(files[0]) is True
+    assert cache.get_paths(files[0]) == (files[0], files[0].lower(), "ação_0.py")
+    assert cache.get_paths(files[1]) == (files[1], files[1].lower(), "ação_1.py")
+
+
+def test_translate_glob_part_same_as_fnmatch():
+    import fnmatch
+    import re
+    from _pydevd_bundle.pydevd_filtering import _translate_glob_part
+
+    patterns = ["", "*", "**", "?", "a*", "*.py", "*.p[xy]", "a*b*c", "so?.py", "[abc]", "[!abc]", "[a-c]", "[!a-c]*"]
+    patterns += ["[]", "[!]", "[]]", "[!]]", "[", "a[", "[a-]", "[-a]", "[c-a]", "[a-cx-z]", "[.-0]", "[\\]", "[^a]", "[&&]", "[~|]"]
+    patterns += ["a.b", "a+b", "(a)", "$a^", "{a,b}"]
+    names = ["", "a", "b", "c", "x", "-", "]", "[", "!", "^", "&", "\\", "a.b", "a+b", "(a)", "$a^", "{a,b}", "ab", "abc", "axbyc"]
+    names += ["some.py", "d.py", "d.pyx", "d.px", "a[", "/"]
+    for pattern in patterns:
+        regex = re.compile(_translate_glob_part(pattern, "/"))
+        for name in names:
+            expected = fnmatch.fnmatchcase(name, pattern) and "/" not in name
+            assert bool(regex.fullmatch(name)) == expected, "Mismatch matching %r with %r" % (name, pattern)
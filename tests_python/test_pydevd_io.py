@@ -220,3 +220,52 @@ def test_redirect_to_pyd_io_messages_user_change_stdout(_redirect_context, std):
     write("ccc")
     assert py_db.writer.command_meanings == ["CMD_WRITE_TO_CONSOLE"]
     assert stream.getvalue() == "bbbccc"
+
+
+def test_output_buffer(_redirect_context):
+    from _pydevd_bundle.pydevd_io import OutputBuffer
+    from _pydevd_bundle.pydevd_io import RedirectToPyDBIoMessages
+    from tests_python.debugger_unittest import wait_for_condition
+
+    py_db = _redirect_context["py_db"]
+    py_db.created_pydb_daemon_threads = {}
+
+    output_buffer = OutputBuffer(window=60, max_bytes=1000, max_lines=3)
+    stdout = RedirectToPyDBIoMessages(1, sys.stdout, wrap_buffer=True, output_buffer=output_buffer)
+    stderr = RedirectToPyDBIoMessages(2, sys.stderr, wrap_buffer=True, output_buffer=output_buffer)
+
+    stdout.write("out1")
+    stdout.buffer.write(b"out2")
+    stderr.write("err1")
+    stdout.write("out3")
+    assert py_db.writer.commands == []
+
+    # A segment is created whenever the stream changes.
+    output_buffer.flush()
+    assert py_db.writer.command_meanings == ["CMD_WRITE_TO_CONSOLE"] * 3
+    contents = [cmd._as_bytes for cmd in py_db.writer.commands]
+    assert b"out1out2" in contents[0]
+    assert b"err1" in contents[1] and b"out" not in contents[1]
+    assert b"out3" in contents[2] and b"err" not in contents[2]
+
+    # Flushed when the max number of lines is reached.
+    del py_db.writer.commands[:]
+    stdout.write("1\n2\n")
+    assert py_db.writer.commands == []
+    stdout.write("3\n")
+    assert len(py_db.writer.commands) == 1
+
+    # Flushed when the max number of bytes is reached.
+    del py_db.writer.commands[:]
+    stdout.write("x" * 1000)
+    assert len(py_db.writer.commands) == 1
+
+    # Flushed after the time window elapses.
+    del py_db.writer.commands[:]
+    output_buffer._window = 0.1
+    stdout.write("y")
+    wait_for_condition(lambda: len(py_db.writer.commands) == 1)
+
+    output_buffer._flusher_thread.do_kill_pydev_thread()
+    output_buffer._flusher_thread.join(2)
+    assert not output_buffer._flusher_thread.is_alive()
@@ -0,0 +1,128 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# The maximum number of modules which may be imported by `import pydevd` (if some change
+# makes this fail, check whether the new import is really needed at import time or if it
+# could be done lazily before raising the budget).
+IMPORT_PYDEVD_MODULES_BUDGET = 290
+
+# The maximum number of modules from pydevd itself imported by `import pydevd`.
+IMPORT_PYDEVD_OWN_MODULES_BUDGET = 110
+
+_PYDEVD_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run_python(code, env=None):
+    new_env = os.environ.copy()
+    for key in list(new_env):
+        if key.startswith("PYDEVD_"):
+            del new_env[key]
+    if env:
+        new_env.update(env)
+    return subprocess.check_output([sys.executable, "-c", code], cwd=_PYDEVD_DIR, env=new_env, stderr=subprocess.STDOUT)
+
+
+def test_import_pydevd_modules_budget():
+    code = """
+import sys
+initial_modules = set(sys.modules)
+import pydevd
+new_modules = set(sys.modules).difference(initial_modules)
+own_modules = [m for m in new_modules if m.split(".")[0] in ("pydevd", "pydevd_file_utils", "pydevd_tracing", "pydev_ipython", "pydevd_plugins") or m.startswith(("_pydev", "pydev_"))]
+print("MODULES: %s %s" % (len(new_modules), len(own_modules)))
+"""
+    output = _run_python(code).decode("utf-8")
+    for line in output.splitlines():
+        if line.startswith("MODULES: "):
+            modules_count, own_modules_count = [int(x) for x in line.split()[1:]]
+            break
+    else:
+        raise AssertionError("Unable to get the modules imported from: %s" % (output,))
+
+    assert modules_count <= IMPORT_PYDEVD_MODULES_BUDGET
+    assert own_modules_count <= IMPORT_PYDEVD_OWN_MODULES_BUDGET
+
+
+def test_startup_profile(tmpdir):
+    profile_file = str(tmpdir.join("startup_profile.jsonl"))
+    code = """
+import pydevd
+from _pydevd_bundle import pydevd_startup_profile
+
+with pydevd_startup_profile.phase("PyDB.__init__"):
+    py_db = pydevd.PyDB(set_as_global=False)
+
+try:
+    with pydevd_startup_profile.phase("failed phase"):
+        raise RuntimeError()
+except RuntimeError:
+    pass
+pydevd_startup_profile.phase("unfinished phase")
+pydevd_startup_profile.write_report()
+pydevd_startup_profile.write_report()  # Only the first call writes the report.
+"""
+    for _i in range(2):
+        _run_python(code, env={"PYDEVD_STARTUP_PROFILE": profile_file})
+
+    with open(profile_file, "r", encoding="utf-8") as stream:
+        reports = [json.loads(line) for line in stream.read().splitlines()]
+
+    # One report per process.
+    assert len(reports) == 2
+    report = reports[0]
+    assert report["pid"] != reports[1]["pid"]
+    assert report["modules_imported"] > 0
+    name_to_phase = dict((phase["name"], phase) for phase in report["phases"])
+    assert name_to_phase["import pydevd"]["duration"] > 0
+    assert name_to_phase["PyDB.__init__"]["duration"] > 0
+    assert name_to_phase["PyDB.__init__"]["start"] >= name_to_phase["import pydevd"]["start"] + name_to_phase["import pydevd"]["duration"]
+    assert name_to_phase["failed phase"]["error"] == "RuntimeError"
+    assert name_to_phase["unfinished phase"]["duration"] is None
+    assert report["total"] >= name_to_phase["PyDB.__init__"]["start"]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="Requires os.fork.")
+def test_startup_profile_after_fork(tmpdir):
+    profile_file = str(tmpdir.join("startup_profile.jsonl"))
+    code = """
+import os
+from _pydevd_bundle import pydevd_startup_profile
+
+with pydevd_startup_profile.phase("parent phase"):
+    pass
+pydevd_startup_profile.write_report()
+
+pid = os.fork()
+if pid == 0:
+    pydevd_startup_profile.after_fork()  # Done in pydev_monkey._on_forked_process.
+    with pydevd_startup_profile.phase("child phase"):
+        pass
+    pydevd_startup_profile.write_report()
+    os._exit(0)
+os.waitpid(pid, 0)
+"""
+    _run_python(code, env={"PYDEVD_STARTUP_PROFILE": profile_file})
+
+    with open(profile_file, "r", encoding="utf-8") as stream:
+        reports = [json.loads(line) for line in stream.read().splitlines()]
+
+    # The forked process writes its own report (just with its own phases).
+    assert len(reports) == 2
+    assert [[phase["name"] for phase in report["phases"]] for report in reports] == [["parent phase"], ["child phase"]]
+    assert reports[1]["ppid"] == reports[0]["pid"]
+
+
+def test_startup_profile_disabled():
+    from _pydevd_bundle import pydevd_startup_profile
+
+    if pydevd_startup_profile.is_enabled():
+        return
+
+    with pydevd_startup_profile.phase("phase") as phase:
+        pass
+    phase.end()
+    assert pydevd_startup_profile.get_report()["phases"] == []
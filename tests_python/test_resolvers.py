@@ -385,6 +385,7 @@ class _DummyPyDB(object):
         from _pydevd_bundle.pydevd_api import PyDevdAPI
 
         self.variable_presentation = PyDevdAPI.VariablePresentation()
+        self.supports_variable_paging = False
 
 
 class _DAPCheckChildVars:
@@ -484,3 +485,51 @@ def collect_resolver_dictionary(obj, level=0):
             continue
         yield level, key, val
         yield from collect_resolver_dictionary(val, level + 1)
+
+
+def test_type_resolve_handler_dispatch_cache():
+    import gc
+    import weakref
+    from _pydevd_bundle import pydevd_resolver
+    from _pydevd_bundle.pydevd_extension_utils import EXTENSION_MANAGER_INSTANCE
+    from _pydevd_bundle.pydevd_xml import TypeResolveHandler
+
+    handler = TypeResolveHandler()
+    assert handler.get_type(1) == (int, "int", None)
+    assert handler.get_type([]) == (list, "list", pydevd_resolver.tupleResolver)
+
+    class DynamicList(list):
+        pass
+
+    assert handler.get_type(DynamicList())[2] is pydevd_resolver.tupleResolver
+    assert handler.str_from_providers(DynamicList(), DynamicList, "DynamicList") is None
+    assert len(handler._type_id_to_dispatch) == 1
+
+    # Dynamically created classes aren't kept alive by the cache.
+    type_ref = weakref.ref(DynamicList)
+    del DynamicList
+    gc.collect()
+    assert type_ref() is None
+    assert len(handler._type_id_to_dispatch) == 0
+
+    # Loading the extensions invalidates the cache.
+    assert handler._static_type_to_dispatch
+    EXTENSION_MANAGER_INSTANCE.reload()
+    assert not handler._static_type_to_dispatch
+    assert handler.get_type({}) == (dict, "dict", pydevd_resolver.dictResolver)
+
+
+def test_dict_resolver_indexed_entry_named():
+    from _pydevd_bundle.pydevd_resolver import DictResolver
+
+    class Key(object):
+        def __repr__(self):
+            return "Key"
+
+    dict_resolver = DictResolver()
+    key1, key2 = Key(), Key()
+    dct = {"a": 1, key1: 2, key2: 3}
+    assert dict_resolver.get_indexed_entry_named(dct, "'a'") == ("'a'", 1, "['a']")
+    assert dict_resolver.get_indexed_entry_named(dct, "Key") == ("Key", 2, None)
+    assert dict_resolver.get_indexed_entry_named(dct, "Key (id: %s)" % (id(key2),)) == ("Key (id: %s)" % (id(key2),), 3, None)
+    assert dict_resolver.get_indexed_entry_named(dct, "'b'") is None
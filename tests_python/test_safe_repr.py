@@ -674,3 +674,23 @@ def test_no_repr():
     my_bytes = MyBytes(obj)
     raw_value_repr = safe_repr(my_bytes)
     assert not my_bytes.errored
+
+
+def test_deadline():
+    import time
+
+    class SlowRepr(object):
+        def __repr__(self):
+            time.sleep(0.05)
+            return "SlowRepr()"
+
+    safe_repr = SafeRepr()
+    for obj, prefix, suffix in (([SlowRepr()] * 10, "[", "]"), (dict((i, SlowRepr()) for i in range(10)), "{", "}")):
+        safe_repr.deadline = time.time() + 0.12
+        value = safe_repr(obj)
+        assert value.startswith(prefix)
+        assert value.endswith(", ..." + suffix)
+        assert 2 <= value.count("SlowRepr()") <= 4
+
+    # Without a deadline all the items are added.
+    assert SafeRepr()([SlowRepr()] * 3) == "[SlowRepr(), SlowRepr(), SlowRepr()]"
@@ -133,3 +133,130 @@ def test_schema_translation_thread():
         "body": {"threads": [{"id": 2**45, "name": "foo"}, {"id": 2**46, "name": "bar"}]},
         "seq": -1,
     }
+
+
+def test_schema_fast_path_dicts():
+    pydevd_base_schema.BaseSchema.initialize_ids_translation()
+    translate_id_to_dap = pydevd_base_schema.translate_id_to_dap
+
+    # The dicts built directly must match the ones built from the schema objects.
+    stack_frame = pydevd_schema.StackFrame(
+        2**45, "foo", 1, column=1, source={"path": "/tmp/a.py", "sourceReference": 0}, presentationHint="subtle"
+    ).to_dict()
+    response = pydevd_schema.StackTraceResponse(
+        request_seq=3,
+        success=True,
+        command="stackTrace",
+        body=pydevd_schema.StackTraceResponseBody(stackFrames=[stack_frame], totalFrames=1),
+    ).to_dict(update_ids_to_dap=True)
+
+    pydevd_base_schema.BaseSchema.initialize_ids_translation()
+    fast_stack_frame = {
+        "id": translate_id_to_dap(2**45),
+        "name": "foo",
+        "line": 1,
+        "column": 1,
+        "source": {"path": "/tmp/a.py", "sourceReference": 0},
+        "presentationHint": "subtle",
+    }
+    assert pydevd_base_schema.build_response_dict(3, "stackTrace", {"stackFrames": [fast_stack_frame], "totalFrames": 1}) == response
+
+    response = ThreadsResponse(
+        request_seq=4,
+        success=True,
+        command="threads",
+        body=pydevd_schema.ThreadsResponseBody([pydevd_schema.Thread(2**46, "t1").to_dict()]),
+    ).to_dict(update_ids_to_dap=True)
+    threads = [{"id": translate_id_to_dap(2**46), "name": "t1"}]
+    assert pydevd_base_schema.build_response_dict(4, "threads", {"threads": threads}) == response
+
+    event = pydevd_schema.OutputEvent(pydevd_schema.OutputEventBody("out", "stdout")).to_dict(update_ids_to_dap=True)
+    assert pydevd_base_schema.build_event_dict("output", {"output": "out", "category": "stdout", "source": {}}) == event
+
+
+def test_json_codec():
+    from _pydevd_bundle import pydevd_json_codec
+
+    class Unknown(object):
+        def __str__(self):
+            return "unknown"
+
+    obj = {"a": [1, 2.5, None, True], "b": "ação", "c": Unknown(), "d": 2**70}
+    as_bytes = pydevd_json_codec.dumps(obj)
+    assert isinstance(as_bytes, bytes)
+    loaded = pydevd_json_codec.loads(as_bytes)
+    assert loaded == {"a": [1, 2.5, None, True], "b": "ação", "c": "unknown", "d": 2**70}
+    assert pydevd_json_codec.loads(as_bytes.decode("utf-8")) == loaded
+
+    for codec_name in ("json", "orjson", "ujson"):
+        name, dumps, loads = pydevd_json_codec._create_codec(codec_name)
+        assert name in (codec_name, "json")
+        assert loads(dumps(obj)) == loaded
+
+
+def test_json_codec_same_as_stdlib():
+    import dataclasses
+    import datetime
+    import uuid
+    from _pydevd_bundle import pydevd_json_codec
+
+    @dataclasses.dataclass
+    class Point(object):
+        x: int
+        y: int
+
+    body = {
+        "datetime": datetime.datetime(2020, 1, 2, 3, 4, 5),
+        "date": datetime.date(2020, 1, 2),
+        "time": datetime.time(3, 4, 5),
+        "uuid": uuid.UUID(int=5),
+        "dataclass": Point(1, 2),
+        1: "non str key",
+    }
+    message = {"type": "response", "body": body}
+    expected = pydevd_json_codec.loads(pydevd_json_codec._stdlib_dumps(message))
+    assert expected["body"]["datetime"] == "2020-01-02 03:04:05"
+    assert expected["body"]["dataclass"].endswith("Point(x=1, y=2)")
+
+    for codec_name in ("orjson", "ujson"):
+        _name, dumps, loads = pydevd_json_codec._create_codec(codec_name)
+        assert loads(dumps(message)) == expected
+
+
+def test_schema_lazy_classes():
+    import subprocess
+    import sys
+    import os
+
+    code = """
+from _pydevd_bundle._debug_adapter import pydevd_schema, pydevd_base_schema
+
+# The classes are only created when requested.
+assert "SetBreakpointsRequest" not in vars(pydevd_schema)
+assert "SetBreakpointsRequest" in dir(pydevd_schema)
+assert "setBreakpoints" in pydevd_base_schema._requests_to_types
+
+request = pydevd_base_schema.from_dict(
+    {"type": "request", "command": "setBreakpoints", "seq": 1, "arguments": {"source": {"path": "a.py"}, "breakpoints": [{"line": 1}]}}
+)
+assert request.__class__.__name__ == "SetBreakpointsRequest"
+assert request.__class__ is pydevd_schema.SetBreakpointsRequest
+
+# Its dependencies are created along with it.
+for name in ("SetBreakpointsArguments", "Source", "SourceBreakpoint"):
+    assert name in vars(pydevd_schema), name
+assert request.to_dict()["arguments"]["breakpoints"] == [{"line": 1}]
+
+response = pydevd_base_schema.build_response(request, kwargs={"body": {"breakpoints": []}})
+assert response.__class__ is pydevd_schema.SetBreakpointsResponse
+
+try:
+    pydevd_schema.DoesNotExist
+except AttributeError:
+    pass
+else:
+    raise AssertionError("Expected AttributeError.")
+print("ok")
+"""
+    output = subprocess.check_output([sys.executable, "-c", code], cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert output.strip() == b"ok"
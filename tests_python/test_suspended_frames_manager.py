@@ -22,6 +22,7 @@ class _DummyPyDB(object):
         from _pydevd_bundle.pydevd_api import PyDevdAPI
 
         self.variable_presentation = PyDevdAPI.VariablePresentation()
+        self.supports_variable_paging = False
 
 
 def test_suspended_frames_manager():
@@ -156,3 +157,272 @@ def test_get_child_variables():
                 raise AssertionError("Expected to find variable named: %s" % (TOO_LARGE_ATTR,))
             if not found_len:
                 raise AssertionError("Expected to find variable named: len()")
+
+
+def get_paged_containers_frame():
+    lst = list(range(250))
+    dct = dict(("key%s" % (i,), i) for i in range(1000))
+    small = [1, 2]
+    return sys._getframe()
+
+
+def test_get_child_variables_paged():
+    from _pydevd_bundle.pydevd_suspended_frames import SuspendedFramesManager
+
+    suspended_frames_manager = SuspendedFramesManager()
+    py_db = _DummyPyDB()
+    py_db.supports_variable_paging = True
+    frame = get_paged_containers_frame()
+    with suspended_frames_manager.track_frames(py_db) as tracker:
+        # : :type tracker: _FramesTracker
+        tracker.track("thread1", pydevd_frame_utils.create_frames_list_from_frame(frame))
+        variable = suspended_frames_manager.get_variable(id(frame))
+
+        # Sequences are sliced directly.
+        lst_var = variable.get_child_variable_named("lst")
+        var_data = lst_var.get_var_data()
+        assert var_data["indexedVariables"] == 250
+        named = lst_var.get_children_variables_page(filter_type="named")
+        assert var_data["namedVariables"] == len(named)
+        assert [x.name for x in named][-1] == GENERATED_LEN_ATTR_NAME
+        assert not any(x.name.isdigit() for x in named)
+
+        page = lst_var.get_children_variables_page(filter_type="indexed", start=100, count=50)
+        assert [x.name for x in page] == [str(i) for i in range(100, 150)]
+        assert [x.value for x in page] == list(range(100, 150))
+        assert page[0].get_var_data()["evaluateName"] == "lst[100]"
+        page = lst_var.get_children_variables_page(filter_type="indexed", start=240, count=50)
+        assert [x.value for x in page] == list(range(240, 250))
+
+        # An item only available in the pages can still be found by name.
+        child_var = lst_var.get_child_variable_named("200")
+        assert child_var.value == 200
+        assert child_var.get_var_data()["evaluateName"] == "lst[200]"
+        assert lst_var.get_child_variable_named("250") is None
+        assert lst_var.get_child_variable_named("0c8", fmt={"hex": True}) is None
+
+        # Dicts are iterated with a cursor (which is resumed when the pages are gotten in order).
+        dct_var = variable.get_child_variable_named("dct")
+        assert dct_var.get_var_data()["indexedVariables"] == 1000
+        values = []
+        for start in range(0, 1000, 300):
+            page = dct_var.get_children_variables_page(filter_type="indexed", start=start, count=300)
+            values.extend(x.value for x in page)
+            assert dct_var._indexed_cursor._position == start + len(page)
+        assert values == list(range(1000))
+        assert page[0].get_var_data()["evaluateName"] == "dct['key900']"
+        assert dct_var.get_child_variable_named("'key900'").value == 900
+        assert dct_var.get_child_variable_named("'key1000'") is None
+
+        # Going backwards restarts the iteration.
+        page = dct_var.get_children_variables_page(filter_type="indexed", start=10, count=2)
+        assert [(x.name, x.value) for x in page] == [("'key10'", 10), ("'key11'", 11)]
+
+        # A change in the dict also restarts the iteration.
+        frame.f_locals["dct"]["new_key"] = 1000
+        page = dct_var.get_children_variables_page(filter_type="indexed", start=999, count=10)
+        assert [(x.name, x.value) for x in page] == [("'key999'", 999), ("'new_key'", 1000)]
+
+        # Without a filter all the children are provided as before.
+        children = dct_var.get_children_variables_page()
+        assert [x.name for x in children] == [x.name for x in dct_var.get_children_variables()]
+        assert TOO_LARGE_ATTR in [x.name for x in children]
+
+        # Small containers aren't paged.
+        assert "indexedVariables" not in variable.get_child_variable_named("small").get_var_data()
+
+
+class _SlowRepr(object):
+    def __repr__(self):
+        import time
+
+        time.sleep(0.05)
+        return "_SlowRepr()"
+
+
+def get_slow_repr_frame():
+    slow1 = _SlowRepr()
+    slow2 = _SlowRepr()
+    fast = 1
+    return sys._getframe()
+
+
+def test_get_variables_var_data_lazy():
+    from _pydevd_bundle.pydevd_suspended_frames import SuspendedFramesManager, get_variables_var_data
+    from _pydevd_bundle.pydevd_utils import slow_repr_types
+
+    suspended_frames_manager = SuspendedFramesManager()
+    py_db = _DummyPyDB()
+    frame = get_slow_repr_frame()
+    initial_slow_timeout = slow_repr_types.slow_timeout
+    slow_repr_types.slow_timeout = 0.04
+    try:
+        with suspended_frames_manager.track_frames(py_db) as tracker:
+            # : :type tracker: _FramesTracker
+            tracker.track("thread1", pydevd_frame_utils.create_frames_list_from_frame(frame))
+            variable = suspended_frames_manager.get_variable(id(frame))
+            children = variable.get_children_variables()
+            assert [x.name for x in children] == ["fast", "slow1", "slow2"]
+
+            # The time budget elapses after the first slow repr.
+            var_datas = get_variables_var_data(children, time_budget=0.01)
+            assert [x["value"] for x in var_datas] == ["1", "_SlowRepr()", "..."]
+            lazy_var_data = var_datas[2]
+            assert lazy_var_data["presentationHint"] == {"lazy": True}
+            assert lazy_var_data["evaluateName"] == "slow2"
+            assert lazy_var_data["type"] == "_SlowRepr"
+
+            lazy_variable = suspended_frames_manager.get_variable(lazy_var_data["variablesReference"])
+            assert lazy_variable.lazy
+            assert [x["value"] for x in get_variables_var_data(lazy_variable.get_children_variables(), time_budget=0)] == ["_SlowRepr()"]
+
+            # The type was slow twice: from now on it's always deferred.
+            assert slow_repr_types.is_deferred(_SlowRepr())
+            var_datas = get_variables_var_data(children, time_budget=10)
+            assert [x["value"] for x in var_datas] == ["1", "...", "..."]
+            stats = [x for x in slow_repr_types.get_stats() if x["type"].endswith("._SlowRepr")]
+            assert len(stats) == 1
+            assert stats[0]["slow_count"] == 2
+            assert stats[0]["deferred"]
+    finally:
+        slow_repr_types.slow_timeout = initial_slow_timeout
+        slow_repr_types.clear()
+
+
+def test_slow_repr_types_weak_and_per_session():
+    import gc
+    import pydevd
+    from _pydevd_bundle.pydevd_utils import SlowReprTypes, slow_repr_types
+
+    types = SlowReprTypes(slow_timeout=0.1, defer_count=1)
+
+    # Dynamically created classes aren't kept alive by the stats.
+    DynamicClass = type("DynamicClass", (object,), {})
+    types.on_repr_computed(DynamicClass(), 0.2)
+    assert types.is_deferred(DynamicClass())
+    assert [x["type"] for x in types.get_stats()] == [__name__ + ".DynamicClass"]
+
+    del DynamicClass
+    gc.collect()
+    assert types.get_stats() == []
+    assert not types._deferred_type_ids
+
+    # A new session doesn't keep the types deferred in a previous one.
+    slow_repr_types.on_repr_computed(_SlowRepr(), slow_repr_types.slow_timeout + 1)
+    slow_repr_types.on_repr_computed(_SlowRepr(), slow_repr_types.slow_timeout + 1)
+    assert slow_repr_types.is_deferred(_SlowRepr())
+    pydevd.PyDB(set_as_global=False).on_configuration_done()
+    assert not slow_repr_types.is_deferred(_SlowRepr())
+    assert slow_repr_types.get_stats() == []
+
+
+def test_variables_presentation_cache():
+    from _pydevd_bundle.pydevd_suspended_frames import SuspendedFramesManager, VariablesPresentationCache, get_variables_var_data
+
+    suspended_frames_manager = SuspendedFramesManager()
+    presentation_cache = VariablesPresentationCache(100)
+    py_db = _DummyPyDB()
+
+    def get_values():
+        # The frame is kept alive (as in consecutive suspensions of the same thread).
+        with suspended_frames_manager.track_frames(py_db) as tracker:
+            # : :type tracker: _FramesTracker
+            tracker.track("thread1", pydevd_frame_utils.create_frames_list_from_frame(frame))
+            variable = suspended_frames_manager.get_variable(id(frame))
+            var_datas = get_variables_var_data(variable.get_children_variables(), presentation_cache=presentation_cache)
+            return dict((var_data["name"], var_data["value"]) for var_data in var_datas)
+
+    def gen():
+        a = 1000
+        b = "str"
+        c = [1]
+        yield sys._getframe()
+        a = int("1001")
+        yield
+
+    generator = gen()
+    frame = next(generator)
+    assert get_values() == {"a": "1000", "b": "'str'", "c": "[1]"}
+    assert presentation_cache.get_stats() == {"hits": 0, "misses": 2, "hit_ratio": 0.0, "entries": 2}
+
+    # Unchanged immutable values are reused, mutable values are always recomputed.
+    frame.f_locals["c"].append(2)
+    assert get_values() == {"a": "1000", "b": "'str'", "c": "[1, 2]"}
+    assert presentation_cache.get_stats() == {"hits": 2, "misses": 2, "hit_ratio": 0.5, "entries": 2}
+
+    # A new value is recomputed.
+    next(generator)
+    assert get_values() == {"a": "1001", "b": "'str'", "c": "[1, 2]"}
+    assert presentation_cache.get_stats() == {"hits": 3, "misses": 3, "hit_ratio": 0.5, "entries": 2}
+
+
+def test_frame_variables_created_lazily():
+    from _pydevd_bundle.pydevd_suspended_frames import SuspendedFramesManager
+
+    suspended_frames_manager = SuspendedFramesManager()
+    py_db = _DummyPyDB()
+    with suspended_frames_manager.track_frames(py_db) as tracker:
+        # : :type tracker: _FramesTracker
+        frame = get_frame()
+        tracker.track("thread1", pydevd_frame_utils.create_frames_list_from_frame(frame))
+
+        # Just the frames are tracked, the variables are only created on demand.
+        assert not tracker._variable_reference_to_variable
+        assert suspended_frames_manager.get_thread_id_for_variable_reference(id(frame.f_back)) == "thread1"
+
+        variable = suspended_frames_manager.get_variable(id(frame))
+        assert ["var1", "var2", "var3"] == [x.get_name() for x in variable.get_children_variables()]
+        assert suspended_frames_manager.get_variable(id(frame)) is variable
+        assert tracker.obtain_as_variable("frame", frame) is variable
+
+        with pytest.raises(KeyError):
+            suspended_frames_manager.get_variable(id(py_db))
+
+
+def test_stack_trace_code_presentation_cache(tmpdir):
+    import gc
+    import weakref
+    import pydevd
+    import pydevd_file_utils
+    from _pydevd_bundle.pydevd_net_command_factory_json import NetCommandFactoryJson
+
+    class _DummyWriter(object):
+        def add_command(self, cmd):
+            pass
+
+    # No path mappings (otherwise the source reference is provided by the path translation).
+    pydevd_file_utils.setup_client_server_paths([])
+    py_db = pydevd.PyDB(set_as_global=False)
+    py_db.writer = _DummyWriter()
+    cmd_factory = NetCommandFactoryJson()
+    suspended_frames_manager = py_db.suspended_frames_manager
+
+    filename = tmpdir.join("generated_code.py")
+    namespace = {}
+    exec(compile("import sys\ndef get_frame():\n    return sys._getframe()\n", str(filename), "exec"), namespace)
+    frame = namespace["get_frame"]()
+    code_ref = weakref.ref(frame.f_code)
+
+    def get_top_stack_frame():
+        with suspended_frames_manager.track_frames(py_db) as tracker:
+            tracker.track("thread1", pydevd_frame_utils.create_frames_list_from_frame(frame))
+            cmd = cmd_factory.make_get_thread_stack_message(py_db, 1, "thread1", None, {}, must_be_suspended=True, levels=1)
+        return cmd.as_dict["body"]["stackFrames"][0]
+
+    # The file doesn't exist, so, its source is provided by decompiling the code.
+    assert get_top_stack_frame()["source"]["sourceReference"] != 0
+    assert code_ref() in py_db.code_presentation_cache
+
+    # Whether the file exists isn't cached.
+    filename.write("")
+    assert get_top_stack_frame()["source"]["sourceReference"] == 0
+
+    # The cache doesn't keep the code alive (note: the file type and project scope caches are
+    # keyed by the code too, so, those are cleared to check just the presentation cache).
+    del frame
+    namespace.clear()
+    pydevd._CACHE_FILE_TYPE.clear()
+    py_db._in_project_scope_cache.clear()
+    gc.collect()
+    assert code_ref() is None
+    assert len(py_db.code_presentation_cache) == 0
@@ -292,3 +292,89 @@ def test_lines_with_yield(with_monitoring):
 
     method()
     monitor.set_events(DEBUGGER_ID, 0)
+
+
+def test_func_code_info_cache():
+    from _pydevd_sys_monitoring import _pydevd_sys_monitoring
+
+    cache = _pydevd_sys_monitoring._FuncCodeInfoCache(2)
+
+    codes = []
+    for i in range(3):
+        codes.append(compile("a = %s" % (i,), "<generated-%s>" % (i,), "exec"))
+
+    def create_info(code, mtime):
+        func_code_info = _pydevd_sys_monitoring.FuncCodeInfo()
+        func_code_info.code_obj = code
+        func_code_info.pydb_mtime = mtime
+        cache.put(code, func_code_info)
+        return func_code_info
+
+    assert cache.get(codes[0], 1) is None
+    info0 = create_info(codes[0], 1)
+    create_info(codes[1], 1)
+    assert cache.get(codes[0], 1) is info0
+
+    # codes[1] is the least recently used, so, it's the one evicted.
+    create_info(codes[2], 1)
+    assert cache.get(codes[1], 1) is None
+    assert cache.get(codes[0], 1) is info0
+
+    stats = cache.get_stats()
+    assert stats == {"size": 2, "max_size": 2, "hits": 2, "misses": 2, "evictions": 1}
+
+    # A change in the mtime evicts everything at once.
+    assert cache.get(codes[0], 2) is None
+    stats = cache.get_stats()
+    assert stats["size"] == 0
+    assert stats["evictions"] == 3
+
+
+def test_func_code_info_cache_evicts_code_line_info():
+    from _pydevd_sys_monitoring import _pydevd_sys_monitoring
+
+    cache = _pydevd_sys_monitoring._FuncCodeInfoCache(10)
+    line_info_cache = _pydevd_sys_monitoring._code_to_code_line_info_cache
+
+    codes = [compile("a = %s" % (i,), "<generated-line-info-%s>" % (i,), "exec") for i in range(3)]
+    for code in codes:
+        func_code_info = _pydevd_sys_monitoring.FuncCodeInfo()
+        func_code_info.code_obj = code
+        func_code_info.pydb_mtime = 1
+        cache.put(code, func_code_info)
+        _pydevd_sys_monitoring._get_code_line_info(code)
+
+    assert all(code in line_info_cache for code in codes)
+
+    # A change in the mtime also clears the line info (even for codes which aren't seen again).
+    assert cache.get(codes[0], 2) is None
+    assert not any(code in line_info_cache for code in codes)
+
+
+def test_code_line_info_get_line_of_offset():
+    from _pydevd_sys_monitoring import _pydevd_sys_monitoring
+    from _pydevd_bundle import pydevd_resolver
+
+    def get_line_of_offset_linear(code_obj, offset):
+        for start, end, line in code_obj.co_lines():
+            if start is not None and end is not None and line is not None:
+                if offset >= start and offset <= end:
+                    return line
+        return -1
+
+    def iter_code_objs(code_obj):
+        yield code_obj
+        for const in code_obj.co_consts:
+            if hasattr(const, "co_lines"):
+                yield from iter_code_objs(const)
+
+    with open(pydevd_resolver.__file__, "r") as stream:
+        module_code = compile(stream.read(), pydevd_resolver.__file__, "exec")
+
+    checked = 0
+    for code_obj in iter_code_objs(module_code):
+        code_line_info = _pydevd_sys_monitoring._get_code_line_info(code_obj)
+        for offset in range(len(code_obj.co_code) + 4):
+            assert code_line_info.get_line_of_offset(offset) == get_line_of_offset_linear(code_obj, offset)
+            checked += 1
+    assert checked > 1000
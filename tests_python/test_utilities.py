@@ -114,6 +114,216 @@ def test_find_thread():
     assert pydevd_find_thread_by_id(get_current_thread_id(threading.current_thread())) is threading.current_thread()
 
 
+def test_threads_index():
+    from _pydevd_bundle.pydevd_constants import get_thread_id
+    from _pydevd_bundle.pydevd_thread_lifecycle import ThreadsIndex
+
+    event = threading.Event()
+    t = threading.Thread(target=event.wait, args=(10,))
+    t.start()
+    try:
+        thread_id = get_thread_id(t)
+        index = ThreadsIndex()
+        assert index.find_thread(thread_id) is None
+
+        index.add(thread_id, t)
+        assert index.find_thread(thread_id) is t
+        assert index.find_thread("some_prefix|" + thread_id) is t
+
+        index.remove(thread_id)
+        assert index.find_thread(thread_id) is None
+
+        # The reconciliation adds all the threads alive.
+        assert t in index.reconcile()
+        assert index.find_thread(thread_id) is t
+        assert index.find_thread(get_thread_id(threading.current_thread())) is threading.current_thread()
+    finally:
+        event.set()
+        t.join()
+
+    # Dead threads are not provided.
+    assert index.find_thread(thread_id) is None
+
+
+def test_thread_finalization_notifies_thread_not_alive():
+    from _pydev_bundle import pydev_monkey
+    from _pydevd_bundle.pydevd_constants import get_global_debugger, get_thread_id, set_global_debugger
+
+    class _PyDbStub(object):
+        def __init__(self):
+            self.threads_not_alive = []
+
+        def notify_thread_not_alive(self, thread_id):
+            self.threads_not_alive.append(thread_id)
+
+    original_debugger = get_global_debugger()
+    py_db = _PyDbStub()
+    set_global_debugger(py_db)
+    pydev_monkey.patch_thread_finalization()
+    try:
+        event = threading.Event()
+        t = threading.Thread(target=event.wait, args=(10,))
+        t.start()
+        thread_id = get_thread_id(t)
+
+        # A thread whose id was never requested is not notified.
+        t2 = threading.Thread(target=lambda: None)
+        t2.start()
+        t2.join()
+
+        event.set()
+        t.join()
+        assert py_db.threads_not_alive == [thread_id]
+    finally:
+        pydev_monkey.undo_patch_thread_finalization()
+        set_global_debugger(original_debugger)
+    assert threading.Thread._delete is not pydev_monkey._pydev_thread_delete
+
+
+def test_suspend_loop_woken_up_by_commands_and_resume():
+    import pydevd
+    from _pydevd_bundle.pydevd_additional_thread_info import set_additional_thread_info
+    from _pydevd_bundle.pydevd_comm import InternalThreadCommand
+    from _pydevd_bundle.pydevd_constants import STATE_SUSPEND, get_global_debugger, get_thread_id, set_global_debugger
+    from _pydevd_bundle.pydevd_thread_lifecycle import internal_run_thread
+
+    class _DummyWriter(object):
+        def add_command(self, cmd):
+            pass
+
+    original_debugger = get_global_debugger()
+    py_db = pydevd.PyDB(set_as_global=False)
+    py_db.writer = _DummyWriter()
+    set_global_debugger(py_db)
+    try:
+        in_wait_loop = threading.Event()
+        finished = threading.Event()
+
+        def wait_suspended():
+            t = threading.current_thread()
+            info = set_additional_thread_info(t)
+            info.pydev_state = STATE_SUSPEND
+            in_wait_loop.set()
+            py_db._do_wait_suspend(t, sys._getframe(), "line", None, "trace", [], None)
+            finished.set()
+
+        t = threading.Thread(target=wait_suspended)
+        t.start()
+        assert in_wait_loop.wait(5)
+        thread_id = get_thread_id(t)
+
+        # All the commands posted are processed (even if posted while the previous one is processed).
+        processed = []
+        commands_processed = threading.Event()
+
+        def on_command(py_db, i):
+            processed.append(i)
+            if len(processed) == 3:
+                commands_processed.set()
+
+        for i in range(3):
+            py_db.post_internal_command(InternalThreadCommand(thread_id, on_command, i), thread_id)
+        assert commands_processed.wait(5)
+        assert processed == [0, 1, 2]
+
+        internal_run_thread(t, set_additional_thread_info)
+        assert finished.wait(5)
+        t.join()
+    finally:
+        set_global_debugger(original_debugger)
+
+
+def test_suspend_all_and_resume_threads():
+    import pydevd
+    from _pydevd_bundle.pydevd_comm_constants import CMD_THREAD_SUSPEND
+    from _pydevd_bundle.pydevd_constants import (
+        PYDEVD_USE_SYS_MONITORING,
+        STATE_RUN,
+        STATE_SUSPEND,
+        get_global_debugger,
+        set_global_debugger,
+    )
+    from _pydevd_bundle.pydevd_thread_lifecycle import resume_threads, suspend_all_threads
+
+    original_debugger = get_global_debugger()
+    py_db = pydevd.PyDB(set_as_global=False)
+    set_global_debugger(py_db)
+
+    event = threading.Event()
+
+    def _wait_in_thread():
+        event.wait(10)
+
+    threads = [threading.Thread(target=_wait_in_thread) for _i in range(5)]
+    for t in threads:
+        t.start()
+    try:
+        suspend_all_threads(py_db, except_thread=threading.current_thread())
+        current_frames = sys._current_frames()
+        for t in threads:
+            info = t.additional_info
+            assert info.pydev_state == STATE_SUSPEND
+            assert info.pydev_step_cmd == CMD_THREAD_SUSPEND
+
+            if not PYDEVD_USE_SYS_MONITORING:
+                frame = current_frames[t.ident]
+                while frame.f_code.co_name != "_wait_in_thread":
+                    frame = frame.f_back
+                assert frame.f_trace is py_db.trace_dispatch
+                frame = None
+        current_frames = None
+
+        resume_threads("*", except_thread=threading.current_thread())
+        for t in threads:
+            info = t.additional_info
+            assert info.pydev_state == STATE_RUN
+            assert info.pydev_step_cmd == -1
+    finally:
+        # Remove the tracing from the frames before letting the threads finish.
+        current_frames = sys._current_frames()
+        for t in threads:
+            frame = current_frames.get(t.ident)
+            while frame is not None:
+                frame.f_trace = None
+                frame = frame.f_back
+        current_frames = None
+        event.set()
+        for t in threads:
+            t.join()
+        set_global_debugger(original_debugger)
+
+
+def test_set_trace_for_threads_frames_untracked_thread(monkeypatch):
+    import pydevd
+
+    enabled = []
+
+    class _SysMonitoring(object):
+        @staticmethod
+        def enable_code_tracing(thread_ident, code, frame):
+            enabled.append((thread_ident, code))
+
+    monkeypatch.setattr(pydevd, "PYDEVD_USE_SYS_MONITORING", True)
+    monkeypatch.setattr(pydevd, "pydevd_sys_monitoring", _SysMonitoring, raising=False)
+
+    py_db = pydevd.PyDB(set_as_global=False)
+    frame = sys._getframe()
+    untracked_ident = max(threading._active) + 1
+    tracked_ident = threading.current_thread().ident
+
+    # The code tracing done for a thread not in threading._active doesn't count for other threads.
+    py_db.set_trace_for_threads_frames_and_parents({untracked_ident: frame, tracked_ident: frame})
+    assert (untracked_ident, frame.f_code) in enabled
+    assert (tracked_ident, frame.f_code) in enabled
+
+    # For the tracked threads it's enabled only once for each code object.
+    del enabled[:]
+    other_ident = max(threading._active) + 2
+    monkeypatch.setitem(threading._active, other_ident, threading.current_thread())
+    py_db.set_trace_for_threads_frames_and_parents({tracked_ident: frame, other_ident: frame})
+    assert [code for (_ident, code) in enabled].count(frame.f_code) == 1
+
+
 def check_dap_log_message(log_message, expected, evaluated, eval_locals=None):
     ret = convert_dap_log_message_to_expression(log_message)
     assert ret == expected
@@ -530,3 +740,67 @@ def test_import_token_from_module():
 
     assert import_attr_from_module("sys.settrace") == sys.settrace
     assert import_attr_from_module("threading.Thread.start") == threading.Thread.start
+
+
+def test_table_like_struct_to_columnar():
+    numpy = pytest.importorskip("numpy")
+    from _pydevd_bundle.pydevd_vars import table_like_struct_to_columnar, table_like_struct_to_xml
+
+    array = numpy.arange(12, dtype="f8").reshape(3, 4)
+    columnar = table_like_struct_to_columnar(array, 1, 1, -1, 2)
+    assert (columnar["totalRows"], columnar["totalColumns"]) == (3, 4)
+    assert (columnar["rowOffset"], columnar["rows"], columnar["columnOffset"]) == (1, 2, 1)
+    assert [column["name"] for column in columnar["columns"]] == ["1", "2"]
+    assert [numpy.frombuffer(column["data"], column["dtype"]).tolist() for column in columnar["columns"]] == [[5, 9], [6, 10]]
+
+    # The columns of a Fortran ordered array are contiguous (so, the buffer is shared).
+    array = numpy.asfortranarray(array)
+    columnar = table_like_struct_to_columnar(array, 0, 0, -1, -1)
+    assert numpy.shares_memory(numpy.frombuffer(columnar["columns"][1]["data"], "<f8"), array)
+
+    # The rows are clipped to fit in the max bytes.
+    columnar = table_like_struct_to_columnar(numpy.zeros((100, 10)), 0, 0, -1, -1, max_bytes=800)
+    assert columnar["rows"] == 10
+
+    # Objects fall back to the xml.
+    array = numpy.array(["a", None], dtype=object)
+    assert table_like_struct_to_columnar(array, 0, 0, -1, -1) is None
+    assert "<columnar" not in table_like_struct_to_xml(array, "array", 0, 0, -1, -1, "columnar")
+
+    xml = table_like_struct_to_xml(numpy.arange(3), "array", 0, 0, -1, -1, "columnar")
+    assert '<columnar rows="3" cols="1"' in xml
+    assert 'dtype="&lt;i' in xml
+
+
+def test_table_like_struct_to_columnar_tz_aware():
+    pd = pytest.importorskip("pandas")
+    from _pydevd_bundle.pydevd_vars import table_like_struct_to_columnar
+
+    dates = pd.date_range("2020-01-01", periods=2, tz="US/Eastern")
+
+    # A tz-aware column can't be provided as datetime64 without losing the timezone.
+    df = pd.DataFrame({"a": [1.0, 2.0], "b": dates})
+    assert table_like_struct_to_columnar(df, 0, 0, -1, -1) is None
+
+    columnar = table_like_struct_to_columnar(df, 0, 0, -1, 1)
+    assert [column["name"] for column in columnar["columns"]] == ["a"]
+
+    # A tz-aware index is provided as labels.
+    df = pd.DataFrame({"a": [1.0, 2.0]}, index=dates)
+    columnar = table_like_struct_to_columnar(df, 0, 0, -1, -1)
+    assert "index" not in columnar
+    assert columnar["rowLabels"] == [str(date) for date in dates]
+    assert columnar["rowLabels"][0] == "2020-01-01 00:00:00-05:00"
+
+
+def test_iter_chunks():
+    from _pydevd_bundle.pydevd_utils import iter_chunks
+    from _pydevd_bundle.pydevd_safe_repr import SafeRepr
+
+    assert list(iter_chunks([], 3)) == []
+    assert list(iter_chunks(["ab", "", "cdefgh", "i"], 3)) == ["abc", "def", "ghi"]
+    assert list(iter_chunks(["abcdefg"], 3)) == ["abc", "def", "g"]
+
+    safe_repr = SafeRepr()
+    value = [list(range(10)), "a"]
+    assert "".join(iter_chunks(safe_repr.iter_parts(value), 4)) == safe_repr(value)